@@ -40,7 +40,6 @@
 from collections import defaultdict
 
 from nbxmpp.idlequeue import IdleQueue
-from gi.repository import Gdk
 from gi.repository import GLib
 from gi.repository import GObject
 
@@ -63,6 +62,9 @@
     from gajim.common.call_manager import CallManager
     from gajim.common.preview import PreviewManager
     from gajim.common.task_manager import TaskManager
+    from gajim.common.reconnect_manager import ReconnectManager
+    from gajim.common.main_loop_monitor import MainLoopMonitor
+    from gajim.common.stanza_metrics import StanzaMetrics
     from gajim.common.commands import ChatCommands  # noqa
 
 
@@ -116,6 +118,12 @@ def __init__(self):
 
 task_manager = cast('TaskManager', None)
 
+reconnect_manager = cast('ReconnectManager', None)
+
+main_loop_monitor = cast('MainLoopMonitor', None)
+
+stanza_metrics = cast('StanzaMetrics', None)
+
 # These will be set in app.gui_interface.
 idlequeue = cast(IdleQueue, None)
 socks5queue = None
@@ -138,6 +146,14 @@ def __init__(self):
     'SENTRY_SDK': False,
 }
 
+# Loading GStreamer and Farstream is slow, they are only probed the first
+# time one of these dependencies is queried
+_MULTIMEDIA_DEPENDENCIES = {'FARSTREAM', 'GST', 'AV'}
+_MULTIMEDIA_TYPELIBS = (('Gst', '1.0'),
+                        ('GstPbutils', '1.0'),
+                        ('Farstream', '0.2'))
+_multimedia_detected = False
+
 _tasks: dict[int, list[Any]] = defaultdict(list)
 
 
@@ -154,6 +170,16 @@ def get_clients() -> list[types.Client]:
 
 
 def is_installed(dependency: str) -> bool:
+    if dependency in _MULTIMEDIA_DEPENDENCIES and not _multimedia_detected:
+        _detect_multimedia_dependencies()
+    return _dependencies[dependency]
+
+
+def may_be_installed(dependency: str) -> bool:
+    # Multimedia dependencies which were not probed yet are assumed to be
+    # installed if their typelibs are available, this does not load them
+    if dependency in _MULTIMEDIA_DEPENDENCIES and not _multimedia_detected:
+        return _has_multimedia_typelibs()
     return _dependencies[dependency]
 
 
@@ -171,6 +197,8 @@ def is_display(display: Display) -> bool:
     if is_wayland and display == Display.WAYLAND:
         return True
 
+    # Gdk is only available with GUI
+    from gi.repository import Gdk
     default = Gdk.Display.get_default()
     if default is None:
         log('gajim').warning('Could not determine window manager')
@@ -182,7 +210,18 @@ def disable_dependency(dependency: str) -> None:
     _dependencies[dependency] = False
 
 
-def detect_dependencies() -> None:
+def _has_multimedia_typelibs() -> bool:
+    import gi
+
+    repository = gi.Repository.get_default()
+    return all(version in repository.enumerate_versions(namespace)
+               for namespace, version in _MULTIMEDIA_TYPELIBS)
+
+
+def _detect_multimedia_dependencies() -> None:
+    global _multimedia_detected  # pylint: disable=global-statement
+    _multimedia_detected = True
+
     import gi
 
     try:
@@ -213,6 +252,23 @@ def detect_dependencies() -> None:
     except Exception as error:
         log('gajim').warning('AV dependency test failed: %s', error)
 
+    if not _dependencies['AV'] and _has_multimedia_typelibs():
+        # Connected accounts advertised AV features before the probe
+        for client in connections.values():
+            client.get_module('Caps').update_caps()
+
+
+def detect_dependencies() -> None:
+    import gi
+
+    # GStreamer and Farstream are loaded on demand, make sure every
+    # later import gets the version Gajim expects
+    for namespace, version in _MULTIMEDIA_TYPELIBS:
+        try:
+            gi.require_version(namespace, version)
+        except ValueError:
+            pass
+
     # GEOCLUE
     try:
         gi.require_version('Geoclue', '2.0')
@@ -16,6 +16,7 @@
 from typing import Optional
 from typing import Union
 from typing import TextIO
+from typing import cast
 
 import os
 import sys
@@ -51,10 +52,15 @@
 from gajim.common.helpers import get_random_string
 from gajim.common.helpers import get_global_show
 from gajim.common.helpers import from_one_line
+from gajim.common.i18n import _
 from gajim.common.storage.events import EventStorage
 from gajim.common.task_manager import TaskManager
+from gajim.common.reconnect_manager import ReconnectManager
+from gajim.common.main_loop_monitor import MainLoopMonitor
+from gajim.common.stanza_metrics import StanzaMetrics
 from gajim.common.settings import Settings
 from gajim.common.settings import LegacyConfig
+from gajim.common.startup_timeline import timeline
 from gajim.common.cert_store import CertificateStore
 from gajim.common.storage.cache import CacheStorage
 from gajim.common.storage.draft import DraftStorage
@@ -65,38 +71,56 @@
 
 
 class CoreApplication(ged.EventHelper):
+
+    # True if the application runs without GUI
+    headless = False
+
     def __init__(self) -> None:
         ged.EventHelper.__init__(self)
         self._profiling_session = None
+        self._show_startup_timeline = False
+        self._monitor_main_loop = False
 
     def _init_core(self) -> None:
         # Create and initialize Application Paths & Databases
         app.app = self
         app.print_version()
-        app.detect_dependencies()
+        with timeline.phase('Detect dependencies'):
+            app.detect_dependencies()
         configpaths.create_paths()
 
         passwords.init()
 
-        app.settings = Settings()
-        app.settings.init()
+        with timeline.phase('Settings'):
+            app.settings = Settings()
+            app.settings.init()
 
         app.config = LegacyConfig()
         app.commands = ChatCommands()
 
-        app.storage.cache = CacheStorage()
-        app.storage.cache.init()
+        with timeline.phase('CacheStorage'):
+            app.storage.cache = CacheStorage()
+            app.storage.cache.init()
 
-        app.storage.events = EventStorage()
-        app.storage.events.init()
+        with timeline.phase('EventStorage'):
+            app.storage.events = EventStorage()
+            app.storage.events.init()
 
-        app.storage.archive = MessageArchiveStorage()
-        app.storage.archive.init()
+        with timeline.phase('MessageArchiveStorage'):
+            app.storage.archive = MessageArchiveStorage()
+            app.storage.archive.init()
 
         app.storage.drafts = DraftStorage()
 
         app.cert_store = CertificateStore()
         app.task_manager = TaskManager()
+        app.reconnect_manager = ReconnectManager()
+
+        app.stanza_metrics = StanzaMetrics()
+
+        app.main_loop_monitor = MainLoopMonitor()
+        if self._monitor_main_loop:
+            app.main_loop_monitor.start()
 
         from gajim.common.call_manager import CallManager
         app.call_manager = CallManager()
@@ -108,24 +132,28 @@ def _init_core(self) -> None:
         self._network_monitor.connect('notify::network-available',
                                       self._network_status_changed)
         self._network_state = self._network_monitor.get_network_available()
+        app.reconnect_manager.set_network_available(self._network_state)
 
         if sys.platform in ('win32', 'darwin'):
             GLib.timeout_add_seconds(20, self._check_for_updates)
         else:
             logind.enable()
 
-        for account in app.settings.get_active_accounts():
-            app.connections[account] = Client(account)
-            app.to_be_removed[account] = []
-            app.nicks[account] = app.settings.get_account_setting(account,
-                                                                  'name')
+        with timeline.phase('Create clients'):
+            for account in app.settings.get_active_accounts():
+                app.connections[account] = Client(account)
+                app.to_be_removed[account] = []
+                app.nicks[account] = app.settings.get_account_setting(
+                    account, 'name')
 
-        app.plugin_manager = PluginManager()
-        app.plugin_manager.init_plugins()
-        app.plugin_repository = PluginRepository()
+        with timeline.phase('Plugins'):
+            app.plugin_manager = PluginManager()
+            app.plugin_manager.init_plugins()
+            app.plugin_repository = PluginRepository()
 
-        for client in app.get_clients():
-            client.get_module('Roster').load_roster()
+        with timeline.phase('Load rosters'):
+            for client in app.get_clients():
+                client.get_module('Roster').load_roster()
 
         GLib.timeout_add_seconds(5, self._remote_init)
 
@@ -133,6 +161,105 @@ def _init_core(self) -> None:
             ('signed-in', ged.CORE, self._on_signed_in),
         ])
 
+    def _add_core_options(self) -> None:
+        application = cast(Gio.Application, self)
+
+        application.add_main_option(
+            'version',
+            ord('V'),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _("Show the application's version"))
+
+        application.add_main_option(
+            'quiet',
+            ord('q'),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Show only critical errors'))
+
+        application.add_main_option(
+            'separate',
+            ord('s'),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Separate profile files completely '
+              '(even history database and plugins)'))
+
+        application.add_main_option(
+            'verbose',
+            ord('v'),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Print XML stanzas and other debug information'))
+
+        application.add_main_option(
+            'profile',
+            ord('p'),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.STRING,
+            _('Use defined profile in configuration directory'),
+            'NAME')
+
+        application.add_main_option(
+            'config-path',
+            ord('c'),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.STRING,
+            _('Set configuration directory'),
+            'PATH')
+
+        application.add_main_option(
+            'loglevel',
+            ord('l'),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.STRING,
+            _('Configure logging system'),
+            'LEVEL')
+
+        application.add_main_option(
+            'warnings',
+            ord('w'),
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Show all warnings'))
+
+        application.add_main_option(
+            'gdebug',
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Sets an environment variable so '
+              'GLib debug messages are printed'))
+
+        application.add_main_option(
+            'cprofile',
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Profile application with cprofile'))
+
+        application.add_main_option(
+            'profile-events',
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Record call counts and timings of event handlers'))
+
+        application.add_main_option(
+            'startup-timeline',
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Show where time is spent during startup'))
+
+        application.add_main_option(
+            'monitor-main-loop',
+            0,
+            GLib.OptionFlags.NONE,
+            GLib.OptionArg.NONE,
+            _('Log callbacks which block the main loop'))
+
     @property
     def _log(self) -> logging.Logger:
         return app.log('gajim.application')
@@ -141,6 +268,15 @@ def _core_command_line(self, options: GLib.VariantDict) -> None:
         if options.contains('cprofile'):
             self.start_profiling()
 
+        if options.contains('profile-events'):
+            app.ged.start_profiling()
+
+        if options.contains('startup-timeline'):
+            self._show_startup_timeline = True
+
+        if options.contains('monitor-main-loop'):
+            self._monitor_main_loop = True
+
         if options.contains('gdebug'):
             os.environ['G_MESSAGES_DEBUG'] = 'all'
 
@@ -203,6 +339,37 @@ def start_profiling(self) -> None:
         self._profiling_session = cProfile.Profile()
         self._profiling_session.enable()
 
+    def _finish_startup_timeline(self) -> None:
+        timeline.finish()
+        self._log.info('Startup finished after %.0f ms',
+                       timeline.get_total_time() * 1000)
+
+        if not self._show_startup_timeline:
+            return
+
+        print(timeline.get_report())
+
+        debug_path = configpaths.get('DEBUG')
+        json_path = debug_path / 'startup_timeline.json'
+        trace_path = debug_path / 'startup_trace.json'
+        try:
+            timeline.export_json(json_path)
+            timeline.export_chrome_trace(trace_path)
+        except OSError as error:
+            self._log.warning('Unable to export startup timeline: %s', error)
+            return
+
+        print(f'Startup timeline exported to {json_path}')
+        print(f'Chrome trace exported to {trace_path}')
+
+    def _stop_main_loop_monitor(self) -> None:
+        if not app.main_loop_monitor.running:
+            return
+
+        app.main_loop_monitor.stop()
+        self._log.info('Main loop latency:\n%s',
+                       app.main_loop_monitor.get_report(limit=20))
+
     def end_profiling(self) -> None:
         if self._profiling_session is None:
             return
@@ -214,8 +381,6 @@ def end_profiling(self) -> None:
         ps.print_stats()
 
     def start_shutdown(self, *args: Any, **kwargs: Any) -> None:
-        app.app.systray.shutdown()
-
         accounts_to_disconnect: dict[str, Client] = {}
 
         for client in app.get_clients():
@@ -245,6 +410,7 @@ def _shutdown_core(self) -> None:
         app.storage.cache.shutdown()
         app.storage.archive.shutdown()
         self.end_profiling()
+        self._stop_main_loop_monitor()
         logind.shutdown()
 
     def _quit_app(self) -> None:
@@ -279,6 +445,7 @@ def _network_status_changed(self,
             return
 
         self._network_state = connected
+        app.reconnect_manager.set_network_available(connected)
         if connected:
             self._log.info('Network connection available')
         else:
@@ -367,9 +534,10 @@ def create_account(self,
             config['custom_host'] = host
             config['custom_type'] = type_.value
 
-        app.settings.add_account(account)
-        for opt, value in config.items():
-            app.settings.set_account_setting(account, opt, value)  # pyright: ignore  # noqa
+        with app.settings.batch():
+            app.settings.add_account(account)
+            for opt, value in config.items():
+                app.settings.set_account_setting(account, opt, value)  # pyright: ignore  # noqa
 
         # Password module depends on existing config
         passwords.save_password(account, password)
@@ -397,7 +565,8 @@ def disable_account(self, account: str) -> None:
 
         app.get_client(account).cleanup()
         del app.connections[account]
-        if account in app.interface.instances:
+        if (app.interface is not None and
+                account in app.interface.instances):
             del app.interface.instances[account]
         del app.nicks[account]
         del app.to_be_removed[account]
@@ -411,7 +580,6 @@ def remove_account(self, account: str) -> None:
         # which would recreate the account with defaults values if not found
         passwords.delete_password(account)
         app.settings.remove_account(account)
-        app.app.remove_account_actions(account)
 
     def _on_signed_in(self, event: SignedIn) -> None:
         client = app.get_client(event.account)
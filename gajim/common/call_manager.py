@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import Optional
+from typing import TYPE_CHECKING
 
 import logging
 import time
@@ -20,9 +21,11 @@
 from gajim.common.helpers import play_sound
 from gajim.common.helpers import AdditionalDataDict
 from gajim.common.i18n import _
-from gajim.common.jingle_rtp import JingleAudio
 from gajim.common.jingle_session import JingleSession
 
+if TYPE_CHECKING:
+    from gajim.common.jingle_rtp import JingleAudio
+
 log = logging.getLogger('gajim.c.call_manager')
 
 
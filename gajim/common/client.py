@@ -16,6 +16,7 @@
 
 from typing import Any
 from typing import Optional
+from typing import TYPE_CHECKING
 
 import logging
 
@@ -24,11 +25,10 @@
 from nbxmpp.protocol import JID
 from nbxmpp.const import StreamError
 from nbxmpp.const import ConnectionType
+from nbxmpp.structs import StanzaHandler
 
-from gi.repository import GLib
 from gi.repository import Gio
 from gi.repository import GObject
-from gi.repository import Gtk
 
 from gajim.common import app
 from gajim.common import helpers
@@ -56,7 +56,8 @@
 from gajim.common.i18n import _
 from gajim.common.structs import OutgoingMessage
 
-from gajim.gui.util import open_window
+if TYPE_CHECKING:
+    from gi.repository import Gtk
 
 
 log = logging.getLogger('gajim.client')
@@ -91,7 +92,6 @@ def __init__(self, account: str) -> None:
         self._idle_status_message = ''
 
         self._reconnect = True
-        self._reconnect_timer_source = None
         self._destroy_client = False
         self._remove_account = False
 
@@ -135,6 +135,10 @@ def status_message(self) -> str:
     def priority(self) -> int:
         return self._priority
 
+    @property
+    def is_resumeable(self) -> bool:
+        return self._client is not None and self._client.resumeable
+
     @property
     def certificate(self):
         return self._client.peer_certificate[0]
@@ -184,8 +188,16 @@ def _create_client(self) -> None:
         self._client.subscribe('stanza-sent', self._on_stanza_sent)
         self._client.subscribe('stanza-received', self._on_stanza_received)
 
-        for handler in modules.get_handlers(self):
-            self._client.register_handler(handler)
+        self.register_handlers(modules.get_handlers(self))
+
+    def register_handlers(self, handlers: list[StanzaHandler]) -> None:
+        if self._client is None:
+            # Handlers are registered when the next client is created
+            return
+
+        for handler in handlers:
+            self._client.register_handler(
+                app.stanza_metrics.wrap_handler(self._account, handler))
 
     def _on_resume_failed(self,
                           _client: NBXMPPClient,
@@ -209,6 +221,7 @@ def _on_resume_successful(self,
 
     def _set_client_available(self) -> None:
         self._set_state(ClientState.AVAILABLE)
+        app.reconnect_manager.connection_succeeded(self)
         app.ged.raise_event(AccountConnected(account=self._account))
 
     def disconnect(self,
@@ -246,11 +259,16 @@ def _on_disconnected(self,
 
             cert, errors = self._client.peer_certificate
 
-            open_window('SSLErrorDialog',
-                        account=self._account,
-                        client=self,
-                        cert=cert,
-                        error=errors.pop())
+            if app.app.headless:
+                log.error('%s: Certificate is not valid: %s',
+                          self._account, errors)
+            else:
+                from gajim.gui.util import open_window
+                open_window('SSLErrorDialog',
+                            account=self._account,
+                            client=self,
+                            cert=cert,
+                            error=errors.pop())
 
         elif domain in (StreamError.STREAM, StreamError.BIND):
             if error == 'conflict':
@@ -312,6 +330,7 @@ def _after_disconnect(self) -> None:
     def _on_connection_failed(self,
                               _client: NBXMPPClient,
                               _signal_name: str) -> None:
+        app.reconnect_manager.connection_failed(self)
         self._schedule_reconnect()
 
     def _on_connected(self,
@@ -563,9 +582,12 @@ def connect(self, ignored_tls_errors: IgnoredTlsErrorsT = None) -> None:
 
     def _schedule_reconnect(self) -> None:
         self._set_state(ClientState.RECONNECT_SCHEDULED)
-        log.info('Reconnect to %s in 3s', self._account)
-        self._reconnect_timer_source = GLib.timeout_add_seconds(
-            3, self._prepare_for_connect)
+        app.reconnect_manager.schedule(self)
+
+    def reconnect(self) -> None:
+        if not self._state.is_reconnect_scheduled:
+            return
+        self._prepare_for_connect()
 
     def _abort_reconnect(self) -> None:
         self._set_state(ClientState.DISCONNECTED)
@@ -580,9 +602,7 @@ def _abort_reconnect(self) -> None:
         self.notify('state-changed', SimpleClientState.DISCONNECTED)
 
     def _disable_reconnect_timer(self) -> None:
-        if self._reconnect_timer_source is not None:
-            GLib.source_remove(self._reconnect_timer_source)
-            self._reconnect_timer_source = None
+        app.reconnect_manager.cancel(self._account)
 
     def _idle_state_changed(self, monitor: IdleMonitorManager) -> None:
         state = monitor.state.value
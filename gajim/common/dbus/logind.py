@@ -74,7 +74,10 @@ def _on_prepare_for_shutdown(self,
         else:
             log.info('Preparing for shutdown by quitting Gajim')
 
-        app.window.quit()
+        if app.window is None:
+            app.app.start_shutdown()
+        else:
+            app.window.quit()
 
     def _obtain_delay_inhibitor(self, connection: Gio.DBusConnection) -> None:
         '''Obtain a shutdown delay inhibitor from logind'''
@@ -13,12 +13,18 @@
 # along with Gajim. If not, see <http://www.gnu.org/licenses/>.
 
 from typing import Any
+from typing import Optional
 from typing import cast
 
+import itertools
 import logging
+from dataclasses import dataclass
+from dataclasses import field
 
 from gi.repository import GLib
 from gi.repository import Gio
+from nbxmpp.protocol import JID
+from nbxmpp.protocol import InvalidJid
 
 from gajim.common import app
 from gajim.common import ged
@@ -30,6 +36,25 @@
 
 log = logging.getLogger('gajim.c.dbus.remote_control')
 
+OBJECT_PATH = '/org/gajim/dbus/RemoteObject'
+INTERFACE_NAME = 'org.gajim.dbus.RemoteInterface'
+
+# Events which can be subscribed to
+EVENT_TYPES = (
+    'gc-message-received',
+    'message-received',
+    'message-sent',
+    'our-show',
+    'presence-received',
+)
+
+# Events are delivered in batches, at most every BATCH_INTERVAL ms or
+# when MAX_BATCH_SIZE events are queued for a subscription
+BATCH_INTERVAL = 200
+MAX_BATCH_SIZE = 100
+
+MAX_PAGE_SIZE = 500
+
 INTERFACE_DESC = '''
 <!DOCTYPE node PUBLIC '-//freedesktop//DTD D-BUS Object Introspection 1.0//EN'
 'http://www.freedesktop.org/standards/dbus/1.0/introspect.dtd'>
@@ -68,6 +93,30 @@
             <arg name='account' type='s' />
             <arg direction='out' type='aa{sv}' />
         </method>
+        <method name='list_contacts_paged'>
+            <arg name='account' type='s' />
+            <arg name='offset' type='u' />
+            <arg name='limit' type='u' />
+            <arg name='contacts' direction='out' type='aa{sv}' />
+            <arg name='total' direction='out' type='u' />
+        </method>
+        <method name='get_unread_counts'>
+            <arg name='account' type='s' />
+            <arg name='offset' type='u' />
+            <arg name='limit' type='u' />
+            <arg name='chats' direction='out' type='a(ssu)' />
+            <arg name='total' direction='out' type='u' />
+        </method>
+        <method name='subscribe'>
+            <arg name='event_types' type='as' />
+            <arg name='accounts' type='as' />
+            <arg name='jids' type='as' />
+            <arg name='subscription_id' direction='out' type='s' />
+        </method>
+        <method name='unsubscribe'>
+            <arg name='subscription_id' type='s' />
+            <arg direction='out' type='b' />
+        </method>
         <method name='send_chat_message'>
             <arg name='jid' type='s' />
             <arg name='message' type='s' />
@@ -80,6 +129,10 @@
             <arg name='account' type='s' />
             <arg direction='out' type='b' />
         </method>
+        <signal name='Events'>
+            <arg name='subscription_id' type='s' />
+            <arg name='events' type='aa{sv}' />
+        </signal>
         <signal name='AccountPresence'>
             <arg type='av' />
         </signal>
@@ -128,15 +181,46 @@ def get_dbus_struct(obj: Any) -> GLib.Variant:
     return GLib.Variant('s', str(obj))
 
 
+@dataclass
+class Subscription:
+    id: str
+    sender: str
+    event_types: set[str]
+    accounts: set[str]
+    jids: set[str]
+    queue: list[dict[str, GLib.Variant]] = field(default_factory=list)
+
+    def get_event_types(self) -> set[str]:
+        return self.event_types or set(EVENT_TYPES)
+
+    def matches(self, event_type: str, account: str, jid: str) -> bool:
+        '''
+        Empty filters match everything
+        '''
+        if self.event_types and event_type not in self.event_types:
+            return False
+        if self.accounts and account not in self.accounts:
+            return False
+        if self.jids and jid not in self.jids:
+            return False
+        return True
+
+
 class Server:
+
+    # Methods which receive the unique bus name of the caller as first argument
+    _sender_methods: set[str] = set()
+
     def __init__(self, con: Gio.DBusConnection, path: str) -> None:
         self._method_outargs: dict[str, str] = {}
         self._method_inargs: dict[str, tuple[str, ...]] = {}
+        self._method_num_outargs: dict[str, int] = {}
         node_info = Gio.DBusNodeInfo.new_for_xml(INTERFACE_DESC)
         for interface in node_info.interfaces:
             for method in interface.methods:
                 self._method_outargs[method.name] = '(' + ''.join(
                     [arg.signature for arg in method.out_args]) + ')'
+                self._method_num_outargs[method.name] = len(method.out_args)
                 self._method_inargs[method.name] = tuple(
                     arg.signature for arg in method.in_args)
 
@@ -147,7 +231,7 @@ def __init__(self, con: Gio.DBusConnection, path: str) -> None:
 
     def _on_method_call(self,
                         _connection: Gio.DBusConnection,
-                        _sender: str,
+                        sender: str,
                         _object_path: str,
                         _interface_name: str,
                         method_name: str,
@@ -161,11 +245,21 @@ def _on_method_call(self,
                 fd_list = msg.get_unix_fd_list()
                 args[i] = fd_list.get(args[i])
 
-        result = getattr(self, method_name)(*args)
+        if method_name in self._sender_methods:
+            args.insert(0, sender)
+
+        try:
+            result = getattr(self, method_name)(*args)
+        except ValueError as error:
+            invocation.return_dbus_error(f'{INTERFACE_NAME}.InvalidArgs',
+                                         str(error))
+            return
 
         # out_args is at least (signature1). We therefore always wrap the result
         # as a tuple. Refer to https://bugzilla.gnome.org/show_bug.cgi?id=765603
-        result = (result, )
+        # Methods with more than one out arg return a tuple already.
+        if self._method_num_outargs[method_name] <= 1:
+            result = (result, )
 
         out_args = self._method_outargs[method_name]
         if out_args != '()':
@@ -175,13 +269,35 @@ def _on_method_call(self,
             invocation.return_value(None)
 
 
+def _get_page_size(limit: int) -> int:
+    if limit == 0:
+        return MAX_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
 class GajimRemote(Server):
+
+    _sender_methods = {'subscribe', 'unsubscribe'}
+
     def __init__(self) -> None:
         self._con = Gio.bus_get_sync(Gio.BusType.SESSION, None)
         Gio.bus_own_name_on_connection(self._con, 'org.gajim.Gajim',
                                        Gio.BusNameOwnerFlags.NONE, None, None)
-        super().__init__(self._con, '/org/gajim/dbus/RemoteObject')
+        super().__init__(self._con, OBJECT_PATH)
+
+        self._subscription_ids = itertools.count(1)
+        self._subscriptions: dict[str, Subscription] = {}
+        # Bus name watchers of subscribers
+        self._watchers: dict[str, int] = {}
+        # Events are only handled while someone is subscribed to them
+        self._registered_event_types: set[str] = set()
+        self._flush_id: Optional[int] = None
 
+        if app.settings.get('remote_control_legacy_signals'):
+            self._register_legacy_signals()
+
+    def _register_legacy_signals(self) -> None:
+        # Deprecated broadcast signals, replaced by subscribe()
         app.ged.register_event_handler('presence-received',
                                        ged.POSTGUI,
                                        self._on_presence_received)
@@ -201,7 +317,7 @@ def __init__(self) -> None:
     def _on_message_sent(self, event: events.MessageSent) -> None:
         self.raise_signal('MessageSent', (
             event.account, [event.jid,
-                          event.message]))
+                            event.message]))
 
     def _on_presence_received(self, event: events.PresenceReceived) -> None:
         self.raise_signal('ContactPresence', (event.account, [
@@ -239,11 +355,203 @@ def _on_our_status(self, event: events.ShowChanged) -> None:
     def raise_signal(self, event_name: str, data: Any) -> None:
         log.info('Send event %s', event_name)
         self._con.emit_signal(None,
-                              '/org/gajim/dbus/RemoteObject',
-                              'org.gajim.dbus.RemoteInterface',
+                              OBJECT_PATH,
+                              INTERFACE_NAME,
                               event_name,
                               GLib.Variant.new_tuple(get_dbus_struct(data)))
 
+    def subscribe(self,
+                  sender: str,
+                  event_types: list[str],
+                  accounts: list[str],
+                  jids: list[str]) -> str:
+
+        unknown_types = set(event_types) - set(EVENT_TYPES)
+        if unknown_types:
+            raise ValueError(
+                f'Unknown event types: {", ".join(sorted(unknown_types))}')
+
+        try:
+            bare_jids = {JID.from_string(jid).bare for jid in jids}
+        except InvalidJid as error:
+            raise ValueError(f'Invalid JID: {error}') from error
+
+        subscription = Subscription(id=str(next(self._subscription_ids)),
+                                    sender=sender,
+                                    event_types=set(event_types),
+                                    accounts=set(accounts),
+                                    jids=bare_jids)
+        self._subscriptions[subscription.id] = subscription
+        log.info('%s subscribed to %s (accounts: %s, jids: %s)',
+                 sender,
+                 event_types or 'all events',
+                 accounts or 'all',
+                 jids or 'all')
+
+        if sender not in self._watchers:
+            self._watchers[sender] = Gio.bus_watch_name_on_connection(
+                self._con,
+                sender,
+                Gio.BusNameWatcherFlags.NONE,
+                None,
+                self._on_subscriber_vanished)
+
+        self._update_event_handlers()
+        return subscription.id
+
+    def unsubscribe(self, sender: str, subscription_id: str) -> bool:
+        subscription = self._subscriptions.get(subscription_id)
+        if subscription is None or subscription.sender != sender:
+            return False
+
+        self._remove_subscription(subscription)
+        if not any(sub.sender == sender
+                   for sub in self._subscriptions.values()):
+            Gio.bus_unwatch_name(self._watchers.pop(sender))
+
+        self._update_event_handlers()
+        return True
+
+    def _on_subscriber_vanished(self,
+                                _con: Gio.DBusConnection,
+                                name: str) -> None:
+
+        log.info('Subscriber %s vanished', name)
+        for subscription in list(self._subscriptions.values()):
+            if subscription.sender == name:
+                self._remove_subscription(subscription)
+
+        watcher_id = self._watchers.pop(name, None)
+        if watcher_id is not None:
+            Gio.bus_unwatch_name(watcher_id)
+
+        self._update_event_handlers()
+
+    def _remove_subscription(self, subscription: Subscription) -> None:
+        log.info('Remove subscription %s of %s',
+                 subscription.id, subscription.sender)
+        self._flush_subscription(subscription)
+        del self._subscriptions[subscription.id]
+
+    def _update_event_handlers(self) -> None:
+        event_types: set[str] = set()
+        for subscription in self._subscriptions.values():
+            event_types |= subscription.get_event_types()
+
+        for event_type in event_types - self._registered_event_types:
+            app.ged.register_event_handler(event_type,
+                                           ged.POSTGUI,
+                                           self._on_event)
+
+        for event_type in self._registered_event_types - event_types:
+            app.ged.remove_event_handler(event_type,
+                                         ged.POSTGUI,
+                                         self._on_event)
+
+        self._registered_event_types = event_types
+
+    def _on_event(self, event: events.ApplicationEvent) -> None:
+        account: str = getattr(event, 'account')
+        jid = getattr(event, 'jid', None)
+        if jid is not None:
+            jid = JID.from_string(str(jid)).bare
+
+        data: Optional[dict[str, GLib.Variant]] = None
+        for subscription in list(self._subscriptions.values()):
+            if not subscription.matches(event.name, account, jid or ''):
+                continue
+
+            if data is None:
+                # Convert only once, and only if someone is interested
+                data = self._get_event_data(event)
+                data.update({
+                    'type': GLib.Variant('s', event.name),
+                    'account': GLib.Variant('s', account),
+                })
+                if jid is not None:
+                    data['jid'] = GLib.Variant('s', jid)
+
+            subscription.queue.append(data)
+            if len(subscription.queue) >= MAX_BATCH_SIZE:
+                self._flush_subscription(subscription)
+
+        if self._flush_id is None and data is not None:
+            self._flush_id = GLib.timeout_add(BATCH_INTERVAL, self._on_flush)
+
+    @staticmethod
+    def _get_event_data(event: events.ApplicationEvent
+                        ) -> dict[str, GLib.Variant]:
+
+        data: dict[str, Any] = {}
+        if isinstance(event, events.GcMessageReceived):
+            data = {
+                'fjid': event.fjid,
+                'message': event.msgtxt,
+                'timestamp': event.properties.timestamp,
+                'delayed': event.delayed,
+                'nickname': event.properties.muc_nickname,
+                'displaymarking': event.displaymarking,
+                'needs_highlight': event.needs_highlight,
+            }
+
+        elif isinstance(event, events.MessageReceived):
+            message_type = event.properties.type.value
+            if event.properties.is_muc_pm:
+                message_type = 'pm'
+            data = {
+                'fjid': event.fjid,
+                'message': event.msgtxt,
+                'timestamp': event.properties.timestamp,
+                'message_type': message_type,
+                'subject': event.properties.subject,
+                'msg_log_id': event.msg_log_id,
+                'nickname': event.properties.nickname,
+            }
+
+        elif isinstance(event, events.MessageSent):
+            data = {
+                'message': event.message,
+                'timestamp': event.timestamp,
+                'msg_log_id': event.msg_log_id,
+            }
+
+        elif isinstance(event, events.PresenceReceived):
+            data = {
+                'resource': event.resource,
+                'show': event.show,
+                'status': event.status,
+            }
+
+        elif isinstance(event, events.ShowChanged):
+            data = {'show': event.show}
+
+        return {key: get_dbus_struct(value) for key, value in data.items()
+                if value is not None}
+
+    def _on_flush(self) -> bool:
+        self._flush_id = None
+        for subscription in self._subscriptions.values():
+            self._flush_subscription(subscription)
+        return False
+
+    def _flush_subscription(self, subscription: Subscription) -> None:
+        if not subscription.queue:
+            return
+
+        queue = subscription.queue
+        subscription.queue = []
+        log.info('Send %s events to %s', len(queue), subscription.sender)
+        try:
+            self._con.emit_signal(subscription.sender,
+                                  OBJECT_PATH,
+                                  INTERFACE_NAME,
+                                  'Events',
+                                  GLib.Variant('(saa{sv})',
+                                               (subscription.id, queue)))
+        except GLib.Error as error:
+            log.warning('Unable to send events to %s: %s',
+                        subscription.sender, error)
+
     @staticmethod
     def get_status(account: str) -> str:
         if not account:
@@ -360,24 +668,44 @@ def account_info(account: str) -> dict[str, str]:
                                                                   'resource')
         return result
 
-    def list_contacts(self, account: str) -> list[dict[str, GLib.Variant]]:
-        result: list[dict[str, GLib.Variant]] = []
+    @staticmethod
+    def _get_accounts(account: str) -> list[str]:
         accounts = app.settings.get_active_accounts()
-        if not accounts:
-            return result
         if account:
-            accounts_to_search = [account]
-        else:
-            accounts_to_search = accounts
-        for acct in accounts_to_search:
-            if acct in accounts:
-                client = app.get_client(acct)
-                for contact in client.get_module('Roster').iter_contacts():
-                    item = self._contacts_as_dbus_structure(contact)
-                    if item:
-                        result.append(item)
+            return [account] if account in accounts else []
+        return accounts
+
+    def list_contacts(self, account: str) -> list[dict[str, GLib.Variant]]:
+        result: list[dict[str, GLib.Variant]] = []
+        for acct in self._get_accounts(account):
+            client = app.get_client(acct)
+            for contact in client.get_module('Roster').iter_contacts():
+                item = self._contacts_as_dbus_structure(contact)
+                if item:
+                    result.append(item)
         return result
 
+    def list_contacts_paged(self,
+                            account: str,
+                            offset: int,
+                            limit: int
+                            ) -> tuple[list[dict[str, GLib.Variant]], int]:
+        '''
+        Returns up to `limit` roster contacts starting at `offset`, and the
+        total number of contacts. Contacts are sorted by account and JID.
+        '''
+        contacts: list[BareContact] = []
+        for acct in self._get_accounts(account):
+            client = app.get_client(acct)
+            contacts.extend(client.get_module('Roster').iter_contacts())
+
+        contacts.sort(key=lambda contact: (contact.account, str(contact.jid)))
+        page = contacts[offset:offset + _get_page_size(limit)]
+        # Only contacts on the requested page are converted
+        result = [self._contacts_as_dbus_structure(contact)
+                  for contact in page]
+        return result, len(contacts)
+
     @staticmethod
     def _contacts_as_dbus_structure(contact: BareContact
                                     ) -> dict[str, GLib.Variant]:
@@ -406,8 +734,28 @@ def _contacts_as_dbus_structure(contact: BareContact
 
     @staticmethod
     def get_unread_msgs_number() -> str:
+        if app.window is None:
+            count = sum(unread.count for unread in
+                        app.storage.cache.get_unread())
+            return str(count)
         return str(app.window.get_total_unread_count())
 
+    def get_unread_counts(self,
+                          account: str,
+                          offset: int,
+                          limit: int
+                          ) -> tuple[list[tuple[str, str, int]], int]:
+        '''
+        Returns up to `limit` (account, jid, count) of chats with unread
+        messages starting at `offset`, and the total number of these chats
+        '''
+        accounts = self._get_accounts(account)
+        chats = [(row.account, str(row.jid), row.count)
+                 for row in app.storage.cache.get_unread()
+                 if row.count and row.account in accounts]
+        chats.sort()
+        return chats[offset:offset + _get_page_size(limit)], len(chats)
+
     @staticmethod
     def Introspect() -> str:  # pylint: disable=invalid-name
         return INTERFACE_DESC
@@ -417,6 +417,7 @@ class MessageReceived(ApplicationEvent):
 class GcMessageReceived(MessageReceived):
     name: str = field(init=False, default='gc-message-received')
     room_jid: str
+    needs_highlight: bool = False
 
 
 @dataclass
@@ -562,6 +563,15 @@ class MucAdded(ApplicationEvent):
     jid: JID
 
 
+@dataclass
+class MUCJoinProgress(ApplicationEvent):
+    name: str = field(init=False, default='muc-join-progress')
+    account: str
+    total: int
+    finished: int
+    catch_ups: int
+
+
 @dataclass
 class MucDecline(ApplicationEvent):
     name: str = field(init=False, default='muc-decline')
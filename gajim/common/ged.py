@@ -16,16 +16,23 @@
 
 from typing import Any
 from typing import Callable
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+from typing import Optional
 
 import logging
 import traceback
 import inspect
 import operator
+import time
 
 from nbxmpp import NodeProcessed
 
 from gajim.common import app
-from gajim.common.events import ApplicationEvent
+from gajim.common.i18n import _
+
+if TYPE_CHECKING:
+    from gajim.common.events import ApplicationEvent
 
 log = logging.getLogger('gajim.c.ged')
 
@@ -46,11 +53,49 @@
 EventHandlerT = tuple[str, int, HandlerFuncT]
 
 
+def get_handler_name(handler: Callable[..., Any]) -> str:
+    name = getattr(handler, '__qualname__', None)
+    if name is None:
+        return repr(handler)
+    module = getattr(handler, '__module__', None)
+    if module is None:
+        return name
+    return f'{module}.{name}'
+
+
+class HandlerStats(NamedTuple):
+    event_name: str
+    handler: str
+    calls: int
+    total_time: float
+    max_time: float
+
+
 class GlobalEventsDispatcher:
 
     def __init__(self):
         self.handlers: dict[str, list[tuple[int, HandlerFuncT]]] = {}
 
+        # Immutable snapshot of the handlers per event, rebuilt on
+        # register/remove. Handlers can modify the handlers list while
+        # an event is dispatched without affecting the running dispatch.
+        self._dispatch: dict[str, tuple[HandlerFuncT, ...]] = {}
+
+        # (event_name, handler name) -> [calls, total time, max time]
+        self._stats: Optional[dict[tuple[str, str], list[Any]]] = None
+
+        # Name of the event which is dispatched at the moment
+        self.current_event: Optional[str] = None
+
+    def _update_dispatch(self, event_name: str) -> None:
+        handlers_list = self.handlers.get(event_name)
+        if not handlers_list:
+            self._dispatch.pop(event_name, None)
+            return
+
+        self._dispatch[event_name] = tuple(
+            handler for _priority, handler in handlers_list)
+
     def register_event_handler(self,
                                event_name: str,
                                priority: int,
@@ -58,6 +103,7 @@ def register_event_handler(self,
 
         if event_name not in self.handlers:
             self.handlers[event_name] = [(priority, handler)]
+            self._update_dispatch(event_name)
             return
 
         handlers_list = self.handlers[event_name]
@@ -67,6 +113,7 @@ def register_event_handler(self,
 
         handlers_list.append((priority, handler))
         handlers_list.sort(key=operator.itemgetter(0))
+        self._update_dispatch(event_name)
 
     def remove_event_handler(self,
                              event_name: str,
@@ -81,32 +128,127 @@ def remove_event_handler(self,
                     '''Function (%s) with priority "%s" never
                     registered as handler of event "%s". Couldn\'t remove.
                     Error: %s''', handler, priority, event_name, error)
+                return
+
+            self._update_dispatch(event_name)
 
     def raise_event(self, event_obj: ApplicationEvent) -> Any:
+        previous_event = self.current_event
+        self.current_event = event_obj.name
+        try:
+            return self._raise_event(event_obj)
+        finally:
+            self.current_event = previous_event
+
+    def _raise_event(self, event_obj: ApplicationEvent) -> Any:
         event_name = event_obj.name
-        log.debug('Raise event: %s', event_name)
-        if event_name in self.handlers:
-            node_processed = False
-            # Iterate over a copy of the handlers list, so while iterating
-            # the original handlers list can be modified
-            for _priority, handler in list(self.handlers[event_name]):
-                try:
+        handlers = self._dispatch.get(event_name)
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            log.debug('Raise event: %s', event_name)
+
+        if handlers is None:
+            return None
+
+        stats = self._stats
+        node_processed = False
+        for handler in handlers:
+            try:
+                if debug:
                     if inspect.ismethod(handler):
                         log.debug('Call handler %s on %s',
                                   handler.__name__,
                                   handler.__self__)
                     else:
                         log.debug('Call handler %s', handler.__name__)
+
+                if stats is None:
                     if handler(event_obj):
                         return True
-                except NodeProcessed:
-                    node_processed = True
-                except Exception:
-                    log.error('Error while running an event handler: %s',
-                              handler)
-                    traceback.print_exc()
-            if node_processed:
-                raise NodeProcessed
+                    continue
+
+                start = time.perf_counter()
+                try:
+                    result = handler(event_obj)
+                finally:
+                    self._record(stats,
+                                 event_name,
+                                 handler,
+                                 time.perf_counter() - start)
+                if result:
+                    return True
+
+            except NodeProcessed:
+                node_processed = True
+            except Exception:
+                log.error('Error while running an event handler: %s',
+                          handler)
+                traceback.print_exc()
+
+        if node_processed:
+            raise NodeProcessed
+        return None
+
+    def _record(self,
+                stats: dict[tuple[str, str], list[Any]],
+                event_name: str,
+                handler: HandlerFuncT,
+                elapsed: float) -> None:
+
+        key = (event_name, get_handler_name(handler))
+        entry = stats.get(key)
+        if entry is None:
+            stats[key] = [1, elapsed, elapsed]
+            return
+
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+    @property
+    def profiling(self) -> bool:
+        return self._stats is not None
+
+    def start_profiling(self) -> None:
+        if self._stats is not None:
+            return
+        log.info('Start profiling event handlers')
+        self._stats = {}
+
+    def stop_profiling(self) -> None:
+        log.info('Stop profiling event handlers')
+        self._stats = None
+
+    def reset_profiling(self) -> None:
+        if self._stats is not None:
+            self._stats.clear()
+
+    def get_profiling_stats(self) -> list[HandlerStats]:
+        if self._stats is None:
+            return []
+
+        result = [HandlerStats(event_name, handler, *entry)
+                  for (event_name, handler), entry in self._stats.items()]
+        result.sort(key=operator.attrgetter('total_time'), reverse=True)
+        return result
+
+    def get_profiling_report(self, limit: Optional[int] = None) -> str:
+        if self._stats is None:
+            return _('Event handler profiling is disabled')
+
+        lines = [
+            f'{_("Calls"):>8} {_("Total ms"):>10} {_("Avg ms"):>8} '
+            f'{_("Max ms"):>8}  {_("Event / Handler")}'
+        ]
+        for stat in self.get_profiling_stats()[:limit]:
+            lines.append(
+                f'{stat.calls:>8} '
+                f'{stat.total_time * 1000:>10.2f} '
+                f'{stat.total_time * 1000 / stat.calls:>8.3f} '
+                f'{stat.max_time * 1000:>8.2f}  '
+                f'{stat.event_name} / {stat.handler}')
+        return '\n'.join(lines)
 
 
 class EventHelper:
@@ -0,0 +1,128 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from gi.repository import Gio
+from gi.repository import GLib
+
+import gajim
+# app has to be imported before ged, ged imports app which creates the
+# GlobalEventsDispatcher on import
+from gajim.common import app  # noqa: F401
+from gajim.common import configpaths
+from gajim.common import ged
+from gajim.common import idle
+from gajim.common.application import CoreApplication
+from gajim.common.events import PasswordRequired
+from gajim.common.startup_timeline import timeline
+from gajim.common.storage.avatar import AvatarFileStorage
+
+
+class HeadlessApplication(Gio.Application, CoreApplication):
+    '''
+    Runs accounts, storage and plugins without GUI
+
+    No GTK widgets are created, Gajim is controlled via the
+    remote control interface.
+    '''
+
+    headless = True
+
+    def __init__(self) -> None:
+        CoreApplication.__init__(self)
+        Gio.Application.__init__(
+            self,
+            application_id='org.gajim.Gajim.Headless',
+            flags=Gio.ApplicationFlags.CAN_OVERRIDE_APP_ID)
+
+        self._add_core_options()
+
+        self.connect('handle-local-options', self._handle_local_options)
+        self.connect('activate', self._on_activate)
+        self.connect('shutdown', self._shutdown)
+
+        self.avatar_storage = AvatarFileStorage()
+
+        GLib.set_prgname('gajim-headless')
+
+    def _handle_local_options(self,
+                              _application: Gio.Application,
+                              options: GLib.VariantDict) -> int:
+
+        if options.contains('version'):
+            print(gajim.__version__)
+            return 0
+
+        profile = options.lookup_value('profile')
+        if profile is not None:
+            profile = profile.get_string()
+            app_id = '%s.%s' % (self.get_application_id(), profile)
+            self.set_application_id(app_id)
+            configpaths.set_profile(profile)
+
+        self.register()
+        if self.get_is_remote():
+            print('Gajim is already running with this profile')
+            return 1
+
+        self._core_command_line(options)
+        with timeline.phase('Startup'):
+            self._startup()
+        return -1
+
+    def _startup(self) -> None:
+        # There is no user session which could become idle
+        idle.Monitor.disable()
+
+        with timeline.phase('Init core'):
+            self._init_core()
+
+        self.register_event('password-required',
+                            ged.CORE,
+                            self._on_password_required)
+
+        # Keep running, there is no window which would hold the application
+        self.hold()
+
+        GLib.idle_add(self._on_startup_finished)
+        GLib.timeout_add(100, self._auto_connect)
+
+    def _on_startup_finished(self) -> bool:
+        self._finish_startup_timeline()
+        return False
+
+    def _on_activate(self, _application: Gio.Application) -> None:
+        # Nothing to show, startup is done in _handle_local_options()
+        pass
+
+    def _on_password_required(self, event: PasswordRequired) -> None:
+        # There is no dialog to ask for the password
+        self._log.error('%s: Password is missing or wrong',
+                        event.client.account)
+
+    def _remote_init(self) -> None:
+        # Without GUI remote control is the only way to control Gajim,
+        # it is started regardless of the remote_control setting
+        try:
+            from gajim.common.dbus import remote_control
+            remote_control.GajimRemote()
+        except Exception:
+            self._log.exception('Failed to init remote control')
+
+    def _shutdown(self, _application: HeadlessApplication) -> None:
+        self._shutdown_core()
+
+    def _quit_app(self) -> None:
+        self.quit()
@@ -87,6 +87,7 @@
 
 from gajim.common import app
 from gajim.common import configpaths
+from gajim.common import highlight
 from gajim.common import iana
 from gajim.common.i18n import p_
 from gajim.common.i18n import _
@@ -311,6 +312,21 @@ def chatstate_to_string(chatstate: Optional[Chatstate]) -> str:
     raise ValueError('unknown value: %s' % chatstate)
 
 
+def composing_participants_to_string(nicks: list[str]) -> str:
+    if not nicks:
+        return ''
+
+    if len(nicks) == 1:
+        return _('%s is composing a message…') % nicks[0]
+
+    if len(nicks) <= 3:
+        return _('%s are composing messages…') % ', '.join(nicks)
+
+    return ngettext('%s and %d other participant are composing messages…',
+                    '%s and %d other participants are composing messages…',
+                    len(nicks) - 2) % (', '.join(nicks[:2]), len(nicks) - 2)
+
+
 def exec_command(command: str,
                  use_shell: bool = False,
                  posix: bool = True
@@ -584,27 +600,7 @@ def message_needs_highlight(text: str, nickname: str, own_jid: str) -> bool:
     Check text to see whether any of the words in (muc_highlight_words and
     nick) appear
     '''
-    special_words = app.settings.get('muc_highlight_words').split(';')
-    special_words.append(nickname)
-    special_words.append(own_jid)
-    # Strip empties: ''.split(';') == [''] and would highlight everything.
-    # Also lowercase everything for case insensitive compare.
-    special_words = [word.lower() for word in special_words if word]
-    text = text.lower()
-
-    for special_word in special_words:
-        found_here = text.find(special_word)
-        while found_here > -1:
-            end_here = found_here + len(special_word)
-            if ((found_here == 0 or not text[found_here - 1].isalpha()) and
-                    (end_here == len(text) or not text[end_here].isalpha())):
-                # It is beginning of text or char before is not alpha AND
-                # it is end of text or char after is not alpha
-                return True
-            # continue searching
-            start = found_here + 1
-            found_here = text.find(special_word, start)
-    return False
+    return highlight.matchers.get(nickname, own_jid).matches(text)
 
 
 def allow_showing_notification(account: str) -> bool:
@@ -644,7 +640,8 @@ def get_optional_features(account: str) -> list[str]:
         features.append(Namespace.BOOKMARKS_1 + '+notify')
     elif client.get_module('Bookmarks').pep_bookmarks_used:
         features.append(Namespace.BOOKMARKS + '+notify')
-    if app.is_installed('AV'):
+    # Probing AV loads GStreamer, avoid this on every connect
+    if app.may_be_installed('AV'):
         features.append(Namespace.JINGLE_RTP)
         features.append(Namespace.JINGLE_RTP_AUDIO)
         features.append(Namespace.JINGLE_RTP_VIDEO)
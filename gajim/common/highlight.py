@@ -0,0 +1,107 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Optional
+
+import logging
+import re
+
+from gajim.common import app
+
+log = logging.getLogger('gajim.c.highlight')
+
+# Number of matchers kept, there is one matcher per nickname and own JID
+MAX_MATCHERS = 500
+
+# A letter, i.e. a word character which is neither a digit nor '_'
+LETTER = r'[^\W\d_]'
+
+
+class HighlightMatcher:
+    '''
+    Matches highlight words in a text, case insensitive
+
+    A word matches only if it is not preceded or followed by a letter.
+    All words are compiled into one regular expression, which is tried at
+    each position in the text. Longer words are tried first, shorter words
+    are tried if the longer ones don't match at a position.
+    '''
+
+    def __init__(self, words: list[str]) -> None:
+        # Strip empties: ''.split(';') == [''] and would highlight everything
+        words = sorted({word.lower() for word in words if word},
+                       key=len,
+                       reverse=True)
+
+        self._regex: Optional[re.Pattern[str]] = None
+        if words:
+            alternatives = '|'.join(map(re.escape, words))
+            self._regex = re.compile(
+                rf'(?<!{LETTER})(?:{alternatives})(?!{LETTER})',
+                re.IGNORECASE)
+
+    def matches(self, text: str) -> bool:
+        if self._regex is None:
+            return False
+        return self._regex.search(text) is not None
+
+
+def get_highlight_words() -> list[str]:
+    return app.settings.get('muc_highlight_words').split(';')
+
+
+class HighlightMatchers:
+    '''
+    Cache of compiled matchers, keyed by nickname and own JID
+
+    The cache is cleared when the highlight words are changed.
+    '''
+
+    def __init__(self) -> None:
+        self._matchers: dict[tuple[str, str], HighlightMatcher] = {}
+        self._connected = False
+
+    def get(self, nickname: str, own_jid: str) -> HighlightMatcher:
+        key = (nickname, own_jid)
+        matcher = self._matchers.get(key)
+        if matcher is not None:
+            return matcher
+
+        if not self._connected:
+            app.settings.connect_signal('muc_highlight_words',
+                                        self._on_highlight_words_changed)
+            self._connected = True
+
+        if len(self._matchers) >= MAX_MATCHERS:
+            self._matchers.clear()
+
+        words = get_highlight_words()
+        words.append(nickname)
+        words.append(own_jid)
+        matcher = HighlightMatcher(words)
+        self._matchers[key] = matcher
+        return matcher
+
+    def clear(self) -> None:
+        self._matchers.clear()
+
+    def _on_highlight_words_changed(self, *args: Any) -> None:
+        log.info('Highlight words changed')
+        self.clear()
+
+
+matchers = HighlightMatchers()
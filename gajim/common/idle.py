@@ -309,6 +309,13 @@ def set_extended_away(self, state: bool) -> None:
     def is_available(self) -> bool:
         return self._idle_monitor is not None
 
+    def disable(self) -> None:
+        '''
+        Disables idle detection, e.g. if Gajim runs without user session
+        '''
+        log.info('Disable idle monitor')
+        self._idle_monitor = None
+
     @property
     def state(self) -> IdleState:
         if not self.is_available():
@@ -363,7 +370,8 @@ def _poll(self) -> bool:
         '''
         Check to see if we should change state
         '''
-        assert self._idle_monitor is not None
+        if self._idle_monitor is None:
+            return False
 
         if self._idle_monitor.is_extended_away():
             log.info('Extended Away: Screensaver or Locked Screen')
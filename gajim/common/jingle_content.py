@@ -22,6 +22,8 @@
 from typing import Optional
 from typing import TYPE_CHECKING
 
+from importlib import import_module
+
 import nbxmpp
 from nbxmpp.namespaces import Namespace
 
@@ -35,9 +37,17 @@
 
 contents: dict[str, Any] = {}
 
+# Modules which register their contents on import. They pull in GStreamer
+# and Farstream, so they are only imported once such a content arrives.
+LAZY_CONTENTS = {
+    Namespace.JINGLE_RTP: 'gajim.common.jingle_rtp',
+}
+
 
 def get_jingle_content(node: nbxmpp.Node):
     namespace = node.getNamespace()
+    if namespace not in contents and namespace in LAZY_CONTENTS:
+        import_module(LAZY_CONTENTS[namespace])
     if namespace in contents:
         return contents[namespace](node)
 
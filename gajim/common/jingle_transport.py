@@ -20,6 +20,7 @@
 
 from typing import Any
 from typing import Optional
+from typing import TYPE_CHECKING
 
 import logging
 import socket
@@ -30,16 +31,14 @@
 from nbxmpp.namespaces import Namespace
 from nbxmpp.util import generate_id
 
-try:
-    from gi.repository import Farstream
-except ImportError:
-    pass
-
 from gajim.common import app
 from gajim.common.client import Client
 from gajim.common.file_props import FileProp
 from gajim.common.jingle_content import JingleContent
 
+if TYPE_CHECKING:
+    from gi.repository import Farstream
+
 log = logging.getLogger('gajim.c.jingle_transport')
 
 transports: dict[str, Any] = {}
@@ -436,6 +435,8 @@ def __init__(self, node: Optional[nbxmpp.Node]) -> None:
         JingleTransport.__init__(self, TransportType.ICEUDP)
 
     def make_candidate(self, candidate) -> nbxmpp.Node:
+        from gi.repository import Farstream
+
         types = {
             Farstream.CandidateType.HOST: 'host',
             Farstream.CandidateType.SRFLX: 'srflx',
@@ -476,6 +477,8 @@ def make_transport(self,
     def parse_transport_stanza(self,
                                transport: nbxmpp.Node
                                ) -> list[Farstream.Candidate]:
+        from gi.repository import Farstream
+
         candidates: list[Farstream.Candidate] = []
         for candidate in transport.iterTags('candidate'):
             foundation = str(candidate['foundation'])
@@ -0,0 +1,278 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from typing import NamedTuple
+from typing import Optional
+
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+
+from gi.repository import GLib
+
+from gajim.common import app
+from gajim.common.i18n import _
+
+log = logging.getLogger('gajim.c.main_loop_monitor')
+
+# All times are in seconds
+HEARTBEAT_INTERVAL = 0.05
+CHECK_INTERVAL = 0.02
+DEFAULT_THRESHOLD = 0.2
+
+STORAGE_PATH = os.path.join('gajim', 'common', 'storage')
+
+
+class LatencyStats(NamedTuple):
+    iterations: int
+    average: float
+    max: float
+
+
+class StallContext(NamedTuple):
+    callback: str
+    event: Optional[str]
+    storage_method: Optional[str]
+
+
+@dataclass
+class Offender:
+    context: StallContext
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    stack: str = ''
+
+
+def _format_frame(frame: traceback.FrameSummary) -> str:
+    filename = frame.filename
+    index = filename.rfind(f'gajim{os.sep}')
+    if index != -1:
+        filename = filename[index:]
+    return f'{frame.name} ({filename}:{frame.lineno})'
+
+
+class MainLoopMonitor:
+    '''
+    Watchdog which measures the latency of the GLib main loop
+
+    A heartbeat source is scheduled on the main loop. A helper thread
+    notices when the heartbeat is late and captures the Python stack of the
+    main thread while it is still blocked. The stall is attributed to the
+    callback which was invoked by the main loop, the GED event being
+    dispatched and the storage method being executed.
+    '''
+
+    def __init__(self) -> None:
+        self._threshold = DEFAULT_THRESHOLD
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+        self._heartbeat_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._main_thread_id = threading.main_thread().ident
+        # Depth of the stack below callbacks invoked by the main loop
+        self._base_depth: Optional[int] = None
+
+        # Set by the helper thread, consumed by the next heartbeat
+        self._pending: Optional[tuple[StallContext, str]] = None
+
+        self._iterations = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._offenders: dict[StallContext, Offender] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, threshold: float = DEFAULT_THRESHOLD) -> None:
+        if self._thread is not None:
+            return
+
+        log.info('Start monitoring main loop, threshold %.0f ms',
+                 threshold * 1000)
+        self._threshold = threshold
+        self._base_depth = None
+        self._last_beat = time.monotonic()
+        self._heartbeat_id = GLib.timeout_add(
+            int(HEARTBEAT_INTERVAL * 1000), self._on_heartbeat)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch,
+                                        name='MainLoopMonitor',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+
+        log.info('Stop monitoring main loop')
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+        if self._heartbeat_id is not None:
+            GLib.source_remove(self._heartbeat_id)
+            self._heartbeat_id = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending = None
+        self._iterations = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._offenders.clear()
+
+    def _on_heartbeat(self) -> bool:
+        now = time.monotonic()
+        latency = max(0.0, now - self._last_beat - HEARTBEAT_INTERVAL)
+        self._last_beat = now
+
+        if self._base_depth is None:
+            # This callback is called directly by the main loop
+            self._base_depth = len(traceback.extract_stack()) - 1
+
+        self._iterations += 1
+        self._total_latency += latency
+        self._max_latency = max(self._max_latency, latency)
+
+        with self._lock:
+            pending = self._pending
+            self._pending = None
+
+        if pending is not None:
+            self._record(*pending, latency)
+        return True
+
+    def _watch(self) -> None:
+        captured_beat = None
+        while not self._stop_event.wait(CHECK_INTERVAL):
+            last_beat = self._last_beat
+            blocked = time.monotonic() - last_beat - HEARTBEAT_INTERVAL
+            if blocked < self._threshold or captured_beat == last_beat:
+                continue
+
+            # Capture only once per stall, while the main thread is blocked
+            captured_beat = last_beat
+            capture = self._capture_main_thread()
+            if capture is None:
+                continue
+
+            with self._lock:
+                self._pending = capture
+
+    def _capture_main_thread(self) -> Optional[tuple[StallContext, str]]:
+        assert self._main_thread_id is not None
+        frame = sys._current_frames().get(  # pylint: disable=protected-access
+            self._main_thread_id)
+        if frame is None:
+            return None
+
+        stack = traceback.extract_stack(frame)
+        return self._get_context(stack), ''.join(stack.format())
+
+    def _get_context(self, stack: traceback.StackSummary) -> StallContext:
+        base_depth = self._base_depth or 0
+        if len(stack) > base_depth:
+            callback = _format_frame(stack[base_depth])
+        else:
+            callback = 'main loop'
+
+        storage_method = None
+        for frame in reversed(stack):
+            if STORAGE_PATH in frame.filename:
+                module = os.path.splitext(os.path.basename(frame.filename))[0]
+                storage_method = f'{module}.{frame.name}'
+                break
+
+        # Read without synchronisation, it is only a hint
+        return StallContext(callback, app.ged.current_event, storage_method)
+
+    def _record(self,
+                context: StallContext,
+                stack: str,
+                latency: float) -> None:
+
+        # The stall was detected after the threshold, the heartbeat measures
+        # how long the main loop was blocked in total
+        duration = max(latency, self._threshold)
+
+        offender = self._offenders.get(context)
+        if offender is None:
+            offender = Offender(context)
+            self._offenders[context] = offender
+
+        offender.count += 1
+        offender.total_time += duration
+        offender.max_time = max(offender.max_time, duration)
+        offender.stack = stack
+
+        log.warning('Main loop blocked for %.0f ms in %s (event: %s, '
+                    'storage: %s)',
+                    duration * 1000,
+                    context.callback,
+                    context.event,
+                    context.storage_method)
+        log.debug('Stack of blocked main loop:\n%s', stack)
+
+    def get_latency_stats(self) -> LatencyStats:
+        if self._iterations == 0:
+            return LatencyStats(0, 0.0, 0.0)
+        return LatencyStats(self._iterations,
+                            self._total_latency / self._iterations,
+                            self._max_latency)
+
+    def get_offenders(self) -> list[Offender]:
+        return sorted(self._offenders.values(),
+                      key=lambda offender: offender.total_time,
+                      reverse=True)
+
+    def get_report(self, limit: Optional[int] = None) -> str:
+        stats = self.get_latency_stats()
+        if stats.iterations == 0:
+            return _('Main loop monitoring is disabled')
+
+        lines = [
+            _('Iterations: {iterations}, average latency: {average:.1f} ms, '
+              'max latency: {max:.1f} ms').format(
+                  iterations=stats.iterations,
+                  average=stats.average * 1000,
+                  max=stats.max * 1000),
+            f'{_("Stalls"):>8} {_("Total ms"):>10} {_("Max ms"):>8}  '
+            f'{_("Callback / Event / Storage")}',
+        ]
+        offenders = self.get_offenders()[:limit]
+        for offender in offenders:
+            context = offender.context
+            lines.append(
+                f'{offender.count:>8} '
+                f'{offender.total_time * 1000:>10.0f} '
+                f'{offender.max_time * 1000:>8.0f}  '
+                f'{context.callback} / {context.event or "-"} / '
+                f'{context.storage_method or "-"}')
+
+        if offenders:
+            lines.append('\n{title}\n{stack}'.format(
+                title=_('Last stack of the worst offender:'),
+                stack=offenders[0].stack))
+        return '\n'.join(lines)
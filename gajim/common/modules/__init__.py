@@ -14,13 +14,18 @@
 
 from __future__ import annotations
 
+from typing import Any
+from typing import NamedTuple
+
 import typing
 
 import inspect
 import logging
+from functools import partial
 from pathlib import Path
 from importlib import import_module
 
+from nbxmpp.namespaces import Namespace
 from nbxmpp.structs import StanzaHandler
 
 from gajim.common.modules.base import BaseModule
@@ -32,17 +37,58 @@
 log = logging.getLogger('gajim.c.m')
 
 _modules: dict[str, dict[str, BaseModule]] = {}
+_clients: dict[str, Client] = {}
 _store_publish_modules = [
     'UserLocation',
     'UserTune',
 ]
 
 
+class Trigger(NamedTuple):
+    name: str
+    typ: str = ''
+    ns: str = ''
+    priority: int = 50
+
+
+class LazyModule(NamedTuple):
+    module: str
+    # Stanzas which cause the module to be loaded, they must match
+    # handlers of the module
+    triggers: list[Trigger]
+
+
+# Rarely used modules, they are loaded on the first call of get() or on
+# the first stanza matching one of their triggers
+LAZY_MODULES = {
+    'AdHocCommands': LazyModule('adhoc_commands', []),
+    'Gateway': LazyModule('gateway', []),
+    'HTTPAuth': LazyModule('http_auth', [
+        Trigger('message', ns=Namespace.HTTP_AUTH, priority=45),
+        Trigger('iq', typ='get', ns=Namespace.HTTP_AUTH, priority=45),
+    ]),
+    'IBB': LazyModule('ibb', [
+        Trigger('iq', ns=Namespace.IBB),
+    ]),
+    'Jingle': LazyModule('jingle', [
+        Trigger('iq', typ='set', ns=Namespace.JINGLE),
+    ]),
+    'RosterItemExchange': LazyModule('roster_item_exchange', [
+        Trigger('iq', typ='set', ns=Namespace.ROSTERX),
+        Trigger('message', ns=Namespace.ROSTERX),
+    ]),
+    'Search': LazyModule('search', []),
+}
+
+_lazy_module_files = {lazy.module for lazy in LAZY_MODULES.values()}
+
+
 def register_modules(client: Client) -> None:
     if client in _modules:
         return
 
     _modules[client.account] = {}
+    _clients[client.account] = client
 
     path = Path(__file__).parent
     for module in path.iterdir():
@@ -53,6 +99,9 @@ def register_modules(client: Client) -> None:
             continue
 
         name = module.stem
+        if name in _lazy_module_files:
+            continue
+
         module = import_module('.%s' % name, package='gajim.common.modules')
         for _, base_class in inspect.getmembers(module, inspect.isclass):
 
@@ -67,6 +116,58 @@ def register_modules(client: Client) -> None:
             _modules[client.account][module_name] = instance
 
 
+def _load_lazy_module(account: str, name: str) -> BaseModule:
+    lazy_module = LAZY_MODULES[name]
+    log.info('Load module %s for %s', name, account)
+    module = import_module(f'.{lazy_module.module}',
+                           package='gajim.common.modules')
+    client = _clients[account]
+    instance = getattr(module, name).get_instance(client)
+    _modules[account][name] = instance
+
+    # The stub handlers are not removed, they do nothing from now on
+    client.register_handlers(instance.handlers)
+    return instance
+
+
+def _on_trigger(account: str,
+                name: str,
+                trigger: Trigger,
+                nbxmpp_client: Any,
+                stanza: Any,
+                properties: Any) -> None:
+
+    if name in _modules[account]:
+        # Module was loaded, its own handlers process the stanza
+        return
+
+    instance = _load_lazy_module(account, name)
+
+    # Handlers which were registered while dispatching are not called
+    # for the current stanza, call them here
+    for handler in sorted(instance.handlers, key=lambda h: h.priority):
+        if (handler.name == trigger.name and
+                handler.typ == trigger.typ and
+                handler.ns == trigger.ns):
+            handler.callback(nbxmpp_client, stanza, properties)
+
+
+def _get_trigger_handlers(account: str) -> list[StanzaHandler]:
+    handlers: list[StanzaHandler] = []
+    for name, lazy_module in LAZY_MODULES.items():
+        if name in _modules[account]:
+            continue
+
+        for trigger in lazy_module.triggers:
+            handlers.append(StanzaHandler(
+                name=trigger.name,
+                callback=partial(_on_trigger, account, name, trigger),
+                typ=trigger.typ,
+                ns=trigger.ns,
+                priority=trigger.priority))
+    return handlers
+
+
 def register_single_module(client: Client,
                            instance: BaseModule,
                            name: str) -> None:
@@ -81,6 +182,7 @@ def unregister_modules(client: Client) -> None:
         if hasattr(instance, 'cleanup'):
             instance.cleanup()
     del _modules[client.account]
+    del _clients[client.account]
 
 
 def unregister_single_module(client: Client, name: str) -> None:
@@ -97,11 +199,17 @@ def send_stored_publish(account: str) -> None:
 
 
 def get(account: str, name: str) -> BaseModule:
-    return _modules[account][name]
+    try:
+        return _modules[account][name]
+    except KeyError:
+        if name not in LAZY_MODULES or account not in _modules:
+            raise
+        return _load_lazy_module(account, name)
 
 
 def get_handlers(client: Client) -> list[StanzaHandler]:
     handlers: list[StanzaHandler] = []
     for module in _modules[client.account].values():
         handlers += module.handlers
+    handlers += _get_trigger_handlers(client.account)
     return handlers
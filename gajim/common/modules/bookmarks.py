@@ -262,10 +262,8 @@ def _join_with_timeout(self, bookmarks: list[BookmarkData]) -> None:
         self.auto_join_bookmarks(bookmarks)
 
     def auto_join_bookmarks(self, bookmarks: list[BookmarkData]) -> None:
-        for bookmark in bookmarks:
-            if bookmark.autojoin:
-                self._log.info('Autojoin Bookmark: %s', bookmark.jid)
-                self._con.get_module('MUC').join(bookmark.jid)
+        jids = [bookmark.jid for bookmark in bookmarks if bookmark.autojoin]
+        self._con.get_module('MUCJoinScheduler').schedule(jids)
 
     def modify(self, jid: JID, **kwargs: Any) -> None:
         bookmark = self._bookmarks.get(jid)
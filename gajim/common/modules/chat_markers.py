@@ -104,7 +104,8 @@ def _raise_event(self, name: str, properties: Any) -> None:
             app.get_jid_from_account(self._account),
             jid,
             properties.marker.id,
-            'displayed')
+            'displayed',
+            sender=str(properties.jid))
 
         app.ged.raise_event(
             DisplayedReceived(account=self._account,
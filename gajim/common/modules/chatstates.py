@@ -20,7 +20,6 @@
 from typing import Optional
 
 import time
-from itertools import chain
 from functools import wraps
 
 from nbxmpp.namespaces import Namespace
@@ -80,7 +79,23 @@ def __init__(self, con: types.Client) -> None:
         # The current chatstate we received from a contact
         self._remote_chatstate: dict[JID, State] = {}
 
-        self._remote_chatstate_composing_timeouts: dict[JID, int] = {}
+        # Group chats which are currently shown, chatstates of all other
+        # group chats are ignored
+        self._visible_rooms: set[JID] = set()
+
+        # Nicknames of participants composing in a group chat
+        self._composing_participants: dict[JID, set[str]] = {}
+
+        # Timer wheel with one slot per second, used to expire remote
+        # composing states with a single timeout
+        self._wheel: list[set[JID]] = [
+            set() for _ in range(REMOTE_PAUSED_AFTER + 1)]
+        self._wheel_slots: dict[JID, int] = {}
+        self._wheel_pos = 0
+        self._wheel_timeout_id: Optional[int] = None
+
+        self._pending_updates: set[types.ContactT] = set()
+        self._update_id: Optional[int] = None
 
         self._last_keyboard_activity: dict[JID, float] = {}
         self._last_mouse_activity: dict[JID, float] = {}
@@ -136,18 +151,28 @@ def _presence_received(self,
         jid = properties.jid
 
         assert jid is not None
-        self._remote_chatstate.pop(jid, None)
         self._chatstates.pop(jid, None)
         self._last_mouse_activity.pop(jid, None)
         self._last_keyboard_activity.pop(jid, None)
 
+        if self._remote_chatstate.pop(jid, None) is None:
+            return
+
         self._log.info('Reset chatstate for %s', jid)
+        self._remove_from_wheel(jid)
+
+        room_jid = jid.new_as_bare()
+        nicks = self._composing_participants.get(room_jid)
+        if nicks is not None and jid.resource in nicks:
+            nicks.discard(jid.resource)
+            self._queue_update(self._get_contact(room_jid, groupchat=True))
+            return
 
         contact = self._get_contact(jid)
         if contact.is_groupchat:
             return
 
-        contact.notify('chatstate-update')
+        self._queue_update(contact)
 
     def _process_chatstate(self,
                            _con: types.xmppClient,
@@ -160,6 +185,10 @@ def _process_chatstate(self,
         if not properties.has_chatstate:
             return
 
+        if properties.type.is_groupchat:
+            self._process_groupchat_chatstate(properties)
+            return
+
         if (properties.is_self_message or
                 not properties.type.is_chat or
                 properties.is_mam_message or
@@ -170,37 +199,133 @@ def _process_chatstate(self,
         assert jid is not None
 
         state = properties.chatstate
-        self._remote_chatstate[jid] = state
-
         self._log.info('Recv: %-10s - %s', state, jid)
 
         contact = self._get_contact(jid)
         if contact is None:
             return
 
-        self._remove_remote_composing_timeout(contact)
+        self._set_remote_chatstate(jid, state)
+        self._queue_update(contact)
+
+    def _process_groupchat_chatstate(self,
+                                     properties: MessageProperties
+                                     ) -> None:
+        if properties.is_mam_message:
+            return
+
+        jid = properties.jid
+        assert jid is not None
+
+        room_jid = jid.new_as_bare()
+        if room_jid not in self._visible_rooms:
+            # Busy group chats send a lot of chatstates, nobody sees them
+            # if the chat is not shown
+            return
+
+        nick = jid.resource
+        if nick is None:
+            return
+
+        muc_data = self._con.get_module('MUC').get_muc_data(str(room_jid))
+        if muc_data is not None and muc_data.nick == nick:
+            return
+
+        state = properties.chatstate
+        self._log.debug('Recv: %-10s - %s', state, jid)
+
+        self._set_remote_chatstate(jid, state)
+
+        nicks = self._composing_participants.setdefault(room_jid, set())
+        if state == State.COMPOSING:
+            nicks.add(nick)
+        else:
+            nicks.discard(nick)
+
+        self._queue_update(self._get_contact(room_jid, groupchat=True))
+
+    def _set_remote_chatstate(self, jid: JID, state: State) -> None:
+        self._remote_chatstate[jid] = state
         if state == State.COMPOSING:
             # the spec does not cover any timeout for the composing action,
             # but if a contact's client does not send another chat state,
             # we don't want the GUI to show that they are "composing" forever
-            self._remote_chatstate_composing_timeouts[jid] = \
-                GLib.timeout_add_seconds(REMOTE_PAUSED_AFTER,
-                                         self._on_remote_composing_timeout,
-                                         contact)
+            self._add_to_wheel(jid)
+        else:
+            self._remove_from_wheel(jid)
+
+    def _add_to_wheel(self, jid: JID) -> None:
+        self._remove_from_wheel(jid)
+
+        slot = (self._wheel_pos + REMOTE_PAUSED_AFTER) % len(self._wheel)
+        self._wheel[slot].add(jid)
+        self._wheel_slots[jid] = slot
 
-        contact.notify('chatstate-update')
+        if self._wheel_timeout_id is None:
+            self._wheel_timeout_id = GLib.timeout_add_seconds(
+                1, self._on_wheel_tick)
 
-    def _on_remote_composing_timeout(self, contact: types.ContactT):
+    def _remove_from_wheel(self, jid: JID) -> None:
+        slot = self._wheel_slots.pop(jid, None)
+        if slot is not None:
+            self._wheel[slot].discard(jid)
+
+    def _on_wheel_tick(self) -> bool:
+        self._wheel_pos = (self._wheel_pos + 1) % len(self._wheel)
+        expired = self._wheel[self._wheel_pos]
+        self._wheel[self._wheel_pos] = set()
+
+        for jid in expired:
+            del self._wheel_slots[jid]
+            self._on_remote_composing_timeout(jid)
+
+        if not self._wheel_slots:
+            self._wheel_timeout_id = None
+            return GLib.SOURCE_REMOVE
+        return GLib.SOURCE_CONTINUE
+
+    def _on_remote_composing_timeout(self, jid: JID) -> None:
         self._log.info(
-            'Automatically switching the chat state of %s to ACTIVE', contact)
-        self._remote_chatstate[contact.jid] = State.ACTIVE
-        contact.notify('chatstate-update')
+            'Automatically switching the chat state of %s to ACTIVE', jid)
+        self._remote_chatstate[jid] = State.ACTIVE
+
+        room_jid = jid.new_as_bare()
+        nicks = self._composing_participants.get(room_jid)
+        if nicks is not None and jid.resource in nicks:
+            nicks.discard(jid.resource)
+            self._queue_update(self._get_contact(room_jid, groupchat=True))
+            return
 
-    def _remove_remote_composing_timeout(self, contact: types.ContactT):
-        source_id = self._delay_timeout_ids.pop(contact.jid, None)
-        if source_id is not None:
-            self._log.debug('Removing remote composing timeout of %s', contact)
-            GLib.source_remove(source_id)
+        self._queue_update(self._get_contact(jid))
+
+    def _queue_update(self, contact: types.ContactT) -> None:
+        self._pending_updates.add(contact)
+        if self._update_id is None:
+            self._update_id = GLib.idle_add(
+                self._send_updates, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _send_updates(self) -> bool:
+        self._update_id = None
+        contacts = self._pending_updates
+        self._pending_updates = set()
+        for contact in contacts:
+            contact.notify('chatstate-update')
+        return False
+
+    def set_room_visible(self, room_jid: JID, visible: bool) -> None:
+        if visible:
+            self._visible_rooms.add(room_jid)
+            return
+
+        self._visible_rooms.discard(room_jid)
+        nicks = self._composing_participants.pop(room_jid, set())
+        for nick in nicks:
+            jid = room_jid.new_with(resource=nick)
+            self._remove_from_wheel(jid)
+            self._remote_chatstate.pop(jid, None)
+
+    def get_composing_participants(self, room_jid: JID) -> list[str]:
+        return sorted(self._composing_participants.get(room_jid, []))
 
     @ensure_enabled
     def _check_last_interaction(self) -> bool:
@@ -391,12 +516,17 @@ def remove_delay_timeout(self, contact: types.ChatContactT) -> None:
             del self._delay_timeout_ids[contact.jid]
 
     def remove_all_timeouts(self) -> None:
-        for timeout in chain(
-                self._delay_timeout_ids.values(),
-                self._remote_chatstate_composing_timeouts.values()):
+        for timeout in self._delay_timeout_ids.values():
             GLib.source_remove(timeout)
         self._delay_timeout_ids.clear()
-        self._remote_chatstate_composing_timeouts.clear()
+
+        if self._wheel_timeout_id is not None:
+            GLib.source_remove(self._wheel_timeout_id)
+            self._wheel_timeout_id = None
+
+        if self._update_id is not None:
+            GLib.source_remove(self._update_id)
+            self._update_id = None
 
     def cleanup(self) -> None:
         self.remove_all_timeouts()
@@ -406,6 +536,11 @@ def cleanup(self) -> None:
 
         self._chatstates.clear()
         self._remote_chatstate.clear()
+        self._composing_participants.clear()
+        self._pending_updates.clear()
+        for slot in self._wheel:
+            slot.clear()
+        self._wheel_slots.clear()
         self._last_keyboard_activity.clear()
         self._last_mouse_activity.clear()
         self._blocked = []
@@ -17,10 +17,10 @@
 from typing import Any
 from typing import Iterator
 from typing import Optional
+from typing import TYPE_CHECKING
 from typing import Union
 from typing import overload
 
-import cairo
 from nbxmpp.const import Affiliation
 from nbxmpp.const import Chatstate
 from nbxmpp.const import Role
@@ -46,10 +46,14 @@
 from gajim.common.structs import MUCPresenceData
 from gajim.common.helpers import Observable
 from gajim.common.helpers import chatstate_to_string
+from gajim.common.helpers import composing_participants_to_string
 from gajim.common.modules.base import BaseModule
 from gajim.common.modules.util import LogAdapter
 from gajim.common.helpers import get_groupchat_name
 
+if TYPE_CHECKING:
+    import cairo
+
 
 class ContactSettings:
     def __init__(self, account: str, jid: JID) -> None:
@@ -672,6 +676,12 @@ def muc_context(self) -> Optional[str]:
             return 'private'
         return 'public'
 
+    @property
+    def chatstate_string(self) -> str:
+        nicks = self._module('Chatstate').get_composing_participants(
+            self._jid)
+        return composing_participants_to_string(nicks)
+
     @property
     def encryption_available(self) -> bool:
         disco_info = self.get_disco()
@@ -756,6 +766,7 @@ def update_avatar(self, *args: Any) -> None:
     def force_chatstate_update(self) -> None:
         for contact in self._resources.values():
             contact.notify('chatstate-update')
+        self.notify('chatstate-update')
 
     def get_self(self) -> Optional[GroupchatParticipant]:
         nick = self.nickname
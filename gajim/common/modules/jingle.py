@@ -50,7 +50,6 @@
 from gajim.common.jingle_ft import JingleFileTransfer
 from gajim.common.jingle_transport import JingleTransportSocks5
 from gajim.common.jingle_transport import JingleTransportIBB
-from gajim.common.jingle_rtp import JingleAudio, JingleVideo
 
 logger = logging.getLogger('gajim.c.m.jingle')
 
@@ -144,6 +143,8 @@ def _on_jingle_iq(self,
         raise nbxmpp.NodeProcessed
 
     def start_audio(self, jid: str) -> str:
+        from gajim.common.jingle_rtp import JingleAudio
+
         audio_session = self.get_jingle_session(jid, media='audio')
         if audio_session is not None:
             return audio_session.sid
@@ -158,6 +159,8 @@ def start_audio(self, jid: str) -> str:
         return jingle.sid
 
     def start_video(self, jid: str) -> str:
+        from gajim.common.jingle_rtp import JingleVideo
+
         video_session = self.get_jingle_session(jid, media='video')
         if video_session is not None:
             return video_session.sid
@@ -174,6 +177,9 @@ def start_video(self, jid: str) -> str:
         return jingle.sid
 
     def start_audio_video(self, jid: str) -> str:
+        from gajim.common.jingle_rtp import JingleAudio
+        from gajim.common.jingle_rtp import JingleVideo
+
         video_session = self.get_jingle_session(jid, media='video')
         if video_session is not None:
             return video_session.sid
@@ -34,6 +34,7 @@
 from gajim.common.events import MessageReceived
 from gajim.common.events import RawMessageReceived
 from gajim.common.helpers import AdditionalDataDict
+from gajim.common.helpers import message_needs_highlight
 from gajim.common.const import KindConstant
 from gajim.common.modules.base import BaseModule
 from gajim.common.modules.util import check_if_message_correction
@@ -195,6 +196,7 @@ def _message_received(self,
 
             event_attr.update({
                 'room_jid': jid,
+                'needs_highlight': self._needs_highlight(properties, msgtxt),
             })
 
             event = GcMessageReceived(**event_attr)
@@ -248,6 +250,20 @@ def _message_error_received(self,
                          message_id=properties.id,
                          error=properties.error))
 
+    def _needs_highlight(self,
+                         properties: MessageProperties,
+                         msgtxt: str) -> bool:
+
+        contact = self._client.get_module('Contacts').get_contact(
+            properties.muc_jid,
+            groupchat=True)
+        nickname = contact.nickname
+        if nickname is None or properties.muc_nickname == nickname:
+            return False
+
+        return message_needs_highlight(
+            msgtxt, nickname, self._con.get_own_jid().bare)
+
     def _log_muc_message(self, event: GcMessageReceived) -> Optional[int]:
         self._check_for_mam_compliance(event.room_jid, event.stanza_id)
 
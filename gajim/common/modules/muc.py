@@ -211,6 +211,9 @@ def _set_muc_state(self, room_jid: str, state: MUCJoinedState) -> None:
         self._log.info('Set MUC state: %s %s', room_jid, state)
 
         muc.state = state
+        if not state.is_joining:
+            self._con.get_module('MUCJoinScheduler').join_finished(muc.jid)
+
         contact = self._get_contact(room_jid, groupchat=True)
         contact.notify('state-changed')
 
@@ -353,6 +356,7 @@ def leave(self,
         self._log.info('Leave MUC: %s', room_jid)
 
         self._con.get_module('Bookmarks').modify(room_jid, autojoin=False)
+        self._con.get_module('MUCJoinScheduler').cancel(room_jid)
 
         muc_data = self._mucs.get(room_jid)
         if muc_data is None:
@@ -862,7 +866,7 @@ def _room_join_complete(self, muc_data: MUCData):
 
         disco_info = app.storage.cache.get_last_disco_info(muc_data.jid)
         if disco_info.has_mam_2:
-            self._con.get_module('MAM').request_archive_on_muc_join(
+            self._con.get_module('MUCJoinScheduler').request_catch_up(
                 muc_data.jid)
 
     def _on_voice_request(self,
@@ -0,0 +1,278 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim.  If not, see <http://www.gnu.org/licenses/>.
+
+# Orders and paces group chat joins and MAM catch-ups
+
+from __future__ import annotations
+
+from typing import Optional
+from typing import Union
+
+from nbxmpp.protocol import JID
+from nbxmpp.task import Task
+
+from gi.repository import GLib
+
+from gajim.common import app
+from gajim.common import types
+from gajim.common.const import ClientState
+from gajim.common.const import MUCJoinedState
+from gajim.common.events import MUCJoinProgress
+from gajim.common.modules.base import BaseModule
+
+MAX_CONCURRENT_JOINS = 3
+MAX_CONCURRENT_CATCH_UPS = 2
+
+# Delay in milliseconds between two joins
+JOIN_INTERVAL = 250
+
+# Seconds after which a join without answer no longer occupies a slot
+JOIN_TIMEOUT = 30
+
+PRIORITY_OPEN = 0
+PRIORITY_PINNED = 1
+PRIORITY_WORKSPACE = 2
+PRIORITY_DEFAULT = 3
+
+
+class MUCJoinScheduler(BaseModule):
+    def __init__(self, con: types.Client) -> None:
+        BaseModule.__init__(self, con)
+
+        self._con.connect_signal('state-changed',
+                                 self._on_client_state_changed)
+        self._con.connect_signal('resume-failed',
+                                 self._on_client_resume_failed)
+
+        self._queue: list[JID] = []
+        self._joining: dict[JID, int] = {}
+        self._pace_id: Optional[int] = None
+        self._total = 0
+        self._finished = 0
+
+        self._catch_up_queue: list[JID] = []
+        self._catch_ups: set[JID] = set()
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self._queue or self._joining or
+                    self._catch_up_queue or self._catch_ups)
+
+    def schedule(self, jids: list[JID]) -> None:
+        added = 0
+        for jid in jids:
+            if jid in self._joining or jid in self._queue:
+                continue
+            self._queue.append(jid)
+            added += 1
+
+        if not added:
+            return
+
+        self._total += added
+        self._sort_queue()
+        self._log.info('Scheduled %s group chat joins, %s pending',
+                       added, len(self._queue))
+        self._process_queue()
+
+    def prioritize(self, jid: JID) -> None:
+        if jid not in self._queue:
+            return
+        self._queue.remove(jid)
+        self._queue.insert(0, jid)
+
+    def cancel(self, jid: Union[str, JID]) -> None:
+        if jid in self._queue:
+            self._queue.remove(jid)
+            self._finished += 1
+            self._notify_progress()
+
+    def join_finished(self, jid: JID) -> None:
+        '''
+        Called by the MUC module whenever a room leaves the joining state
+        '''
+        timeout_id = self._joining.pop(jid, None)
+        if timeout_id is None:
+            return
+
+        GLib.source_remove(timeout_id)
+        self._finished += 1
+        self._process_queue()
+
+    def request_catch_up(self, jid: JID) -> None:
+        if jid in self._catch_ups or jid in self._catch_up_queue:
+            return
+        self._catch_up_queue.append(jid)
+        self._process_catch_ups()
+
+    def _get_open_chats(self) -> dict[str, int]:
+        active_workspace = None
+        active_jid = None
+        if app.window is not None:
+            active_workspace = app.window.get_active_workspace()
+            control = app.window.get_control()
+            if (control.has_active_chat() and
+                    control.contact.account == self._account):
+                active_jid = str(control.contact.jid)
+
+        open_chats: dict[str, int] = {}
+        for workspace_id in app.settings.get_workspaces():
+            chats = app.settings.get_workspace_setting(workspace_id, 'chats')
+            for chat in chats:
+                if chat['account'] != self._account:
+                    continue
+
+                jid = str(chat['jid'])
+                if jid == active_jid:
+                    priority = PRIORITY_OPEN
+                elif chat['pinned']:
+                    priority = PRIORITY_PINNED
+                elif workspace_id == active_workspace:
+                    priority = PRIORITY_WORKSPACE
+                else:
+                    priority = PRIORITY_DEFAULT
+
+                open_chats[jid] = min(
+                    priority, open_chats.get(jid, PRIORITY_DEFAULT))
+        return open_chats
+
+    @staticmethod
+    def _get_last_activity(jid: JID) -> float:
+        archive_info = app.storage.archive.get_archive_infos(str(jid))
+        if archive_info is None:
+            return 0
+        return archive_info.last_muc_timestamp or 0
+
+    def _sort_queue(self) -> None:
+        open_chats = self._get_open_chats()
+        sort_keys = {
+            jid: (open_chats.get(str(jid), PRIORITY_DEFAULT),
+                  -self._get_last_activity(jid))
+            for jid in self._queue}
+        self._queue.sort(key=sort_keys.__getitem__)
+
+    def _process_queue(self) -> None:
+        if self._pace_id is not None:
+            # The next join is started when the pacing timeout fires
+            return
+        self._join_next()
+
+    def _join_next(self) -> bool:
+        self._pace_id = None
+
+        while self._queue and len(self._joining) < MAX_CONCURRENT_JOINS:
+            jid = self._queue.pop(0)
+            if not self._start_join(jid):
+                self._finished += 1
+                continue
+
+            if self._queue:
+                self._pace_id = GLib.timeout_add(JOIN_INTERVAL,
+                                                 self._join_next)
+            break
+
+        self._notify_progress()
+        return False
+
+    def _start_join(self, jid: JID) -> bool:
+        if not app.account_is_available(self._account):
+            return False
+
+        muc_module = self._con.get_module('MUC')
+        muc_data = muc_module.get_muc_data(str(jid))
+        if muc_data is not None and muc_data.state not in (
+                MUCJoinedState.NOT_JOINED, MUCJoinedState.PASSWORD_REQUEST):
+            # The room was joined by other means in the meantime
+            return False
+
+        self._log.info('Autojoin Bookmark: %s', jid)
+        muc_module.join(str(jid))
+
+        muc_data = muc_module.get_muc_data(str(jid))
+        if muc_data is None or not muc_data.state.is_joining:
+            return False
+
+        self._joining[jid] = GLib.timeout_add_seconds(
+            JOIN_TIMEOUT, self._on_join_timeout, jid)
+        return True
+
+    def _on_join_timeout(self, jid: JID) -> bool:
+        self._log.info('Join of %s takes too long, release slot', jid)
+        del self._joining[jid]
+        self._finished += 1
+        self._process_queue()
+        return False
+
+    def _process_catch_ups(self) -> None:
+        while (self._catch_up_queue and
+               len(self._catch_ups) < MAX_CONCURRENT_CATCH_UPS):
+            jid = self._catch_up_queue.pop(0)
+            self._catch_ups.add(jid)
+            self._con.get_module('MAM').request_archive_on_muc_join(
+                jid,
+                callback=self._on_catch_up_finished,
+                user_data=jid)
+
+        self._notify_progress()
+
+    def _on_catch_up_finished(self, task: Task) -> None:
+        jid = task.get_user_data()
+        self._catch_ups.discard(jid)
+        self._process_catch_ups()
+
+    def _notify_progress(self) -> None:
+        app.ged.raise_event(
+            MUCJoinProgress(account=self._account,
+                            total=self._total,
+                            finished=self._finished,
+                            catch_ups=(len(self._catch_ups) +
+                                       len(self._catch_up_queue))))
+
+        if not self.is_active:
+            self._total = 0
+            self._finished = 0
+
+    def _reset(self) -> None:
+        if self._pace_id is not None:
+            GLib.source_remove(self._pace_id)
+            self._pace_id = None
+
+        for timeout_id in self._joining.values():
+            GLib.source_remove(timeout_id)
+
+        was_active = self.is_active
+        self._queue.clear()
+        self._joining.clear()
+        self._catch_up_queue.clear()
+        self._catch_ups.clear()
+        if was_active:
+            self._notify_progress()
+
+    def _on_client_state_changed(self,
+                                 _client: types.Client,
+                                 _signal_name: str,
+                                 state: ClientState
+                                 ) -> None:
+        if state.is_disconnected:
+            self._reset()
+
+    def _on_client_resume_failed(self,
+                                 _client: types.Client,
+                                 _signal_name: str
+                                 ) -> None:
+        self._reset()
+
+    def cleanup(self) -> None:
+        super().cleanup()
+        self._reset()
@@ -0,0 +1,162 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from typing import Callable
+from typing import Optional
+
+import dataclasses
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from gi.repository import GLib
+
+from gajim.common import app
+from gajim.common import events
+from gajim.common.i18n import ngettext
+
+log = logging.getLogger('gajim.c.notification_aggregator')
+
+# All times are in seconds
+# Messages of a chat are grouped if they arrive within this time
+GROUP_TIMEOUT = 30
+# Minimal time between two updates of the notification of a chat
+UPDATE_INTERVAL = 2
+# At most RATE_LIMIT notifications are sent within RATE_INTERVAL
+RATE_LIMIT = 5
+RATE_INTERVAL = 5
+# Minimal time between playing the same sound
+SOUND_INTERVAL = 2
+
+FLUSH_INTERVAL = 500  # ms
+
+
+@dataclass
+class MessageGroup:
+    event: events.Notification
+    count: int = 0
+    last_message: float = 0.0
+    last_sent: Optional[float] = None
+    pending: bool = False
+
+
+class NotificationAggregator:
+    '''
+    Groups message notifications per chat
+
+    The first message of a chat is notified immediately. Further messages
+    which arrive within GROUP_TIMEOUT update the notification of the chat
+    ("5 new messages from …") at most every UPDATE_INTERVAL. The number of
+    notifications sent is limited globally, updates which exceed the limit
+    are sent later. Sounds are not repeated within SOUND_INTERVAL.
+    '''
+
+    def __init__(self,
+                 send_func: Callable[[events.Notification], None]) -> None:
+        self._send_func = send_func
+        self._groups: dict[tuple[str, str], MessageGroup] = {}
+        self._sent: deque[float] = deque()
+        self._last_sounds: dict[str, float] = {}
+        self._flush_id: Optional[int] = None
+
+    def should_play_sound(self, sound: str) -> bool:
+        now = time.monotonic()
+        last_played = self._last_sounds.get(sound)
+        if last_played is not None and now - last_played < SOUND_INTERVAL:
+            log.debug('Skip sound %s', sound)
+            return False
+
+        self._last_sounds[sound] = now
+        return True
+
+    def add(self, event: events.Notification) -> None:
+        now = time.monotonic()
+        key = (event.account, str(event.jid))
+        group = self._groups.get(key)
+        if group is None or now - group.last_message > GROUP_TIMEOUT:
+            group = MessageGroup(event)
+            self._groups[key] = group
+
+        group.event = event
+        group.count += 1
+        group.last_message = now
+        group.pending = True
+
+        if self._flush():
+            self._schedule_flush()
+
+    def remove(self, account: str, jid: str) -> None:
+        self._groups.pop((account, jid), None)
+
+    def _schedule_flush(self) -> None:
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add(FLUSH_INTERVAL, self._on_flush)
+
+    def _on_flush(self) -> bool:
+        if self._flush():
+            return True
+        self._flush_id = None
+        return False
+
+    def _flush(self) -> bool:
+        '''
+        Sends all notifications which are allowed to be sent, returns True
+        if notifications are still pending
+        '''
+        now = time.monotonic()
+        while self._sent and now - self._sent[0] >= RATE_INTERVAL:
+            self._sent.popleft()
+
+        pending = False
+        for key, group in list(self._groups.items()):
+            if not group.pending:
+                if now - group.last_message > GROUP_TIMEOUT:
+                    del self._groups[key]
+                continue
+
+            if (group.last_sent is not None and
+                    now - group.last_sent < UPDATE_INTERVAL):
+                pending = True
+                continue
+
+            if len(self._sent) >= RATE_LIMIT:
+                pending = True
+                continue
+
+            group.pending = False
+            group.last_sent = now
+            self._sent.append(now)
+            self._send_func(self._make_event(group))
+
+        return pending
+
+    @staticmethod
+    def _get_chat_name(event: events.Notification) -> str:
+        client = app.get_client(event.account)
+        contact = client.get_module('Contacts').get_contact(event.jid)
+        return contact.name
+
+    def _make_event(self, group: MessageGroup) -> events.Notification:
+        if group.count == 1:
+            return group.event
+
+        title = ngettext('%(count)s new message from %(name)s',
+                         '%(count)s new messages from %(name)s',
+                         group.count) % {
+                             'count': group.count,
+                             'name': self._get_chat_name(group.event)}
+        return dataclasses.replace(group.event, title=title)
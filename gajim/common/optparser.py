@@ -30,7 +30,6 @@
 from pathlib import Path
 from packaging.version import Version as V
 
-from gi.repository import Gdk
 from nbxmpp.util import text_to_color
 
 from gajim.common import app
@@ -211,6 +210,7 @@ def update_config_to_1194(self):
         app.config.set('version', '1.1.94')
 
     def update_config_to_1195(self):
+        from gi.repository import Gdk
         # Add account color for every account
         for account in self.old_values['accounts'].keys():
             username = self.old_values['accounts'][account]['name']
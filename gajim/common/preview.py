@@ -21,7 +21,6 @@
 
 import logging
 import os
-import re
 from pathlib import Path
 from urllib.parse import urlparse
 from urllib.parse import ParseResult
@@ -34,7 +33,6 @@
 
 from gajim.common import app
 from gajim.common import configpaths
-from gajim.common import regex
 from gajim.common.const import MIME_TYPES
 from gajim.common.helpers import AdditionalDataDict
 from gajim.common.helpers import load_file_async
@@ -51,12 +49,11 @@
 from gajim.common.preview_helpers import get_image_paths
 from gajim.common.preview_helpers import guess_mime_type
 from gajim.common.preview_helpers import pixbuf_from_data
+from gajim.common.styling import parsing_cache
 from gajim.common.types import GdkPixbufType
 
 log = logging.getLogger('gajim.c.preview')
 
-IRI_RX = re.compile(regex.IRI)
-
 PREVIEWABLE_MIME_TYPES = get_previewable_mime_types()
 mime_types = set(MIME_TYPES)
 # Merge both: if it’s a previewable image, it should be allowed
@@ -337,7 +334,7 @@ def _accept_uri(urlparts: ParseResult,
     def is_previewable(self,
                        text: str,
                        additional_data: AdditionalDataDict) -> bool:
-        if not IRI_RX.fullmatch(text):
+        if not parsing_cache.is_uri(text):
             # urlparse removes whitespace (and who knows what else) from URLs,
             # so can't be used for validation.
             return False
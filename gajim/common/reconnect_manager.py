@@ -0,0 +1,136 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+from gi.repository import GLib
+
+from gajim.common import app
+from gajim.common import types
+
+log = logging.getLogger('gajim.c.reconnect_manager')
+
+# All delays are in seconds
+BASE_DELAY = 3
+MAX_DELAY = 300
+RESUME_DELAY = 1
+
+# Random deviation applied to every delay, as a fraction of the delay
+JITTER = 0.3
+
+# Minimum distance between two reconnects which can not resume the stream
+STAGGER_INTERVAL = 2
+
+
+class ReconnectManager:
+    '''
+    Decides when disconnected accounts try to reconnect
+
+    Failures are remembered per host, so accounts on the same server back
+    off together. Accounts which can resume their stream reconnect first,
+    all others are spread out so they do not hit DNS, TLS and SASL at the
+    same time.
+    '''
+
+    def __init__(self) -> None:
+        self._failures: dict[str, int] = {}
+        self._timeouts: dict[str, int] = {}
+        self._waiting: set[str] = set()
+        self._next_slot = 0.0
+        self._network_available = True
+
+    @staticmethod
+    def _get_host(client: types.Client) -> str:
+        return app.get_hostname_from_account(client.account)
+
+    def get_failures(self, client: types.Client) -> int:
+        return self._failures.get(self._get_host(client), 0)
+
+    def connection_failed(self, client: types.Client) -> None:
+        host = self._get_host(client)
+        self._failures[host] = self._failures.get(host, 0) + 1
+        log.info('Connection to %s failed %s times',
+                 host, self._failures[host])
+
+    def connection_succeeded(self, client: types.Client) -> None:
+        self._failures.pop(self._get_host(client), None)
+
+    def get_delay(self, client: types.Client) -> float:
+        if client.is_resumeable:
+            # Resumption is cheap and only possible for a short time
+            return RESUME_DELAY * random.uniform(1, 1 + JITTER)
+
+        failures = self.get_failures(client)
+        delay = min(MAX_DELAY, BASE_DELAY * 2 ** failures)
+        delay *= random.uniform(1 - JITTER, 1 + JITTER)
+
+        now = time.monotonic()
+        start = max(now + delay, self._next_slot)
+        self._next_slot = start + STAGGER_INTERVAL
+        return start - now
+
+    def schedule(self, client: types.Client) -> None:
+        self.cancel(client.account)
+
+        if not self._network_available:
+            log.info('Network not available, %s waits for network',
+                     client.account)
+            self._waiting.add(client.account)
+            return
+
+        delay = self.get_delay(client)
+        log.info('Reconnect %s in %.1fs', client.account, delay)
+        self._timeouts[client.account] = GLib.timeout_add(
+            int(delay * 1000), self._on_timeout, client.account)
+
+    def cancel(self, account: str) -> None:
+        self._waiting.discard(account)
+        source_id = self._timeouts.pop(account, None)
+        if source_id is not None:
+            GLib.source_remove(source_id)
+
+    def _on_timeout(self, account: str) -> bool:
+        del self._timeouts[account]
+        client = app.connections.get(account)
+        if client is not None:
+            client.reconnect()
+        return False
+
+    def set_network_available(self, available: bool) -> None:
+        if available == self._network_available:
+            return
+
+        self._network_available = available
+        if not available:
+            # Attempts without network would only increase the backoff
+            for account in list(self._timeouts):
+                self.cancel(account)
+                self._waiting.add(account)
+            return
+
+        # Failures while the network was down say nothing about the hosts
+        self._failures.clear()
+
+        clients = [app.connections[account] for account in self._waiting
+                   if account in app.connections]
+        self._waiting.clear()
+
+        clients.sort(key=lambda client: not client.is_resumeable)
+        for client in clients:
+            if client.state.is_reconnect_scheduled:
+                self.schedule(client)
@@ -75,6 +75,7 @@ class _ACCOUNTDEFAULT:
     'preview_verify_https',
     'print_status_in_chats',
     'remote_control',
+    'remote_control_legacy_signals',
     'save_main_window_position',
     'send_on_ctrl_enter',
     'show_chatstate_in_banner',
@@ -124,6 +125,7 @@ class _ACCOUNTDEFAULT:
     'notification_timeout',
     'preview_max_file_size',
     'preview_size',
+    'stanza_metrics_export_interval',
 ]
 
 StringSettings = Literal[
@@ -244,6 +246,7 @@ class _ACCOUNTDEFAULT:
     'preview_verify_https': True,
     'print_status_in_chats': False,
     'remote_control': False,
+    'remote_control_legacy_signals': False,
     'roster_theme': 'default',
     'save_main_window_position': True,
     'search_engine': 'https://duckduckgo.com/?q=%s',
@@ -264,6 +267,7 @@ class _ACCOUNTDEFAULT:
     'showoffline': True,
     'sort_by_show_in_muc': False,
     'sort_by_show_in_roster': True,
+    'stanza_metrics_export_interval': 0,
     'sounddnd': False,
     'sounds_on': True,
     'speller_language': '',
@@ -686,6 +690,11 @@ class WorkspaceSettings(TypedDict):
         'notify_on_all_muc_messages': '',
         'plugins_repository_enabled': _(
             'If enabled, Gajim offers to download plugins hosted on gajim.org'),
+        'remote_control_legacy_signals': _(
+            'Deprecated: emit the NewMessage, GCMessage, MessageSent, '
+            'ContactPresence and AccountPresence D-Bus signals for every '
+            'event. Use subscribe() instead, these signals will be removed in '
+            'the next release.'),
         'save_main_window_position': _(
             'If enabled, Gajim will save the main window position when hiding '
             'it, and restore it when showing the window again.'),
@@ -694,6 +703,10 @@ class WorkspaceSettings(TypedDict):
             'Send message on Ctrl+Enter and make a new line with Enter.'),
         'show_chatstate_in_banner': _(
             'Show chat state (e.g. "is typing…") next to your contact’s name'),
+        'stanza_metrics_export_interval': _(
+            'Interval in seconds in which stanza metrics are written to '
+            'stanza_metrics.prom in the debug folder. 0 disables the '
+            'export.'),
         'stun_server': _('STUN server to use when using Jingle'),
         'time_format': 'https://docs.python.org/3/library/time.html#time.strftime',  # noqa: E501
         'trayicon_notification_on_events': _(
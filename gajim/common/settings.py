@@ -14,6 +14,7 @@
 
 from typing import Any
 from typing import Callable
+from typing import Iterator
 from typing import Literal
 from typing import NamedTuple
 from typing import Optional
@@ -30,8 +31,8 @@
 import inspect
 import weakref
 from pathlib import Path
+from contextlib import contextmanager
 from collections import namedtuple
-from collections import defaultdict
 
 from gi.repository import GLib
 from nbxmpp.protocol import JID
@@ -40,6 +41,7 @@
 from gajim.common import app
 from gajim.common import configpaths
 from gajim.common import optparser
+from gajim.common.startup_timeline import timeline
 from gajim.common.storage.base import Encoder
 from gajim.common.storage.base import json_decoder
 from gajim.common.setting_values import WorkspaceSettings
@@ -109,8 +111,8 @@
 
 
 _SignalCallable = Callable[[Any, str, Optional[str], Optional[JID]], Any]
-_CallbackDict = dict[tuple[str, Optional[str], Optional[JID]],
-                     list[weakref.WeakMethod[_SignalCallable]]]
+_CallbackKey = tuple[str, Optional[str], Optional[JID]]
+_CallbackDict = dict[_CallbackKey, list[weakref.WeakMethod[_SignalCallable]]]
 
 if app.is_flatpak():
     app_overrides = '/app/app-overrides.json'
@@ -138,7 +140,14 @@ def __init__(self):
         self._account_settings: dict[
             str, Union[Any, dict[str, dict[Union[JID, str], Any]]]] = {}
 
-        self._callbacks: _CallbackDict = defaultdict(list)
+        self._callbacks: _CallbackDict = {}
+
+        # State of a running batch(), see batch()
+        self._batch_depth = 0
+        self._pending_signals: dict[_CallbackKey, Any] = {}
+        self._pending_settings: set[str] = set()
+        self._pending_accounts: set[str] = set()
+        self._pending_commit_now = False
 
     def connect_signal(self,
                        setting: str,
@@ -151,10 +160,11 @@ def connect_signal(self,
             raise ValueError('Only bound methods can be connected')
 
         weak_func = weakref.WeakMethod(func)
-        self._callbacks[(setting, account, jid)].append(weak_func)
+        self._callbacks.setdefault((setting, account, jid), []).append(
+            weak_func)
 
     def disconnect_signals(self, object_: object) -> Any:
-        for _, handlers in self._callbacks.items():
+        for key, handlers in list(self._callbacks.items()):
             for handler in list(handlers):
                 if isinstance(handler, tuple):
                     continue
@@ -162,6 +172,9 @@ def disconnect_signals(self, object_: object) -> Any:
                 if func is None or func.__self__ is object_:
                     handlers.remove(handler)
 
+            if not handlers:
+                del self._callbacks[key]
+
     def bind_signal(self,
                     setting: str,
                     widget: Any,
@@ -172,24 +185,91 @@ def bind_signal(self,
                     default_text: Optional[str] = None
                     ) -> None:
 
-        callbacks = self._callbacks[(setting, account, jid)]
+        key = (setting, account, jid)
         func = getattr(widget, func_name)
-        callbacks.append((func, inverted, default_text))
+        self._callbacks.setdefault(key, []).append(
+            (func, inverted, default_text))
 
         def _on_destroy(*args: Any) -> None:
+            callbacks = self._callbacks.get(key)
+            if callbacks is None:
+                return
             callbacks.remove((func, inverted, default_text))
+            if not callbacks:
+                del self._callbacks[key]
 
         widget.connect('destroy', _on_destroy)
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        '''Coalesce signals and database writes of many set_* calls
+
+        Signals are emitted once per (setting, account, jid) with the last
+        value when the outermost batch ends, changed settings are written
+        to the database once.
+        '''
+
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        for name in self._pending_settings:
+            self._write_settings(name)
+
+        for account in self._pending_accounts:
+            if account in self._account_settings:
+                self._write_account_settings(account)
+
+        if self._pending_settings or self._pending_accounts:
+            self._commit(schedule=not self._pending_commit_now)
+
+        self._pending_settings.clear()
+        self._pending_accounts.clear()
+        self._pending_commit_now = False
+
+        pending_signals = self._pending_signals
+        self._pending_signals = {}
+        for (setting, account, jid), value in pending_signals.items():
+            self._emit(value, setting, account, jid)
+
     def _notify(self,
                 value: Any,
                 setting: str,
                 account: Optional[str] = None,
                 jid: Optional[JID] = None) -> None:
 
+        key = (setting, account, jid)
+        if key not in self._callbacks:
+            return
+
+        if self._batch_depth:
+            # Remove the key first so the signal is ordered by the last
+            # time the setting was changed
+            self._pending_signals.pop(key, None)
+            self._pending_signals[key] = value
+            return
+
+        self._emit(value, setting, account, jid)
+
+    def _emit(self,
+              value: Any,
+              setting: str,
+              account: Optional[str] = None,
+              jid: Optional[JID] = None) -> None:
+
+        key = (setting, account, jid)
+        callbacks = self._callbacks.get(key)
+        if callbacks is None:
+            return
+
         log.info('Signal: %s changed', setting)
 
-        callbacks = self._callbacks[(setting, account, jid)]
+        has_dead_refs = False
         for func in list(callbacks):
             if isinstance(func, tuple):
                 func, inverted, default_text = func
@@ -205,12 +285,9 @@ def _notify(self,
                     log.exception('Error while executing signal callback')
                 continue
 
-            if func() is None:
-                callbacks.remove(func)
-                continue
-
             func = func()
             if func is None:
+                has_dead_refs = True
                 continue
 
             try:
@@ -218,17 +295,31 @@ def _notify(self,
             except Exception:
                 log.exception('Error while executing signal callback')
 
+        if has_dead_refs:
+            self._compact_callbacks(key)
+
+    def _compact_callbacks(self, key: _CallbackKey) -> None:
+        callbacks = self._callbacks.get(key)
+        if callbacks is None:
+            return
+
+        callbacks[:] = [func for func in callbacks
+                        if isinstance(func, tuple) or func() is not None]
+        if not callbacks:
+            del self._callbacks[key]
+
     def init(self) -> None:
         self._setup_installation_defaults()
         self._connect_database()
         self._load_settings()
         self._load_account_settings()
-        if not self._settings['app']:
-            # ['app'] is empty in a newly created database.
-            # If there is an old config, it gets migrated at this point.
-            self._migrate_old_config()
-            self._commit()
-        self._migrate_database()
+        with timeline.phase('Settings: migrate'):
+            if not self._settings['app']:
+                # ['app'] is empty in a newly created database.
+                # If there is an old config, it gets migrated at this point.
+                self._migrate_old_config()
+                self._commit()
+            self._migrate_database()
         self._load_app_overrides()
         self._commit()
 
@@ -569,22 +660,36 @@ def _load_account_settings(self) -> None:
                 row.settings,
                 object_hook=json_decoder)
 
-    def _commit_account_settings(self,
-                                 account: str,
-                                 schedule: bool = True) -> None:
+    def _write_account_settings(self, account: str) -> None:
         log.info('Set account settings: %s', account)
         self._con.execute(
             'UPDATE account_settings SET settings = ? WHERE account = ?',
             (json.dumps(self._account_settings[account], cls=Encoder), account))
 
+    def _commit_account_settings(self,
+                                 account: str,
+                                 schedule: bool = True) -> None:
+        if self._batch_depth:
+            self._pending_accounts.add(account)
+            self._pending_commit_now |= not schedule
+            return
+
+        self._write_account_settings(account)
         self._commit(schedule=schedule)
 
-    def _commit_settings(self, name: str, schedule: bool = True) -> None:
+    def _write_settings(self, name: str) -> None:
         log.info('Set settings: %s', name)
         self._con.execute(
             'UPDATE settings SET settings = ? WHERE name = ?',
             (json.dumps(self._settings[name], cls=Encoder), name))
 
+    def _commit_settings(self, name: str, schedule: bool = True) -> None:
+        if self._batch_depth:
+            self._pending_settings.add(name)
+            self._pending_commit_now |= not schedule
+            return
+
+        self._write_settings(name)
         self._commit(schedule=schedule)
 
     def has_app_override(self, setting: str) -> bool:
@@ -979,14 +1084,16 @@ def set_group_chat_settings(self,
                                 context: Optional[str] = None
                                 ) -> None:
 
-        for account, acc_settings in self._account_settings.items():
-            for jid in acc_settings['group_chat']:
-                if context is not None:
-                    client = app.get_client(account)
-                    contact = client.get_module('Contacts').get_contact(jid)
-                    if contact.muc_context != context:
-                        continue
-                self.set_group_chat_setting(account, jid, setting, value)
+        with self.batch():
+            for account, acc_settings in self._account_settings.items():
+                for jid in list(acc_settings['group_chat']):
+                    if context is not None:
+                        client = app.get_client(account)
+                        contact = client.get_module('Contacts').get_contact(
+                            jid)
+                        if contact.muc_context != context:
+                            continue
+                    self.set_group_chat_setting(account, jid, setting, value)
 
     @overload
     def get_contact_setting(self,
@@ -1092,9 +1199,10 @@ def set_contact_settings(self,
                              setting: str,
                              value: SETTING_TYPE) -> None:
 
-        for account, acc_settings in self._account_settings.items():
-            for jid in acc_settings['contact']:
-                self.set_contact_setting(account, jid, setting, value)
+        with self.batch():
+            for account, acc_settings in self._account_settings.items():
+                for jid in list(acc_settings['contact']):
+                    self.set_contact_setting(account, jid, setting, value)
 
     def set_soundevent_setting(self,
                                event_name: str,
@@ -0,0 +1,395 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+import logging
+import os
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections import OrderedDict
+from pathlib import Path
+
+from gi.repository import GLib
+
+from nbxmpp.structs import StanzaHandler
+
+from gajim.common import app
+from gajim.common import configpaths
+from gajim.common import ged
+from gajim.common.events import StanzaReceived
+from gajim.common.events import StanzaSent
+
+log = logging.getLogger('gajim.c.stanza_metrics')
+
+# Upper bounds of the histogram buckets in seconds
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PROCESSING_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                      0.05, 0.1, 0.25, 1)
+
+# Limit the number of tracked series, unknown stanzas can contain any
+# namespace
+MAX_NAMESPACES = 200
+# IQs which never get a response must not pile up
+MAX_PENDING_IQS = 1000
+
+OTHER = 'other'
+
+EXPORT_FILENAME = 'stanza_metrics.prom'
+
+STANZA_TYPES = ('message', 'presence', 'iq')
+
+_START_TAG_RX = re.compile(r'<([\w:.-]+)([^>]*)>')
+_ATTR_RX = re.compile(r'''\s([\w:.-]+)=(?:'([^']*)'|"([^"]*)")''')
+_XMLNS_RX = re.compile(r'''\sxmlns=(?:'([^']*)'|"([^"]*)")''')
+
+
+class StanzaInfo(NamedTuple):
+    type: str
+    namespace: str
+    iq_type: Optional[str]
+    id: Optional[str]
+
+
+def parse_stanza_info(stanza: str) -> StanzaInfo:
+    '''
+    Extracts what is needed for the metrics from the serialized stanza,
+    without parsing the whole stanza
+    '''
+
+    match = _START_TAG_RX.match(stanza)
+    if match is None:
+        return StanzaInfo(OTHER, OTHER, None, None)
+
+    name, attr_string = match.groups()
+    attrs = {key: single or double
+             for key, single, double in _ATTR_RX.findall(attr_string)}
+
+    if name not in STANZA_TYPES:
+        # Nonzas like stream management acks are defined by their namespace
+        return StanzaInfo(OTHER, attrs.get('xmlns', OTHER), None, None)
+
+    # The namespace of the first payload element
+    namespace = 'none'
+    if not attr_string.endswith('/'):
+        payload = _XMLNS_RX.search(stanza, match.end())
+        if payload is not None:
+            namespace = payload.group(1) or payload.group(2)
+
+    iq_type = attrs.get('type') if name == 'iq' else None
+    return StanzaInfo(name, namespace, iq_type, attrs.get('id'))
+
+
+class Histogram:
+    '''
+    Histogram with fixed buckets, the memory used does not depend on the
+    number of observations
+    '''
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    @property
+    def average(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.sum / self.count
+
+    def get_cumulative_counts(self) -> list[tuple[str, int]]:
+        result: list[tuple[str, int]] = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((repr(float(bound)), total))
+        result.append(('+Inf', self.count))
+        return result
+
+
+class AccountMetrics:
+    def __init__(self) -> None:
+        # (direction, stanza type) -> count
+        self.stanzas: Counter[tuple[str, str]] = Counter()
+        # (direction, stanza type, namespace) -> count
+        self.namespaces: Counter[tuple[str, str, str]] = Counter()
+        # direction -> bytes
+        self.bytes: Counter[str] = Counter()
+
+        self.iq_latency = Histogram(LATENCY_BUCKETS)
+        self.iq_timeouts = 0
+        self._pending_iqs: OrderedDict[str, float] = OrderedDict()
+
+        # handler name -> processing time
+        self.handlers: dict[str, Histogram] = {}
+
+    def add_stanza(self, direction: str, stanza: str) -> None:
+        info = parse_stanza_info(stanza)
+        self.stanzas[(direction, info.type)] += 1
+        self.bytes[direction] += len(stanza.encode())
+
+        key = (direction, info.type, info.namespace)
+        if key not in self.namespaces and \
+                len(self.namespaces) >= MAX_NAMESPACES:
+            key = (direction, info.type, OTHER)
+        self.namespaces[key] += 1
+
+        if info.type != 'iq' or info.id is None:
+            return
+
+        if direction == 'out' and info.iq_type in ('get', 'set'):
+            self._add_pending_iq(info.id)
+
+        elif direction == 'in' and info.iq_type in ('result', 'error'):
+            sent = self._pending_iqs.pop(info.id, None)
+            if sent is not None:
+                self.iq_latency.observe(time.monotonic() - sent)
+
+    def _add_pending_iq(self, id_: str) -> None:
+        self._pending_iqs[id_] = time.monotonic()
+        if len(self._pending_iqs) > MAX_PENDING_IQS:
+            self._pending_iqs.popitem(last=False)
+            self.iq_timeouts += 1
+
+    def add_processing_time(self, handler: str, duration: float) -> None:
+        histogram = self.handlers.get(handler)
+        if histogram is None:
+            histogram = Histogram(PROCESSING_BUCKETS)
+            self.handlers[handler] = histogram
+        histogram.observe(duration)
+
+
+def _escape_label(value: str) -> str:
+    return (value.replace('\\', '\\\\')
+            .replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    return ','.join(f'{key}="{_escape_label(value)}"'
+                    for key, value in labels.items())
+
+
+class StanzaMetrics(ged.EventHelper):
+    '''
+    Aggregates the stanzas sent and received by all accounts, the round
+    trip time of IQs and the time spent in the stanza handlers of modules.
+
+    Every stanza is serialized for the metrics, so nothing is collected
+    until start() is called, either by the metrics window or because the
+    export is enabled.
+    '''
+
+    def __init__(self) -> None:
+        ged.EventHelper.__init__(self)
+        self._accounts: dict[str, AccountMetrics] = {}
+        self._started = time.time()
+        self._collecting = False
+        self._export_id: Optional[int] = None
+
+        app.settings.connect_signal('stanza_metrics_export_interval',
+                                    self._on_export_interval_changed)
+        self._schedule_export()
+
+    @property
+    def started(self) -> float:
+        return self._started
+
+    @property
+    def collecting(self) -> bool:
+        return self._collecting
+
+    def start(self) -> None:
+        if self._collecting:
+            return
+
+        log.info('Start collecting stanza metrics')
+        self._collecting = True
+        self._started = time.time()
+        self.register_events([
+            ('stanza-received', ged.PRECORE, self._on_stanza_received),
+            ('stanza-sent', ged.PRECORE, self._on_stanza_sent),
+        ])
+
+    def get_accounts(self) -> dict[str, AccountMetrics]:
+        return self._accounts
+
+    def get_account_metrics(self, account: str) -> AccountMetrics:
+        metrics = self._accounts.get(account)
+        if metrics is None:
+            metrics = AccountMetrics()
+            self._accounts[account] = metrics
+        return metrics
+
+    def reset(self) -> None:
+        self._accounts.clear()
+        self._started = time.time()
+
+    def _on_stanza_received(self, event: StanzaReceived) -> None:
+        self._add_stanza(event.account, 'in', event.stanza)
+
+    def _on_stanza_sent(self, event: StanzaSent) -> None:
+        self._add_stanza(event.account, 'out', event.stanza)
+
+    def _add_stanza(self, account: str, direction: str, stanza: Any) -> None:
+        if not isinstance(stanza, str):
+            stanza = str(stanza)
+        if not stanza:
+            return
+        self.get_account_metrics(account).add_stanza(direction, stanza)
+
+    def wrap_handler(self,
+                     account: str,
+                     handler: StanzaHandler) -> StanzaHandler:
+        '''
+        Returns the handler with a callback which records its processing
+        time
+        '''
+
+        callback = handler.callback
+        name = ged.get_handler_name(callback)
+
+        def _timed_callback(*args: Any) -> Any:
+            if not self._collecting:
+                return callback(*args)
+
+            start = time.perf_counter()
+            try:
+                return callback(*args)
+            finally:
+                # Looked up on every call, reset() drops the metrics
+                self.get_account_metrics(account).add_processing_time(
+                    name, time.perf_counter() - start)
+
+        return handler._replace(callback=_timed_callback)
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+
+        def _add_header(name: str, type_: str, help_: str) -> None:
+            lines.append(f'# HELP {name} {help_}')
+            lines.append(f'# TYPE {name} {type_}')
+
+        def _add_histogram(name: str,
+                           labels: dict[str, str],
+                           histogram: Histogram) -> None:
+            for bound, count in histogram.get_cumulative_counts():
+                bucket_labels = _format_labels({**labels, 'le': bound})
+                lines.append(f'{name}_bucket{{{bucket_labels}}} {count}')
+            lines.append(f'{name}_sum{{{_format_labels(labels)}}} '
+                         f'{histogram.sum}')
+            lines.append(f'{name}_count{{{_format_labels(labels)}}} '
+                         f'{histogram.count}')
+
+        accounts = sorted(self._accounts.items())
+
+        _add_header('gajim_stanzas_total', 'counter',
+                    'Stanzas by account, direction and type')
+        for account, metrics in accounts:
+            for (direction, type_), count in sorted(metrics.stanzas.items()):
+                labels = _format_labels({'account': account,
+                                         'direction': direction,
+                                         'type': type_})
+                lines.append(f'gajim_stanzas_total{{{labels}}} {count}')
+
+        _add_header('gajim_stanza_namespaces_total', 'counter',
+                    'Stanzas by the namespace of their first payload')
+        for account, metrics in accounts:
+            for (direction, type_, namespace), count in sorted(
+                    metrics.namespaces.items()):
+                labels = _format_labels({'account': account,
+                                         'direction': direction,
+                                         'type': type_,
+                                         'namespace': namespace})
+                lines.append(
+                    f'gajim_stanza_namespaces_total{{{labels}}} {count}')
+
+        _add_header('gajim_stanza_bytes_total', 'counter',
+                    'Size of the serialized stanzas in bytes')
+        for account, metrics in accounts:
+            for direction, count in sorted(metrics.bytes.items()):
+                labels = _format_labels({'account': account,
+                                         'direction': direction})
+                lines.append(f'gajim_stanza_bytes_total{{{labels}}} {count}')
+
+        _add_header('gajim_iq_round_trip_seconds', 'histogram',
+                    'Time from sending an IQ until its response arrived')
+        for account, metrics in accounts:
+            _add_histogram('gajim_iq_round_trip_seconds',
+                           {'account': account},
+                           metrics.iq_latency)
+
+        _add_header('gajim_iq_unanswered_total', 'counter',
+                    'IQs which were dropped while waiting for a response')
+        for account, metrics in accounts:
+            labels = _format_labels({'account': account})
+            lines.append(
+                f'gajim_iq_unanswered_total{{{labels}}} {metrics.iq_timeouts}')
+
+        _add_header('gajim_handler_seconds', 'histogram',
+                    'Time spent in stanza handlers of modules')
+        for account, metrics in accounts:
+            for handler, histogram in sorted(metrics.handlers.items()):
+                _add_histogram('gajim_handler_seconds',
+                               {'account': account, 'handler': handler},
+                               histogram)
+
+        return '\n'.join(lines) + '\n'
+
+    def export_prometheus(self, path: Optional[Path] = None) -> Path:
+        if path is None:
+            path = configpaths.get('DEBUG') / EXPORT_FILENAME
+
+        # Write atomically, the file is read by other processes
+        temp_path = path.with_name(f'{path.name}.tmp')
+        temp_path.write_text(self.to_prometheus(), encoding='utf8')
+        os.replace(temp_path, path)
+        return path
+
+    def _schedule_export(self) -> None:
+        if self._export_id is not None:
+            GLib.source_remove(self._export_id)
+            self._export_id = None
+
+        interval = app.settings.get('stanza_metrics_export_interval')
+        if interval > 0:
+            self.start()
+            self._export_id = GLib.timeout_add_seconds(interval,
+                                                       self._on_export)
+
+    def _on_export_interval_changed(self, *args: Any) -> None:
+        self._schedule_export()
+
+    def _on_export(self) -> bool:
+        try:
+            self.export_prometheus()
+        except OSError as error:
+            log.warning('Unable to export stanza metrics: %s', error)
+        return True
@@ -0,0 +1,194 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+# Records named phases of the startup with timestamps and memory usage.
+# This module is imported before anything else, it must only depend on
+# the standard library.
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def get_memory_usage() -> Optional[int]:
+    '''
+    Returns the resident set size of the process in bytes, if available
+    '''
+
+    try:
+        with open('/proc/self/statm', encoding='ascii') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # Peak usage, which is close enough during startup
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return max_rss
+    return max_rss * 1024
+
+
+class Phase(NamedTuple):
+    name: str
+    depth: int
+    start: float
+    end: float
+    memory_start: Optional[int]
+    memory_end: Optional[int]
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def memory_delta(self) -> Optional[int]:
+        if self.memory_start is None or self.memory_end is None:
+            return None
+        return self.memory_end - self.memory_start
+
+
+class StartupTimeline:
+    def __init__(self) -> None:
+        self._origin = time.monotonic()
+        self._phases: list[Phase] = []
+        self._depth = 0
+        self._end: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self._end is not None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self.finished:
+            yield
+            return
+
+        depth = self._depth
+        self._depth += 1
+        start = time.monotonic() - self._origin
+        memory_start = get_memory_usage()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._phases.append(Phase(name,
+                                      depth,
+                                      start,
+                                      time.monotonic() - self._origin,
+                                      memory_start,
+                                      get_memory_usage()))
+
+    def finish(self) -> None:
+        if self._end is None:
+            self._end = time.monotonic() - self._origin
+
+    def get_phases(self) -> list[Phase]:
+        # Phases are recorded when they end, order them by their start
+        return sorted(self._phases, key=lambda phase: (phase.start,
+                                                       phase.depth))
+
+    def get_total_time(self) -> float:
+        if self._end is not None:
+            return self._end
+        return time.monotonic() - self._origin
+
+    def get_report(self) -> str:
+        lines = [
+            f'{"Start ms":>10} {"Duration ms":>12} {"Memory KiB":>11}  Phase'
+        ]
+        for phase in self.get_phases():
+            memory_delta = phase.memory_delta
+            memory = '' if memory_delta is None else memory_delta // 1024
+            lines.append(
+                f'{phase.start * 1000:>10.1f} '
+                f'{phase.duration * 1000:>12.1f} '
+                f'{memory:>11}  '
+                f'{"  " * phase.depth}{phase.name}')
+        lines.append(f'Startup finished after '
+                     f'{self.get_total_time() * 1000:.1f} ms')
+        return '\n'.join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'total_time': self.get_total_time(),
+            'memory': get_memory_usage(),
+            'phases': [{
+                'name': phase.name,
+                'depth': phase.depth,
+                'start': phase.start,
+                'duration': phase.duration,
+                'memory_delta': phase.memory_delta,
+            } for phase in self.get_phases()]
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        '''
+        Returns the phases in the Trace Event Format, which can be loaded
+        in chrome://tracing or https://ui.perfetto.dev
+        '''
+
+        pid = os.getpid()
+        trace_events: list[dict[str, Any]] = []
+        for phase in self.get_phases():
+            trace_events.append({
+                'name': phase.name,
+                'cat': 'startup',
+                'ph': 'X',
+                'ts': round(phase.start * 1e6),
+                'dur': round(phase.duration * 1e6),
+                'pid': pid,
+                'tid': 0,
+                'args': {'memory_delta': phase.memory_delta},
+            })
+
+            if phase.memory_end is not None:
+                trace_events.append({
+                    'name': 'Memory',
+                    'ph': 'C',
+                    'ts': round(phase.end * 1e6),
+                    'pid': pid,
+                    'args': {'rss': phase.memory_end},
+                })
+
+        return {
+            'traceEvents': trace_events,
+            'displayTimeUnit': 'ms',
+        }
+
+    def export_json(self, path: Path) -> None:
+        with path.open('w', encoding='utf8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def export_chrome_trace(self, path: Path) -> None:
+        with path.open('w', encoding='utf8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+timeline = StartupTimeline()
@@ -36,6 +36,8 @@
 import sqlite3 as sqlite
 from collections import namedtuple
 
+from gi.repository import GLib
+
 from nbxmpp import JID
 from nbxmpp.structs import CommonError
 from nbxmpp.structs import MessageProperties
@@ -51,7 +53,140 @@
 from gajim.common.storage.base import SqliteStorage
 from gajim.common.storage.base import timeit
 
-CURRENT_USER_VERSION = 7
+CURRENT_USER_VERSION = 8
+
+# Milliseconds markers are collected before they are written
+MARKER_FLUSH_INTERVAL = 500
+
+# Status messages are not shown in the calendar and not counted
+HISTORY_KINDS = 'kind NOT IN (%s, %s)' % (KindConstant.STATUS,
+                                          KindConstant.GCSTATUS)
+
+# UTC offsets of the local timezone in winter and summer
+HISTORY_DAYS_UTC_OFFSETS = (
+    "(strftime('%s', 1672531200, 'unixepoch', 'localtime') - 1672531200)"
+    " || ',' || "
+    "(strftime('%s', 1688169600, 'unixepoch', 'localtime') - 1688169600)")
+
+# history_days summarizes the messages of a chat per day. Days are in
+# local time like in the calendar of the search view. The table is kept
+# up to date by triggers, messages never change their time, kind or chat
+# after they were inserted. The UTC offsets the days were computed with
+# are stored, the table is rebuilt if the timezone changed.
+HISTORY_DAYS_STATEMENTS = [
+    '''CREATE TABLE IF NOT EXISTS history_days(
+            account_id INTEGER,
+            jid_id INTEGER,
+            day TEXT,
+            messages INTEGER,
+            first_time INTEGER,
+            first_log_line_id INTEGER,
+            last_time INTEGER,
+            last_log_line_id INTEGER,
+            PRIMARY KEY (account_id, jid_id, day)
+    ) WITHOUT ROWID''',
+
+    '''CREATE TABLE IF NOT EXISTS history_days_timezone(
+            utc_offsets TEXT
+    )''',
+
+    '''CREATE TRIGGER IF NOT EXISTS history_days_insert
+    AFTER INSERT ON logs
+    WHEN NEW.%(kinds)s AND NEW.account_id IS NOT NULL
+    AND NEW.jid_id IS NOT NULL AND NEW.time IS NOT NULL
+    BEGIN
+        INSERT INTO history_days VALUES (
+            NEW.account_id, NEW.jid_id,
+            date(NEW.time, 'unixepoch', 'localtime'), 1,
+            NEW.time, NEW.log_line_id, NEW.time, NEW.log_line_id)
+        ON CONFLICT (account_id, jid_id, day) DO UPDATE SET
+            messages = messages + 1,
+            first_log_line_id = CASE WHEN excluded.first_time < first_time
+                THEN excluded.first_log_line_id ELSE first_log_line_id END,
+            first_time = MIN(first_time, excluded.first_time),
+            last_log_line_id = CASE WHEN excluded.last_time >= last_time
+                THEN excluded.last_log_line_id ELSE last_log_line_id END,
+            last_time = MAX(last_time, excluded.last_time);
+    END''' % {'kinds': HISTORY_KINDS},
+
+    # The first or last message of a day is only searched again if it
+    # was deleted. All messages of a local day are within 25 hours.
+    '''CREATE TRIGGER IF NOT EXISTS history_days_delete
+    AFTER DELETE ON logs
+    WHEN OLD.%(kinds)s
+    BEGIN
+        UPDATE history_days SET messages = messages - 1
+        WHERE account_id = OLD.account_id AND jid_id = OLD.jid_id
+        AND day = date(OLD.time, 'unixepoch', 'localtime');
+
+        DELETE FROM history_days
+        WHERE account_id = OLD.account_id AND jid_id = OLD.jid_id
+        AND day = date(OLD.time, 'unixepoch', 'localtime')
+        AND messages < 1;
+
+        UPDATE history_days SET (first_time, first_log_line_id) = (
+            SELECT time, log_line_id FROM logs
+            WHERE jid_id = OLD.jid_id AND account_id = OLD.account_id
+            AND time >= OLD.time AND time < OLD.time + 90000
+            AND %(kinds)s
+            AND date(time, 'unixepoch', 'localtime') = history_days.day
+            ORDER BY time ASC, log_line_id ASC LIMIT 1)
+        WHERE account_id = OLD.account_id AND jid_id = OLD.jid_id
+        AND day = date(OLD.time, 'unixepoch', 'localtime')
+        AND first_log_line_id = OLD.log_line_id;
+
+        UPDATE history_days SET (last_time, last_log_line_id) = (
+            SELECT time, log_line_id FROM logs
+            WHERE jid_id = OLD.jid_id AND account_id = OLD.account_id
+            AND time <= OLD.time AND time > OLD.time - 90000
+            AND %(kinds)s
+            AND date(time, 'unixepoch', 'localtime') = history_days.day
+            ORDER BY time DESC, log_line_id DESC LIMIT 1)
+        WHERE account_id = OLD.account_id AND jid_id = OLD.jid_id
+        AND day = date(OLD.time, 'unixepoch', 'localtime')
+        AND last_log_line_id = OLD.log_line_id;
+    END''' % {'kinds': HISTORY_KINDS},
+]
+
+# Fills history_days from the existing messages
+HISTORY_DAYS_REBUILD_STATEMENTS = [
+    'DELETE FROM history_days',
+
+    '''INSERT INTO history_days (account_id, jid_id, day, messages,
+                               first_time, last_time)
+    SELECT account_id, jid_id, date(time, 'unixepoch', 'localtime'),
+           COUNT(*), MIN(time), MAX(time)
+    FROM logs
+    WHERE %(kinds)s AND account_id IS NOT NULL
+    AND jid_id IS NOT NULL AND time IS NOT NULL
+    GROUP BY account_id, jid_id, date(time, 'unixepoch', 'localtime')
+    ''' % {'kinds': HISTORY_KINDS},
+
+    '''UPDATE history_days SET
+    first_log_line_id = (
+        SELECT log_line_id FROM logs
+        WHERE jid_id = history_days.jid_id
+        AND account_id = history_days.account_id
+        AND time = history_days.first_time AND %(kinds)s
+        ORDER BY log_line_id ASC LIMIT 1),
+    last_log_line_id = (
+        SELECT log_line_id FROM logs
+        WHERE jid_id = history_days.jid_id
+        AND account_id = history_days.account_id
+        AND time = history_days.last_time AND %(kinds)s
+        ORDER BY log_line_id DESC LIMIT 1)
+    ''' % {'kinds': HISTORY_KINDS},
+
+    'DELETE FROM history_days_timezone',
+
+    'INSERT INTO history_days_timezone VALUES (%s)' % HISTORY_DAYS_UTC_OFFSETS,
+]
+
+HISTORY_DAYS_TIMEZONE_CHANGED = '''
+    SELECT NOT EXISTS (
+        SELECT 1 FROM history_days_timezone WHERE utc_offsets = %s
+    ) AS changed
+    ''' % HISTORY_DAYS_UTC_OFFSETS
 
 ARCHIVE_SQL_STATEMENT = '''
     CREATE TABLE jids(
@@ -88,8 +223,9 @@
     CREATE INDEX idx_logs_jid_id_time ON logs (jid_id, time DESC);
     CREATE INDEX idx_logs_stanza_id ON logs (stanza_id);
     CREATE INDEX idx_logs_message_id ON logs (message_id);
+    %s;
     PRAGMA user_version=%s;
-    ''' % CURRENT_USER_VERSION
+    ''' % (';\n'.join(HISTORY_DAYS_STATEMENTS), CURRENT_USER_VERSION)
 
 log = logging.getLogger('gajim.c.storage.archive')
 
@@ -172,6 +308,13 @@ def __init__(self):
         self._jid_ids: dict[JID, JidsTableRow] = {}
         self._jid_ids_reversed: dict[int, JidsTableRow] = {}
 
+        # Markers are written in batches, see set_marker()
+        # (account jid, jid) -> message ids
+        self._pending_receipts: dict[tuple[str, str], set[str]] = {}
+        # (account jid, jid, sender) -> latest displayed message id
+        self._pending_displayed: dict[tuple[str, str, str], str] = {}
+        self._marker_flush_id: Optional[int] = None
+
     def init(self, **kwargs: Any) -> None:
         SqliteStorage.init(self,
                            detect_types=sqlite.PARSE_COLNAMES)
@@ -184,6 +327,11 @@ def init(self, **kwargs: Any) -> None:
         self._con.create_function('like', 1, self._like)
 
         self._get_jid_ids_from_db()
+        self._check_history_days_timezone()
+
+    def shutdown(self) -> None:
+        self.flush_markers()
+        SqliteStorage.shutdown(self)
 
     def _namedtuple_factory(self,
                             cursor: sqlite.Cursor,
@@ -269,6 +417,22 @@ def _migrate(self) -> None:
             ]
             self._execute_multiple(statements)
 
+        if user_version < 8:
+            # The days are filled by _check_history_days_timezone()
+            statements = [
+                *HISTORY_DAYS_STATEMENTS,
+                'PRAGMA user_version=8'
+            ]
+            self._execute_multiple(statements)
+
+    def _check_history_days_timezone(self) -> None:
+        row = self._con.execute(HISTORY_DAYS_TIMEZONE_CHANGED).fetchone()
+        if not row.changed:
+            return
+
+        log.info('Timezone changed, rebuild history days')
+        self._execute_multiple(HISTORY_DAYS_REBUILD_STATEMENTS)
+
     @staticmethod
     def _like(search_str: str) -> str:
         return f'%{search_str}%'
@@ -372,6 +536,7 @@ def get_conversation_before_after(self,
 
         returns a list of namedtuples
         '''
+        self.flush_markers()
         jids = [jid]
         account_id = self.get_account_id(account)
         kinds = map(str, [KindConstant.ERROR,
@@ -454,6 +619,7 @@ def get_conversation_around(self,
 
         returns a list of namedtuples
         '''
+        self.flush_markers()
         jids = [jid]
         account_id = self.get_account_id(account)
         kinds = map(str, [KindConstant.ERROR])
@@ -514,6 +680,7 @@ def get_conversation_between(self,
 
         returns a list of namedtuples
         '''
+        self.flush_markers()
         jids = [jid]
         account_id = self.get_account_id(account)
         kinds = map(str, [KindConstant.ERROR])
@@ -707,31 +874,24 @@ def get_days_with_history(self,
         '''
         jids = [jid]
         account_id = self.get_account_id(account)
-        kinds = map(str, [KindConstant.STATUS,
-                          KindConstant.GCSTATUS])
 
-        # Calculate the start and end datetime of the month
-        date = datetime.datetime(year, month, 1)
-        days = calendar.monthrange(year, month)[1] - 1
-        delta = datetime.timedelta(
-            days=days, hours=23, minutes=59, seconds=59, microseconds=999999)
+        days = calendar.monthrange(year, month)[1]
+        first_day = datetime.date(year, month, 1)
+        last_day = datetime.date(year, month, days)
 
         sql = '''
-            SELECT DISTINCT
-            CAST(strftime('%d', time, 'unixepoch', 'localtime') AS INTEGER)
-            AS day FROM logs NATURAL JOIN jids WHERE jid IN ({jids})
+            SELECT CAST(substr(day, 9, 2) AS INTEGER) AS day
+            FROM history_days NATURAL JOIN jids WHERE jid IN ({jids})
             AND account_id = {account_id}
-            AND time BETWEEN ? AND ?
-            AND kind NOT IN ({kinds})
-            ORDER BY time
+            AND day BETWEEN ? AND ?
+            ORDER BY day
             '''.format(jids=', '.join('?' * len(jids)),
-                       account_id=account_id,
-                       kinds=', '.join(kinds))
+                       account_id=account_id)
 
         return self._con.execute(
             sql,
-            tuple(jids) + (date.timestamp(),
-                           (date + delta).timestamp())).fetchall()
+            tuple(jids) + (first_day.isoformat(),
+                           last_day.isoformat())).fetchall()
 
     @timeit
     def get_last_history_timestamp(self,
@@ -743,17 +903,13 @@ def get_last_history_timestamp(self,
         '''
         jids = [jid]
         account_id = self.get_account_id(account)
-        kinds = map(str, [KindConstant.STATUS,
-                          KindConstant.GCSTATUS])
 
         sql = '''
-            SELECT MAX(time) as time FROM logs
+            SELECT MAX(last_time) as time FROM history_days
             NATURAL JOIN jids WHERE jid IN ({jids})
             AND account_id = {account_id}
-            AND kind NOT IN ({kinds})
             '''.format(account_id=account_id,
-                       jids=', '.join('?' * len(jids)),
-                       kinds=', '.join(kinds))
+                       jids=', '.join('?' * len(jids)))
 
         # fetchone() returns always at least one Row with all
         # attributes set to None because of the MAX() function
@@ -769,17 +925,13 @@ def get_first_history_timestamp(self,
         '''
         jids = [jid]
         account_id = self.get_account_id(account)
-        kinds = map(str, [KindConstant.STATUS,
-                          KindConstant.GCSTATUS])
 
         sql = '''
-            SELECT MIN(time) as time FROM logs
+            SELECT MIN(first_time) as time FROM history_days
             NATURAL JOIN jids WHERE jid IN ({jids})
             AND account_id = {account_id}
-            AND kind NOT IN ({kinds})
             '''.format(jids=', '.join('?' * len(jids)),
-                       account_id=account_id,
-                       kinds=', '.join(kinds))
+                       account_id=account_id)
 
         # fetchone() returns always at least one Row with all
         # attributes set to None because of the MIN() function
@@ -797,22 +949,47 @@ def date_has_history(self,
         '''
         jids = [jid]
         account_id = self.get_account_id(account)
-        delta = datetime.timedelta(
-            hours=23, minutes=59, seconds=59, microseconds=999999)
-
-        start = date.timestamp()
-        end = (date + delta).timestamp()
 
         sql = '''
-            SELECT time
-            FROM logs NATURAL JOIN jids WHERE jid IN ({jids})
+            SELECT first_time AS time
+            FROM history_days NATURAL JOIN jids WHERE jid IN ({jids})
             AND account_id = {account_id}
-            AND time BETWEEN ? AND ?
+            AND day = ?
             '''.format(jids=', '.join('?' * len(jids)),
                        account_id=account_id)
 
         return self._con.execute(
-            sql, tuple(jids) + (start, end)).fetchone()
+            sql, tuple(jids) + (date.date().isoformat(),)).fetchone()
+
+    @timeit
+    def get_adjacent_history_date(self,
+                                  account: str,
+                                  jid: str,
+                                  date: datetime.datetime,
+                                  forward: bool
+                                  ) -> Optional[datetime.datetime]:
+        '''
+        Get the next (or previous) day with messages for 'jid'
+        '''
+        jids = [jid]
+        account_id = self.get_account_id(account)
+
+        sql = '''
+            SELECT day
+            FROM history_days NATURAL JOIN jids WHERE jid IN ({jids})
+            AND account_id = {account_id}
+            AND day {operator} ?
+            ORDER BY day {order} LIMIT 1
+            '''.format(jids=', '.join('?' * len(jids)),
+                       account_id=account_id,
+                       operator='>' if forward else '<',
+                       order='ASC' if forward else 'DESC')
+
+        row = self._con.execute(
+            sql, tuple(jids) + (date.date().isoformat(),)).fetchone()
+        if row is None:
+            return None
+        return datetime.datetime.strptime(row.day, '%Y-%m-%d')
 
     @timeit
     def get_first_message_meta_for_date(self,
@@ -826,23 +1003,16 @@ def get_first_message_meta_for_date(self,
         jids = [jid]
         account_id = self.get_account_id(account)
 
-        delta = datetime.timedelta(
-            hours=23, minutes=59, seconds=59, microseconds=999999)
-        date_ts = date.timestamp()
-        delta_ts = (date + delta).timestamp()
-
         sql = '''
-            SELECT time, log_line_id
-            FROM logs NATURAL JOIN jids WHERE jid IN ({jids})
+            SELECT first_time AS time, first_log_line_id AS log_line_id
+            FROM history_days NATURAL JOIN jids WHERE jid IN ({jids})
             AND account_id = {account_id}
-            AND time BETWEEN ? AND ?
-            ORDER BY time ASC, log_line_id ASC
+            AND day = ?
             '''.format(jids=', '.join('?' * len(jids)),
                        account_id=account_id)
 
         return self._con.execute(
-            sql,
-            tuple(jids) + (date_ts, delta_ts)).fetchone()
+            sql, tuple(jids) + (date.date().isoformat(),)).fetchone()
 
     @timeit
     def get_recent_muc_nicks(self, contact: GroupchatContact) -> list[str]:
@@ -1234,35 +1404,90 @@ def set_message_error(self,
         self._con.execute(sql, (error, account_id, jid_id, message_id))
         self._delayed_commit()
 
-    @timeit
     def set_marker(self,
                    account_jid: str,
                    jid: str,
                    message_id: str,
-                   state: Literal['received', 'displayed']
+                   state: Literal['received', 'displayed'],
+                   sender: Optional[str] = None
                    ) -> None:
         '''
         Update the marker state of the corresponding message
+
+        Markers are collected and written in one transaction after
+        MARKER_FLUSH_INTERVAL. Only the latest displayed marker of each
+        sender is kept, it supersedes the previous ones.
         '''
 
         if state not in ('received', 'displayed'):
             raise ValueError('Invalid marker state')
 
-        account_id = self.get_jid_id(account_jid)
-        try:
-            jid_id = self.get_jid_id(str(jid))
-        except ValueError:
-            # Unknown JID
+        jid = str(jid)
+        if state == 'received':
+            self._pending_receipts.setdefault(
+                (account_jid, jid), set()).add(message_id)
+        else:
+            sender = jid if sender is None else str(sender)
+            self._pending_displayed[(account_jid, jid, sender)] = message_id
+
+        if self._marker_flush_id is None:
+            self._marker_flush_id = GLib.timeout_add(MARKER_FLUSH_INTERVAL,
+                                                     self._on_flush_markers)
+
+    def _on_flush_markers(self) -> bool:
+        self._marker_flush_id = None
+        self.flush_markers()
+        return False
+
+    @timeit
+    def flush_markers(self) -> None:
+        '''
+        Write all pending markers to the database
+        '''
+
+        if self._marker_flush_id is not None:
+            GLib.source_remove(self._marker_flush_id)
+            self._marker_flush_id = None
+
+        if not self._pending_receipts and not self._pending_displayed:
             return
 
-        state_int = 0 if state == 'received' else 1
+        # Receipts first, a displayed marker supersedes a receipt
+        rows: list[tuple[int, int, int, str, int]] = []
+        for (account_jid, jid), message_ids in self._pending_receipts.items():
+            ids = self._get_marker_ids(account_jid, jid)
+            if ids is not None:
+                rows.extend((0, *ids, message_id, 0)
+                            for message_id in message_ids)
 
+        for (account_jid, jid, _sender), message_id in \
+                self._pending_displayed.items():
+            ids = self._get_marker_ids(account_jid, jid)
+            if ids is not None:
+                rows.append((1, *ids, message_id, 1))
+
+        self._pending_receipts.clear()
+        self._pending_displayed.clear()
+
+        # Never downgrade a message which was already displayed
         sql = '''
             UPDATE logs SET marker = ?
             WHERE account_id = ? AND jid_id = ? AND message_id = ?
+            AND (marker IS NULL OR marker < ?)
             '''
-        self._con.execute(sql, (state_int, account_id, jid_id, message_id))
-        self._delayed_commit()
+        with self._con:
+            self._con.executemany(sql, rows)
+
+        log.debug('Wrote %s markers', len(rows))
+
+    def _get_marker_ids(self,
+                        account_jid: str,
+                        jid: str) -> Optional[tuple[int, int]]:
+        try:
+            return self.get_jid_id(account_jid), self.get_jid_id(jid)
+        except ValueError:
+            # Unknown JID
+            return None
 
     @timeit
     def get_archive_infos(self, jid: str) -> Optional[LastArchiveMessageRow]:
@@ -1382,6 +1607,9 @@ def remove_history(self, account: str, jid: JID) -> None:
         except ValueError:
             log.info('No history entries for: %s', jid)
             return
+        # Removing the summary first makes the delete trigger a no-op
+        sql = 'DELETE FROM history_days WHERE account_id = ? AND jid_id = ?'
+        self._con.execute(sql, (account_id, jid_id))
         sql = 'DELETE FROM logs WHERE account_id = ? AND jid_id = ?'
         self._con.execute(sql, (account_id, jid_id))
 
@@ -1393,6 +1621,7 @@ def remove_all_history(self) -> None:
         Remove all messages for all accounts
         '''
         statements = [
+            'DELETE FROM history_days',
             'DELETE FROM logs',
             'DELETE FROM jids',
             'DELETE FROM last_archive_message'
@@ -0,0 +1,72 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from typing import Optional
+from typing import Union
+
+import hashlib
+import logging
+from pathlib import Path
+
+from nbxmpp.protocol import JID
+
+from gajim.common import configpaths
+
+log = logging.getLogger('gajim.c.storage.avatar')
+
+
+class AvatarFileStorage:
+    '''
+    Stores avatars on the harddisk, named by their SHA1 value
+
+    The GUI extends this with rendering avatars, this class is used
+    directly if Gajim runs without GUI.
+    '''
+
+    def invalidate_cache(self, jid: Union[JID, str]) -> None:
+        pass
+
+    @staticmethod
+    def save_avatar(data: bytes) -> Optional[str]:
+        '''
+        Save an avatar to the harddisk
+
+        :param data:  bytes
+
+        returns SHA1 value of the avatar or None on error
+        '''
+        if data is None:
+            return None
+
+        sha = hashlib.sha1(data).hexdigest()
+        path = configpaths.get('AVATAR') / sha
+        try:
+            with open(path, 'wb') as output_file:
+                output_file.write(data)
+        except Exception:
+            log.error('Storing avatar failed', exc_info=True)
+            return None
+        return sha
+
+    @staticmethod
+    def get_avatar_path(filename: str) -> Optional[Path]:
+        path = configpaths.get('AVATAR') / filename
+        if not path.is_file():
+            return None
+        return path
+
+    def avatar_exists(self, filename: str) -> bool:
+        return self.get_avatar_path(filename) is not None
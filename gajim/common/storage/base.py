@@ -41,6 +41,8 @@
 from nbxmpp.const import StatusCode
 from nbxmpp.modules.discovery import parse_disco_info
 
+from gajim.common.startup_timeline import timeline
+
 
 _T = TypeVar('_T')
 
@@ -179,7 +181,8 @@ def init(self, **kwargs: Any) -> None:
                 sys.exit('%s must be a file' % self._path)
             self._con = self._connect(**kwargs)
 
-        self._migrate_storage()
+        with timeline.phase(f'{type(self).__name__}: migrate'):
+            self._migrate_storage()
 
     def _set_journal_mode(self, mode: str) -> None:
         self._con.execute(f'PRAGMA journal_mode={mode}')
@@ -30,6 +30,7 @@
 from nbxmpp.structs import RosterItem
 
 from gajim.common import configpaths
+from gajim.common.startup_timeline import timeline
 from gajim.common.storage.base import SqliteStorage
 from gajim.common.storage.base import timeit
 from gajim.common.storage.base import Encoder
@@ -111,9 +112,11 @@ def init(self, **kwargs: Any) -> None:
         self._set_journal_mode('WAL')
         self._con.row_factory = self._namedtuple_factory
 
-        self._fill_disco_info_cache()
+        with timeline.phase('CacheStorage: fill disco info cache'):
+            self._fill_disco_info_cache()
         self._clean_caps_table()
-        self._load_caps_data()
+        with timeline.phase('CacheStorage: load caps data'):
+            self._load_caps_data()
 
     @staticmethod
     def _namedtuple_factory(cursor: sqlite3.Cursor,
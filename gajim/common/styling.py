@@ -15,23 +15,29 @@
 from __future__ import annotations
 
 from typing import Any
+from typing import NamedTuple
 from typing import Union
 from typing import Match
 from typing import Optional
 
+import logging
 import string
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from dataclasses import field
 
 from gi.repository import GLib
 
+from gajim.common import app
 from gajim.common import regex
 from gajim.common.const import URIType
 from gajim.common.helpers import parse_uri as analyze_uri
 from gajim.common.helpers import validate_jid
 from gajim.common.text_helpers import escape_iri_query
 
+log = logging.getLogger('gajim.c.styling')
+
 PRE = '`'
 STRONG = '*'
 STRIKE = '~'
@@ -51,11 +57,15 @@
 
 URI_OR_JID_RX = re.compile(
     fr'(?P<uri>(?<![\w+.-]){regex.IRI})|(?P<jid>{regex.XMPP.jid})')
+IRI_RX = re.compile(regex.IRI)
 
 SD = 0
 SD_POS = 1
 MAX_QUOTE_LEVEL = 20
 
+# Number of message texts for which parsing results are cached
+MAX_CACHED_TEXTS = 1000
+
 
 @dataclass
 class StyleObject:
@@ -228,6 +238,111 @@ def process_uris(text: Union[str, bytes]) -> list[BaseHyperlink]:
     return uris
 
 
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+
+@dataclass
+class _CacheEntry:
+    result: Optional[ParsingResult] = None
+    uris: Optional[list[BaseHyperlink]] = None
+    is_uri: Optional[bool] = None
+
+
+class ParsingCache:
+    '''
+    LRU cache of parsing results, keyed by message text
+
+    Messages are parsed again each time a chat is opened or scrolled back,
+    and for notifications and previews. Results are shared between all
+    callers and must not be modified.
+
+    The cache is cleared if additional URI schemes are changed, because
+    they change which URIs are detected.
+    '''
+
+    def __init__(self, max_size: int = MAX_CACHED_TEXTS) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._connected = False
+
+    def process(self, text: str) -> ParsingResult:
+        entry = self._get_entry(text)
+        if entry.result is None:
+            self._misses += 1
+            entry.result = process(text)
+        else:
+            self._hits += 1
+        return entry.result
+
+    def process_uris(self, text: str) -> list[BaseHyperlink]:
+        entry = self._get_entry(text)
+        if entry.uris is None:
+            self._misses += 1
+            entry.uris = process_uris(text)
+        else:
+            self._hits += 1
+        return entry.uris
+
+    def is_uri(self, text: str) -> bool:
+        '''
+        Returns True if the whole text is one URI
+        '''
+
+        entry = self._get_entry(text)
+        if entry.is_uri is None:
+            self._misses += 1
+            entry.is_uri = IRI_RX.fullmatch(text) is not None
+        else:
+            self._hits += 1
+        return entry.is_uri
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(self._hits, self._misses, len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def _get_entry(self, text: str) -> _CacheEntry:
+        entry = self._entries.get(text)
+        if entry is not None:
+            self._entries.move_to_end(text)
+            return entry
+
+        if not self._connected:
+            app.settings.connect_signal('additional_uri_schemes',
+                                        self._on_uri_schemes_changed)
+            self._connected = True
+
+        entry = _CacheEntry()
+        self._entries[text] = entry
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _on_uri_schemes_changed(self, *args: Any) -> None:
+        stats = self.get_stats()
+        log.info('URI schemes changed, clear cache (%s entries, '
+                 'hit rate %.0f%%)', stats.size, stats.hit_rate * 100)
+        self.clear()
+
+
+parsing_cache = ParsingCache()
+
+
 def _parse_blocks(text: str, level: int) -> list[Block]:
     blocks: list[Block] = []
     text_len = len(text)
@@ -28,6 +28,7 @@
 from packaging.version import Version as V
 
 import gajim.gui
+from gajim.common.startup_timeline import timeline
 
 
 _MIN_NBXMPP_VER = '3.2.5'
@@ -45,7 +46,8 @@ def check_version(dep_name: str, current_ver: str, min_ver: str) -> None:
                  'Quitting...' % (dep_name, min_ver, current_ver))
 
 
-def _check_required_deps() -> None:
+def _check_core_deps() -> None:
+    # Dependencies of gajim.common, which also runs without GUI
     error_message = 'Gajim needs %s to run. Quitting… (Error: %s)'
 
     try:
@@ -61,40 +63,52 @@ def _check_required_deps() -> None:
     try:
         gi.require_versions({'GLib': '2.0',
                              'Gio': '2.0',
-                             'Gtk': '3.0',
-                             'GtkSource': '4',
+                             'GdkPixbuf': '2.0',
                              'GObject': '2.0',
-                             'Pango': '1.0',
-                             'PangoCairo': '1.0',
                              'Soup': '2.4'})
     except ValueError as error:
         sys.exit('Missing dependency: %s' % error)
 
+    from gi.repository import GLib
+    glib_ver = '.'.join(map(str, [GLib.MAJOR_VERSION,
+                                  GLib.MINOR_VERSION,
+                                  GLib.MICRO_VERSION]))
+
+    check_version('python-nbxmpp', nbxmpp.__version__, _MIN_NBXMPP_VER)
+    check_version('pygobject', gi.__version__, _MIN_PYGOBJECT_VER)
+    check_version('glib', glib_ver, _MIN_GLIB_VER)
+    check_version('sqlite', sqlite3.sqlite_version, _MIN_SQLITE_VER)
+
+
+def _check_required_deps() -> None:
+    _check_core_deps()
+
+    import gi
+    try:
+        gi.require_versions({'Gtk': '3.0',
+                             'GtkSource': '4',
+                             'Pango': '1.0',
+                             'PangoCairo': '1.0'})
+    except ValueError as error:
+        sys.exit('Missing dependency: %s' % error)
+
     try:
         import cairo
     except ImportError as error:
-        sys.exit(error_message % ('pycairo', error))
+        sys.exit('Gajim needs %s to run. Quitting… (Error: %s)' % (
+            'pycairo', error))
 
     from gi.repository import Gtk
     gtk_ver = '%s.%s.%s' % (Gtk.get_major_version(),
                             Gtk.get_minor_version(),
                             Gtk.get_micro_version())
 
-    from gi.repository import GLib
-    glib_ver = '.'.join(map(str, [GLib.MAJOR_VERSION,
-                                  GLib.MINOR_VERSION,
-                                  GLib.MICRO_VERSION]))
-
     from gi.repository import Pango
 
-    check_version('python-nbxmpp', nbxmpp.__version__, _MIN_NBXMPP_VER)
-    check_version('pygobject', gi.__version__, _MIN_PYGOBJECT_VER)
     check_version('libcairo', cairo.cairo_version_string(), _MIN_CAIRO_VER)
     check_version('pycairo', cairo.version, _MIN_CAIRO_VER)
     check_version('gtk3', gtk_ver, _MIN_GTK_VER)
-    check_version('glib', glib_ver, _MIN_GLIB_VER)
     check_version('pango', Pango.version_string(), _MIN_PANGO_VER)
-    check_version('sqlite', sqlite3.sqlite_version, _MIN_SQLITE_VER)
 
 
 def _init_gui(gui: str) -> None:
@@ -121,7 +135,8 @@ def _init_gtk() -> None:
 
 
 def _run_app() -> None:
-    from gajim.gui.application import GajimApplication
+    with timeline.phase('Import application'):
+        from gajim.gui.application import GajimApplication
     application = GajimApplication()
 
     def sigint_cb(num: int, stack: Optional[FrameType]) -> None:
@@ -137,6 +152,23 @@ def sigint_cb(num: int, stack: Optional[FrameType]) -> None:
     application.run(sys.argv)
 
 
+def _run_headless_app() -> None:
+    from gajim.common.headless import HeadlessApplication
+    application = HeadlessApplication()
+
+    def sigint_cb(num: int, stack: Optional[FrameType]) -> None:
+        print(' SIGINT/SIGTERM received')
+        # Disconnect accounts before quitting
+        application.start_shutdown()
+
+    signal.signal(signal.SIGINT, sigint_cb)
+    signal.signal(signal.SIGTERM, sigint_cb)
+    if sys.platform != 'win32':
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+    sys.exit(application.run(sys.argv))
+
+
 def _set_proc_title() -> None:
     sysname = platform.system()
     if sysname in ('Linux', 'FreeBSD', 'OpenBSD', 'NetBSD'):
@@ -160,8 +192,25 @@ def main() -> None:
         if os.geteuid() == 0:
             sys.exit('You must not launch gajim as root, it is insecure.')
 
-    _check_required_deps()
+    with timeline.phase('Check required dependencies'):
+        _check_required_deps()
     _set_proc_title()
     _disable_csd()
-    _init_gui('GTK')
+    with timeline.phase('Init GUI'):
+        _init_gui('GTK')
     _run_app()
+
+
+def main_headless() -> None:
+    '''
+    Runs Gajim without GUI, e.g. on a server
+    '''
+
+    if sys.platform != 'win32':
+        if os.geteuid() == 0:
+            sys.exit('You must not launch gajim as root, it is insecure.')
+
+    with timeline.phase('Check required dependencies'):
+        _check_core_deps()
+    _set_proc_title()
+    _run_headless_app()
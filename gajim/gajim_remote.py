@@ -33,6 +33,8 @@
 
 SIGNATURES = {
     'list_contacts': '(s)',
+    'list_contacts_paged': '(suu)',
+    'get_unread_counts': '(suu)',
     'list_accounts': '()',
     'change_status': '(sss)',
     'send_chat_message': '(sss)',
@@ -43,13 +45,17 @@
     'get_unread_msgs_number': '()',
 }
 
+EVENT_TYPES = [
+    'gc-message-received',
+    'message-received',
+    'message-sent',
+    'our-show',
+    'presence-received',
+]
 
-def call_method(args: argparse.Namespace) -> Any:
-    arg_dict = vars(args)
-    app_id = arg_dict.pop('app_id')
-    command = arg_dict.pop('command')
 
-    proxy = Gio.DBusProxy.new_for_bus_sync(
+def get_proxy(app_id: str) -> Gio.DBusProxy:
+    return Gio.DBusProxy.new_for_bus_sync(
         Gio.BusType.SESSION,
         Gio.DBusProxyFlags.NONE,
         None,
@@ -58,12 +64,49 @@ def call_method(args: argparse.Namespace) -> Any:
         INTERFACE,
         None)
 
+
+def call_method(args: argparse.Namespace) -> Any:
+    arg_dict = vars(args)
+    app_id = arg_dict.pop('app_id')
+    command = arg_dict.pop('command')
+
+    proxy = get_proxy(app_id)
+
     arguments = tuple(arg_dict.values())
     signature = SIGNATURES[command]
     method = getattr(proxy, command)
     return method(signature, *arguments)
 
 
+def monitor_events(args: argparse.Namespace) -> None:
+    proxy = get_proxy(args.app_id)
+
+    def _on_signal(_proxy: Gio.DBusProxy,
+                   _sender_name: str,
+                   signal_name: str,
+                   parameters: GLib.Variant) -> None:
+
+        if signal_name != 'Events':
+            return
+
+        _subscription_id, events = parameters.unpack()
+        for event in events:
+            print(event, flush=True)
+
+    proxy.connect('g-signal', _on_signal)
+
+    subscription_id = proxy.subscribe('(asasas)',
+                                      args.event_types or [],
+                                      args.accounts or [],
+                                      args.jids or [])
+    log.info('Subscribed, subscription id: %s', subscription_id)
+
+    try:
+        GLib.MainLoop().run()
+    except KeyboardInterrupt:
+        pass
+
+
 def create_arg_parser() -> argparse.ArgumentParser:
 
     account_help = 'The account the command is executed for'
@@ -80,6 +123,14 @@ def create_arg_parser() -> argparse.ArgumentParser:
         help='Get all roster contacts')
     subparser.add_argument('account', type=str)
 
+    subparser = subparsers.add_parser(
+        'list_contacts_paged',
+        help='Get roster contacts page by page')
+    subparser.add_argument('account', type=str,
+                           help='The account, or "" for all accounts')
+    subparser.add_argument('offset', type=int)
+    subparser.add_argument('limit', type=int)
+
     subparser = subparsers.add_parser(
         'list_accounts',
         help='Get the list of accounts')
@@ -131,12 +182,35 @@ def create_arg_parser() -> argparse.ArgumentParser:
         'get_unread_msgs_number',
         help='Get the unread message count')
 
+    subparser = subparsers.add_parser(
+        'get_unread_counts',
+        help='Get the unread message count of chats page by page')
+    subparser.add_argument('account', type=str,
+                           help='The account, or "" for all accounts')
+    subparser.add_argument('offset', type=int)
+    subparser.add_argument('limit', type=int)
+
+    subparser = subparsers.add_parser(
+        'monitor',
+        help='Print events until interrupted')
+    subparser.add_argument('--event-type', dest='event_types',
+                           action='append', choices=EVENT_TYPES,
+                           help='Only print events of this type')
+    subparser.add_argument('--account', dest='accounts', action='append',
+                           help='Only print events of this account')
+    subparser.add_argument('--jid', dest='jids', action='append',
+                           help='Only print events of this XMPP address')
+
     return parser
 
 
 def main() -> None:
     args = create_arg_parser().parse_args()
     try:
+        if args.command == 'monitor':
+            monitor_events(args)
+            return
+
         result = call_method(args)
     except GLib.Error as error:
         quark = GLib.quark_try_string('g-dbus-error-quark')
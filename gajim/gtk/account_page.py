@@ -32,6 +32,8 @@
 from gajim.common.events import UnsubscribedPresenceReceived
 from gajim.common.events import MucInvitation
 from gajim.common.events import MucDecline
+from gajim.common.events import MUCJoinProgress
+from gajim.common.i18n import _
 
 from .roster import Roster
 from .status_message_selector import StatusMessageSelector
@@ -65,6 +67,11 @@ def __init__(self, account: str) -> None:
         self._status_message_selector.set_halign(Gtk.Align.CENTER)
         self._ui.status_message_box.add(self._status_message_selector)
 
+        self._join_progress = Gtk.ProgressBar()
+        self._join_progress.set_show_text(True)
+        self._join_progress.set_no_show_all(True)
+        self._ui.status_message_box.add(self._join_progress)
+
         self._notification_manager = NotificationManager(account)
         self._ui.account_box.add(self._notification_manager)
 
@@ -97,6 +104,7 @@ def __init__(self, account: str) -> None:
             ('muc-decline', ged.GUI1, self._muc_invitation_declined),
             ('account-connected', ged.GUI2, self._on_account_state),
             ('account-disconnected', ged.GUI2, self._on_account_state),
+            ('muc-join-progress', ged.GUI2, self._on_muc_join_progress),
         ])
         # pylint: enable=line-too-long
 
@@ -131,6 +139,28 @@ def _on_account_state(self,
         self._ui.adhoc_commands_button.set_sensitive(
             app.account_is_connected(event.account))
 
+    def _on_muc_join_progress(self, event: MUCJoinProgress) -> None:
+        if event.account != self._account:
+            return
+
+        if event.finished < event.total:
+            self._join_progress.set_fraction(event.finished / event.total)
+            self._join_progress.set_text(
+                _('Joining group chats (%(finished)s/%(total)s)') % {
+                    'finished': event.finished,
+                    'total': event.total})
+            self._join_progress.show()
+
+        elif event.catch_ups:
+            self._join_progress.pulse()
+            self._join_progress.set_text(
+                _('Fetching group chat history (%s remaining)') %
+                event.catch_ups)
+            self._join_progress.show()
+
+        else:
+            self._join_progress.hide()
+
     def _on_search_changed(self, widget: Gtk.SearchEntry) -> None:
         text = widget.get_text().lower()
         self._roster.set_search_string(text)
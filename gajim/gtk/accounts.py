@@ -901,16 +901,18 @@ def _publish_tune(self, state: bool, _data: Any) -> None:
             self._client.get_module('UserTune').set_enabled(state)
 
     def _send_read_marker(self, state: bool, _data: Any) -> None:
-        app.settings.set_account_setting(
-            self._account, 'send_marker_default', state)
-        app.settings.set_account_setting(
-            self._account, 'gc_send_marker_private_default', state)
+        with app.settings.batch():
+            app.settings.set_account_setting(
+                self._account, 'send_marker_default', state)
+            app.settings.set_account_setting(
+                self._account, 'gc_send_marker_private_default', state)
 
     def _reset_send_read_marker(self, button: Gtk.Button) -> None:
         button.set_sensitive(False)
-        app.settings.set_contact_settings('send_marker', None)
-        app.settings.set_group_chat_settings(
-            'send_marker', None, context='private')
+        with app.settings.batch():
+            app.settings.set_contact_settings('send_marker', None)
+            app.settings.set_group_chat_settings(
+                'send_marker', None, context='private')
 
 
 class ConnectionPage(GenericSettingPage):
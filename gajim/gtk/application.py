@@ -38,6 +38,7 @@
 from typing import Any
 from typing import Callable
 from typing import Optional
+from typing import TYPE_CHECKING
 from typing import cast
 
 import os
@@ -67,12 +68,11 @@
 from gajim.common.exceptions import GajimGeneralException
 from gajim.common.helpers import load_json
 from gajim.common.helpers import open_uri
+from gajim.common.startup_timeline import timeline
 from gajim.common.i18n import _
 
 from gajim.gui import menus
 from gajim.gui import structs
-from gajim.gui.about import AboutDialog
-from gajim.gui.accounts import AccountsWindow
 from gajim.gui.avatar import AvatarStorage
 from gajim.gui.builder import get_builder
 from gajim.gui.const import ACCOUNT_ACTIONS
@@ -82,14 +82,15 @@
 from gajim.gui.const import ONLINE_ACCOUNT_ACTIONS
 from gajim.gui.dialogs import DialogButton
 from gajim.gui.dialogs import ConfirmationDialog
-from gajim.gui.dialogs import ShortcutsWindow
-from gajim.gui.discovery import ServiceDiscoveryWindow
-from gajim.gui.start_chat import StartChatDialog
 from gajim.gui.util import get_app_window
 from gajim.gui.util import get_app_windows
 from gajim.gui.util import load_user_iconsets
 from gajim.gui.util import open_window
 
+if TYPE_CHECKING:
+    from gajim.gui.accounts import AccountsWindow  # noqa: F401
+    from gajim.gui.start_chat import StartChatDialog  # noqa: F401
+
 
 ActionListT = list[tuple[str,
                          Callable[[Gio.SimpleAction, GLib.Variant], Any]]]
@@ -109,80 +110,7 @@ def __init__(self):
         # required to track screensaver state
         self.props.register_session = True
 
-        self.add_main_option(
-            'version',
-            ord('V'),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.NONE,
-            _("Show the application's version"))
-
-        self.add_main_option(
-            'quiet',
-            ord('q'),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.NONE,
-            _('Show only critical errors'))
-
-        self.add_main_option(
-            'separate',
-            ord('s'),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.NONE,
-            _('Separate profile files completely '
-              '(even history database and plugins)'))
-
-        self.add_main_option(
-            'verbose',
-            ord('v'),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.NONE,
-            _('Print XML stanzas and other debug information'))
-
-        self.add_main_option(
-            'profile',
-            ord('p'),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.STRING,
-            _('Use defined profile in configuration directory'),
-            'NAME')
-
-        self.add_main_option(
-            'config-path',
-            ord('c'),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.STRING,
-            _('Set configuration directory'),
-            'PATH')
-
-        self.add_main_option(
-            'loglevel',
-            ord('l'),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.STRING,
-            _('Configure logging system'),
-            'LEVEL')
-
-        self.add_main_option(
-            'warnings',
-            ord('w'),
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.NONE,
-            _('Show all warnings'))
-
-        self.add_main_option(
-            'gdebug',
-            0,
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.NONE,
-            _('Sets an environment variable so '
-              'GLib debug messages are printed'))
-
-        self.add_main_option(
-            'cprofile',
-            0,
-            GLib.OptionFlags.NONE,
-            GLib.OptionArg.NONE,
-            _('Profile application with cprofile'))
+        self._add_core_options()
 
         self.add_main_option(
             'start-chat', 0,
@@ -225,7 +153,8 @@ def _startup(self) -> None:
             # to render colored emoji glyphs
             os.environ['PANGOCAIRO_BACKEND'] = 'fontconfig'
 
-        self._init_core()
+        with timeline.phase('Init core'):
+            self._init_core()
 
         icon_theme = Gtk.IconTheme.get_default()
         icon_theme.append_search_path(str(configpaths.get('ICONS')))
@@ -244,10 +173,11 @@ def _startup(self) -> None:
         idle.Monitor.set_interval(app.settings.get('autoawaytime') * 60,
                                   app.settings.get('autoxatime') * 60)
 
-        from gajim.gui_interface import Interface
+        with timeline.phase('Interface'):
+            from gajim.gui_interface import Interface
 
-        self.interface = Interface()
-        self.interface.run(self)
+            self.interface = Interface()
+            self.interface.run(self)
 
         from gajim.gui.status_icon import StatusIcon
         self.systray = StatusIcon()
@@ -265,11 +195,18 @@ def _startup(self) -> None:
                             ged.CORE,
                             self._on_feature_discovered)
 
-        from gajim.gui.main import MainWindow
-        MainWindow()
+        with timeline.phase('Main window'):
+            from gajim.gui.main import MainWindow
+            MainWindow()
 
+        # Idle sources run after the first frame has been drawn
+        GLib.idle_add(self._on_startup_finished)
         GLib.timeout_add(100, self._auto_connect)
 
+    def _on_startup_finished(self) -> bool:
+        self._finish_startup_timeline()
+        return False
+
     def _open_uris(self, uris: list[str]) -> None:
         accounts = app.settings.get_active_accounts()
         if not accounts:
@@ -324,6 +261,10 @@ def _open_uris(self, uris: list[str]) -> None:
 
                 app.window.start_chat_from_jid(accounts[0], jid, message)
 
+    def start_shutdown(self, *args: Any, **kwargs: Any) -> None:
+        self.systray.shutdown()
+        CoreApplication.start_shutdown(self, *args, **kwargs)
+
     def _shutdown(self, _application: GajimApplication) -> None:
         self._shutdown_core()
 
@@ -381,7 +322,8 @@ def _handle_local_options(self,
             return -1
 
         self._core_command_line(options)
-        self._startup()
+        with timeline.phase('Startup'):
+            self._startup()
         return -1
 
     def _add_app_actions(self) -> None:
@@ -403,6 +345,7 @@ def _connect_app_actions(self) -> None:
             ('preferences', self._on_preferences_action),
             ('plugins', self._on_plugins_action),
             ('xml-console', self._on_xml_console_action),
+            ('stanza-metrics', self._on_stanza_metrics_action),
             ('file-transfer', self._on_file_transfer_action),
             ('shortcuts', self._on_shortcuts_action),
             ('features', self._on_features_action),
@@ -545,7 +488,7 @@ def create_account(self,
         # Action must be added before account window is updated
         self.add_account_actions(account)
 
-        window = cast(AccountsWindow, get_app_window('AccountsWindow'))
+        window = cast('AccountsWindow', get_app_window('AccountsWindow'))
         if window is not None:
             window.add_account(account)
 
@@ -553,7 +496,7 @@ def enable_account(self, account: str) -> None:
         CoreApplication.enable_account(self, account)
         menus.build_accounts_menu()
         self.update_app_actions_state()
-        window = cast(AccountsWindow, get_app_window('AccountsWindow'))
+        window = cast('AccountsWindow', get_app_window('AccountsWindow'))
         if window is not None:
             window.enable_account(account, True)
 
@@ -575,7 +518,7 @@ def remove_account(self, account: str) -> None:
 
         self.remove_account_actions(account)
 
-        window = cast(AccountsWindow, get_app_window('AccountsWindow'))
+        window = cast('AccountsWindow', get_app_window('AccountsWindow'))
         if window is not None:
             window.remove_account(account)
 
@@ -645,6 +588,7 @@ def _on_services_action(_action: Gio.SimpleAction,
         if server_jid in disco:
             disco[server_jid].window.present()
         else:
+            from gajim.gui.discovery import ServiceDiscoveryWindow
             try:
                 # Object will add itself to the window dict
                 ServiceDiscoveryWindow(account, address_entry=True)
@@ -716,6 +660,11 @@ def _on_xml_console_action(_action: Gio.SimpleAction,
                                _param: Optional[GLib.Variant]) -> None:
         open_window('XMLConsoleWindow')
 
+    @staticmethod
+    def _on_stanza_metrics_action(_action: Gio.SimpleAction,
+                                  _param: Optional[GLib.Variant]) -> None:
+        open_window('StanzaMetricsWindow')
+
     @staticmethod
     def _on_manage_proxies_action(_action: Gio.SimpleAction,
                                   _param: Optional[GLib.Variant]) -> None:
@@ -744,6 +693,7 @@ def _on_faq_action(_action: Gio.SimpleAction,
     @staticmethod
     def _on_shortcuts_action(_action: Gio.SimpleAction,
                              _param: Optional[GLib.Variant]) -> None:
+        from gajim.gui.dialogs import ShortcutsWindow
         ShortcutsWindow()
 
     @staticmethod
@@ -754,6 +704,7 @@ def _on_features_action(_action: Gio.SimpleAction,
     @staticmethod
     def _on_about_action(_action: Gio.SimpleAction,
                          _param: Optional[GLib.Variant]) -> None:
+        from gajim.gui.about import AboutDialog
         AboutDialog()
 
     @staticmethod
@@ -844,7 +795,7 @@ def _on_forget_groupchat_action(_action: Gio.SimpleAction,
                                     params: structs.AccountJidParam
                                     ) -> None:
 
-        window = cast(StartChatDialog, get_app_window('StartChatDialog'))
+        window = cast('StartChatDialog', get_app_window('StartChatDialog'))
         window.remove_row(params.account, str(params.jid))
 
         client = app.get_client(params.account)
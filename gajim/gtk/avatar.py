@@ -18,11 +18,9 @@
 from typing import Union
 
 import logging
-import hashlib
 from math import pi
 import functools
 from collections import defaultdict
-from pathlib import Path
 
 from gi.repository import Gdk
 from gi.repository import GdkPixbuf
@@ -33,11 +31,11 @@
 
 from gajim.common import types
 from gajim.common import app
-from gajim.common import configpaths
 from gajim.common.helpers import Singleton
 from gajim.common.helpers import get_groupchat_name
 from gajim.common.const import AvatarSize
 from gajim.common.const import StyleAttr
+from gajim.common.storage.avatar import AvatarFileStorage
 
 from .const import DEFAULT_WORKSPACE_COLOR
 from .util import get_contact_color
@@ -344,7 +342,7 @@ def convert_to_greyscale(surface: cairo.ImageSurface) -> cairo.ImageSurface:
     return context.get_target()
 
 
-class AvatarStorage(metaclass=Singleton):
+class AvatarStorage(AvatarFileStorage, metaclass=Singleton):
     def __init__(self):
         self._cache: AvatarCacheT = defaultdict(dict)
 
@@ -501,38 +499,6 @@ def _load_for_publish(path: str) -> Optional[tuple[bool, bytes]]:
         assert pixbuf is not None
         return pixbuf.save_to_bufferv('png', [], [])
 
-    @staticmethod
-    def save_avatar(data: bytes) -> Optional[str]:
-        '''
-        Save an avatar to the harddisk
-
-        :param data:  bytes
-
-        returns SHA1 value of the avatar or None on error
-        '''
-        if data is None:
-            return None
-
-        sha = hashlib.sha1(data).hexdigest()
-        path = configpaths.get('AVATAR') / sha
-        try:
-            with open(path, 'wb') as output_file:
-                output_file.write(data)
-        except Exception:
-            log.error('Storing avatar failed', exc_info=True)
-            return None
-        return sha
-
-    @staticmethod
-    def get_avatar_path(filename: str) -> Optional[Path]:
-        path = configpaths.get('AVATAR') / filename
-        if not path.is_file():
-            return None
-        return path
-
-    def avatar_exists(self, filename: str) -> bool:
-        return self.get_avatar_path(filename) is not None
-
     def surface_from_filename(self,
                               filename: str,
                               size: int,
@@ -28,7 +28,7 @@
 from gajim.common.const import Direction
 from gajim.common.modules.contacts import GroupchatContact
 
-from .emoji_data_gtk import get_emoji_data
+from .emoji_data_gtk import get_emoji_index
 from .groupchat_nick_completion import GroupChatNickCompletion
 from .menus import escape_mnemonic
 
@@ -237,25 +237,18 @@ def _update_emoji_menu(self,
                            start: Gtk.TextIter
                            ) -> None:
         self._menu.remove_all()
-        emoji_data = get_emoji_data()
-
-        for keyword, entries in emoji_data.items():
-            for short_name in entries.keys():
-                if not keyword.startswith(action_text):
-                    continue
-                emoji = entries[short_name]
-                label = f'{emoji} {short_name}'
-                if keyword != short_name:
-                    label += f'  [{keyword}]'
-                action_data = GLib.Variant('s', emoji)
-                menu_item = Gio.MenuItem()
-                menu_item.set_label(escape_mnemonic(label))
-                menu_item.set_attribute_value('action-data', action_data)
-                self._menu.append_item(menu_item)
-                if self._menu.get_n_items() >= MENUS_MAX_ENTRIES:
-                    break
-            if self._menu.get_n_items() >= MENUS_MAX_ENTRIES:
-                break
+        emoji_index = get_emoji_index()
+
+        for keyword, short_name, emoji in emoji_index.search(
+                action_text, MENUS_MAX_ENTRIES):
+            label = f'{emoji} {short_name}'
+            if keyword != short_name:
+                label += f'  [{keyword}]'
+            action_data = GLib.Variant('s', emoji)
+            menu_item = Gio.MenuItem()
+            menu_item.set_label(escape_mnemonic(label))
+            menu_item.set_attribute_value('action-data', action_data)
+            self._menu.append_item(menu_item)
 
         if self._menu.get_n_items() > 0:
             self._show_menu(start)
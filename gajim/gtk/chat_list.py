@@ -90,6 +90,16 @@ def __init__(self, workspace_id: str) -> None:
         self._drag_row: Optional[ChatListRow] = None
         self._chat_order: list[ChatListRow] = []
 
+        # Rows which changed since the last main loop iteration, they are
+        # re-sorted once per iteration
+        self._changed_rows: set[ChatListRow] = set()
+        self._changed_source_id: Optional[int] = None
+
+        # Rows which were not visible during the last timestamp update
+        self._stale_time_rows: set[ChatListRow] = set()
+        self._vadjustment: Optional[Gtk.Adjustment] = None
+        self._vadjustment_handler_id: Optional[int] = None
+
         self.register_events([
             ('account-enabled', ged.GUI2, self._on_account_changed),
             ('account-disabled', ged.GUI2, self._on_account_changed),
@@ -97,9 +107,11 @@ def __init__(self, workspace_id: str) -> None:
         ])
 
         self.connect('drag-data-received', self._on_drag_data_received)
+        self.connect('map', self._on_map)
         self.connect('destroy', self._on_destroy)
 
-        self._timer_id = GLib.timeout_add_seconds(60, self._update_time)
+        self._timer_id: Optional[int] = None
+        self._schedule_time_update()
 
         self.show_all()
 
@@ -291,6 +303,8 @@ def remove_chat(self,
         row = self._chats.pop((account, jid))
         if row.is_pinned:
             self._chat_order.remove(row)
+        self._changed_rows.discard(row)
+        self._stale_time_rows.discard(row)
         self.remove(row)
         row.destroy()
         if emit_unread:
@@ -438,9 +452,105 @@ def _change_pinned_order(self, row_before: Optional[ChatListRow]) -> None:
         self.emit('chat-order-changed')
         self.invalidate_sort()
 
+    def _schedule_time_update(self) -> None:
+        # Relative timestamps change on minute boundaries
+        delay = 60 - time.time() % 60
+        self._timer_id = GLib.timeout_add(int(delay * 1000) + 10,
+                                          self._update_time)
+
     def _update_time(self) -> bool:
-        for _key, row in self._chats.items():
-            row.update_time()
+        self._connect_vadjustment()
+        for row in self._chats.values():
+            if self._is_row_on_screen(row):
+                row.update_time()
+                self._stale_time_rows.discard(row)
+            else:
+                self._stale_time_rows.add(row)
+
+        self._schedule_time_update()
+        return False
+
+    def _update_stale_time_rows(self) -> None:
+        for row in list(self._stale_time_rows):
+            if self._is_row_on_screen(row):
+                row.update_time()
+                self._stale_time_rows.discard(row)
+
+    def _connect_vadjustment(self) -> None:
+        if self._vadjustment is not None:
+            return
+
+        scrolled = self.get_ancestor(Gtk.ScrolledWindow)
+        if scrolled is None:
+            return
+
+        self._vadjustment = cast(Gtk.ScrolledWindow,
+                                 scrolled).get_vadjustment()
+        self._vadjustment_handler_id = self._vadjustment.connect(
+            'value-changed', self._on_scrolled)
+
+    def _on_scrolled(self, _adjustment: Gtk.Adjustment) -> None:
+        if self._stale_time_rows and self.get_mapped():
+            self._update_stale_time_rows()
+
+    def _on_map(self, _widget: Gtk.Widget) -> None:
+        if self._stale_time_rows:
+            self._update_stale_time_rows()
+
+    def _is_row_on_screen(self, row: ChatListRow) -> bool:
+        if not row.get_mapped() or not row.get_child_visible():
+            return False
+
+        viewport = self.get_ancestor(Gtk.Viewport)
+        if viewport is None:
+            return True
+
+        coords = row.translate_coordinates(viewport, 0, 0)
+        if coords is None:
+            return False
+
+        _x, y = coords
+        return (y + row.get_allocated_height() > 0 and
+                y < viewport.get_allocated_height())
+
+    def _queue_row_changed(self, row: ChatListRow) -> None:
+        self._changed_rows.add(row)
+        if self._changed_source_id is None:
+            self._changed_source_id = GLib.idle_add(
+                self._process_changed_rows,
+                priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _process_changed_rows(self) -> bool:
+        self._changed_source_id = None
+        rows = self._changed_rows
+        self._changed_rows = set()
+        unsorted_rows = [row for row in rows if not self._is_sorted(row)]
+        if not unsorted_rows:
+            return False
+
+        if len(rows) == 1:
+            # Re-sorts only this row (binary insertion) and updates the
+            # headers around it. The binary insertion is only correct if
+            # all other rows are sorted.
+            unsorted_rows[0].changed()
+        else:
+            self.invalidate_sort()
+        return False
+
+    def _is_sorted(self, row: ChatListRow) -> bool:
+        index = row.get_index()
+        if index == -1:
+            return True
+
+        before = self.get_row_at_index(index - 1)
+        if before is not None:
+            if self._sort_func(cast(ChatListRow, before), row) > 0:
+                return False
+
+        after = self.get_row_at_index(index + 1)
+        if after is not None:
+            if self._sort_func(row, cast(ChatListRow, after)) > 0:
+                return False
         return True
 
     def _filter_func(self, row: ChatListRow) -> bool:
@@ -550,7 +660,10 @@ def _add_unread(row: ChatListRow, event: MessageEventT) -> None:
                 control.get_autoscroll()):
             return
 
-        row.add_unread(event.msgtxt)
+        needs_highlight = None
+        if isinstance(event, events.GcMessageReceived):
+            needs_highlight = event.needs_highlight
+        row.add_unread(event.msgtxt, needs_highlight)
 
     def _on_message_received(self, event: MessageEventT) -> None:
         if not event.msgtxt:
@@ -573,7 +686,7 @@ def _on_message_received(self, event: MessageEventT) -> None:
             additional_data=event.additional_data)
 
         self._add_unread(row, event)
-        row.changed()
+        self._queue_row_changed(row)
 
     def _on_message_updated(self, event: events.MessageUpdated) -> None:
         row = self._chats.get((event.account, JID.from_string(event.jid)))
@@ -619,7 +732,7 @@ def _on_message_sent(self, event: events.MessageSent) -> None:
             event.message,
             nickname=app.nicks[event.account],
             additional_data=event.additional_data)
-        row.changed()
+        self._queue_row_changed(row)
 
     def _on_presence_received(self, event: events.PresenceReceived) -> None:
         row = self._chats.get((event.account, JID.from_string(event.jid)))
@@ -665,4 +778,15 @@ def _on_bookmarks_received(self, _event: events.BookmarksReceived) -> None:
             row.update_name()
 
     def _on_destroy(self, _widget: Gtk.Widget) -> None:
-        GLib.source_remove(self._timer_id)
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+        if self._changed_source_id is not None:
+            GLib.source_remove(self._changed_source_id)
+            self._changed_source_id = None
+        if self._vadjustment is not None:
+            assert self._vadjustment_handler_id is not None
+            self._vadjustment.disconnect(self._vadjustment_handler_id)
+            self._vadjustment = None
+        self._changed_rows.clear()
+        self._stale_time_rows.clear()
@@ -327,7 +327,11 @@ def update_time(self) -> None:
         self._ui.timestamp_label.set_text(
             get_uf_relative_time(self.timestamp))
 
-    def add_unread(self, text: str) -> None:
+    def add_unread(self,
+                   text: str,
+                   needs_highlight: Optional[bool] = None
+                   ) -> None:
+
         self._unread_count += 1
         self._update_unread()
         app.storage.cache.set_unread_count(
@@ -338,10 +342,11 @@ def add_unread(self, text: str) -> None:
             self.timestamp)
 
         if self.contact.is_groupchat:
-            needs_highlight = message_needs_highlight(
-                text,
-                self.contact.nickname,
-                self._client.get_own_jid().bare)
+            if needs_highlight is None:
+                needs_highlight = message_needs_highlight(
+                    text,
+                    self.contact.nickname,
+                    self._client.get_own_jid().bare)
             if needs_highlight:
                 self._needs_muc_highlight = True
                 self._ui.unread_label.get_style_context().remove_class(
@@ -248,8 +248,9 @@ def _move_chat_to_workspace(self,
         new_chatlist = self.get_chatlist(workspace_id)
         new_chatlist.add_chat(params.account, params.jid, type_, False, -1)
 
-        self.store_open_chats(source_chatlist.workspace_id)
-        self.store_open_chats(workspace_id)
+        with app.settings.batch():
+            self.store_open_chats(source_chatlist.workspace_id)
+            self.store_open_chats(workspace_id)
 
     @structs.actionmethod
     def _mark_as_read(self,
@@ -297,9 +298,10 @@ def _remove() -> None:
             transient_for=app.window).show()
 
     def remove_chats_for_account(self, account: str) -> None:
-        for workspace_id, chat_list in self._chat_lists.items():
-            chat_list.remove_chats_for_account(account)
-            self.store_open_chats(workspace_id)
+        with app.settings.batch():
+            for workspace_id, chat_list in self._chat_lists.items():
+                chat_list.remove_chats_for_account(account)
+                self.store_open_chats(workspace_id)
 
     def find_chat(self, account: str, jid: JID) -> Optional[ChatList]:
         for chat_list in self._chat_lists.values():
@@ -152,6 +152,10 @@ def _on_chat_selected(self,
 
         self._chat_stack.show_chat(account, jid)
 
+        # Join the group chat next if it is still waiting for autojoin
+        client = app.get_client(account)
+        client.get_module('MUCJoinScheduler').prioritize(jid)
+
         if self._search_revealer.get_reveal_child():
             self._search_view.set_context(account, jid)
 
@@ -188,9 +188,11 @@ def show_chat(self, account: str, jid: JID) -> None:
 
         if self._current_contact is not None:
             self._current_contact.disconnect_all_from_obj(self)
+            self._set_chatstates_visible(self._current_contact, False)
 
         client = app.get_client(account)
         self._current_contact = client.get_module('Contacts').get_contact(jid)
+        self._set_chatstates_visible(self._current_contact, True)
 
         app.preview_manager.clear_previews()
 
@@ -416,9 +418,8 @@ def _issue_notification(self, event: events.MessageReceived) -> None:
         if isinstance(contact, GroupchatContact):
             msg_type = 'group-chat-message'
             title += f' {event.resource} ({contact.name})'
-            assert contact.nickname is not None
-            needs_highlight = helpers.message_needs_highlight(
-                text, contact.nickname, client.get_own_jid().bare)
+            needs_highlight = (isinstance(event, events.GcMessageReceived) and
+                               event.needs_highlight)
             if needs_highlight:
                 sound = 'muc_message_highlight'
             else:
@@ -782,9 +783,23 @@ def _close_control(self) -> None:
                          [self._current_contact.account,
                           str(self._current_contact.jid)]))
 
+    @staticmethod
+    def _set_chatstates_visible(contact: ChatContactT,
+                                visible: bool
+                                ) -> None:
+        if not isinstance(contact, GroupchatContact):
+            return
+
+        client = app.connections.get(contact.account)
+        if client is None:
+            # Account was removed
+            return
+        client.get_module('Chatstate').set_room_visible(contact.jid, visible)
+
     def clear(self) -> None:
         if self._current_contact is not None:
             self._current_contact.disconnect_all_from_obj(self)
+            self._set_chatstates_visible(self._current_contact, False)
 
         self.set_visible_child_name('empty')
         self._chat_banner.clear()
@@ -149,6 +149,7 @@ def __str__(self):
     'ServiceDiscoveryWindow': 'gajim.gui.discovery',
     'ServiceRegistration': 'gajim.gui.service_registration',
     'SSLErrorDialog': 'gajim.gui.ssl_error_dialog',
+    'StanzaMetricsWindow': 'gajim.gui.stanza_metrics',
     'StartChatDialog': 'gajim.gui.start_chat',
     'SynchronizeAccounts': 'gajim.gui.synchronize_accounts',
     'Themes': 'gajim.gui.themes',
@@ -178,6 +179,7 @@ def __str__(self):
     ('remove-history', 'a{sv}'),
     ('shortcuts', None),
     ('show', None),
+    ('stanza-metrics', None),
     ('start-chat', 'as'),
     ('open-chat', 'as'),
     ('xml-console', None),
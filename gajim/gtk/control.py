@@ -371,7 +371,8 @@ def _on_gc_message_received(self, event: events.GcMessageReceived) -> None:
                                  message_id=event.properties.id,
                                  stanza_id=event.stanza_id,
                                  msg_log_id=event.msg_log_id,
-                                 additional_data=event.additional_data)
+                                 additional_data=event.additional_data,
+                                 needs_highlight=event.needs_highlight)
 
     def _on_message_updated(self, event: events.MessageUpdated) -> None:
         if not self._is_event_processable(event):
@@ -545,7 +546,8 @@ def _add_message(self,
                      msg_log_id: Optional[int] = None,
                      message_id: Optional[str] = None,
                      stanza_id: Optional[str] = None,
-                     additional_data: Optional[AdditionalDataDict] = None
+                     additional_data: Optional[AdditionalDataDict] = None,
+                     needs_highlight: Optional[bool] = None
                      ) -> None:
 
         if additional_data is None:
@@ -561,7 +563,8 @@ def _add_message(self,
                 message_id=message_id,
                 stanza_id=stanza_id,
                 log_line_id=msg_log_id,
-                additional_data=additional_data)
+                additional_data=additional_data,
+                needs_highlight=needs_highlight)
 
             if not self._scrolled_view.get_autoscroll():
                 if kind == 'outgoing':
@@ -1194,6 +1197,7 @@ def add_muc_message(self,
                         stanza_id: Optional[str] = None,
                         msg_log_id: Optional[int] = None,
                         additional_data: Optional[AdditionalDataDict] = None,
+                        needs_highlight: Optional[bool] = None
                         ) -> None:
 
         assert isinstance(self._contact, GroupchatContact)
@@ -1212,7 +1216,8 @@ def add_muc_message(self,
                           message_id=message_id,
                           stanza_id=stanza_id,
                           msg_log_id=msg_log_id,
-                          additional_data=additional_data)
+                          additional_data=additional_data,
+                          needs_highlight=needs_highlight)
 
     def _on_room_subject(self,
                          contact: GroupchatContact,
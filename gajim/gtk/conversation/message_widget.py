@@ -20,11 +20,11 @@
 
 from gi.repository import Gtk
 
-from gajim.common.styling import process
 from gajim.common.styling import ParsingResult
 from gajim.common.styling import PlainBlock
 from gajim.common.styling import PreBlock
 from gajim.common.styling import QuoteBlock
+from gajim.common.styling import parsing_cache
 
 from .code_widget import CodeWidget
 from .quote_widget import QuoteWidget
@@ -64,7 +64,7 @@ def add_with_styling(self,
             self._add_action_phrase(text, nickname)
             return
 
-        result = process(text)
+        result = parsing_cache.process(text)
         self.add_content(result)
 
     def _add_action_phrase(self, text: str, nickname: str):
@@ -26,7 +26,7 @@
 from gajim.common.structs import URIType
 from gajim.common.styling import BaseHyperlink
 from gajim.common.styling import PlainBlock
-from gajim.common.styling import process_uris
+from gajim.common.styling import parsing_cache
 
 from ..menus import get_conv_action_context_menu
 from ..menus import populate_uri_context_menu
@@ -115,7 +115,7 @@ def print_text_with_styling(self, block: PlainBlock) -> None:
 
     def add_action_phrase(self, text: str, nickname: str) -> None:
         text = text.replace('/me', f'* {nickname}', 1)
-        uris = process_uris(text)
+        uris = parsing_cache.process_uris(text)
         text = self._build_link_markup(text, uris)
         self.set_markup(f'<i>{text}</i>')
 
@@ -74,7 +74,8 @@ def __init__(self,
                  display_marking: Optional[Displaymarking] = None,
                  marker: Optional[str] = None,
                  error: Union[CommonError, StanzaError, None] = None,
-                 log_line_id: Optional[int] = None) -> None:
+                 log_line_id: Optional[int] = None,
+                 needs_highlight: Optional[bool] = None) -> None:
 
         BaseRow.__init__(self, account)
         self.type = 'chat'
@@ -131,7 +132,7 @@ def __init__(self,
                 our_nick = get_group_chat_nick(
                     self._account, self._contact.jid)
                 if name != our_nick:
-                    self._check_for_highlight(text)
+                    self._check_for_highlight(text, needs_highlight)
 
         if self._contact.jid == self._client.get_own_jid().bare:
             name = _('Me')
@@ -231,15 +232,21 @@ def _add_security_label(self,
             display_marking_label.set_markup(label_text)
             self._meta_box.add(display_marking_label)
 
-    def _check_for_highlight(self, text: str) -> None:
+    def _check_for_highlight(self,
+                             text: str,
+                             needs_highlight: Optional[bool]
+                             ) -> None:
+
         assert isinstance(self._contact, GroupchatContact)
-        if self._contact.nickname is None:
-            return
+        if needs_highlight is None:
+            if self._contact.nickname is None:
+                return
+
+            needs_highlight = message_needs_highlight(
+                text,
+                self._contact.nickname,
+                self._client.get_own_jid().bare)
 
-        needs_highlight = message_needs_highlight(
-            text,
-            self._contact.nickname,
-            self._client.get_own_jid().bare)
         if needs_highlight:
             self.get_style_context().add_class(
                 'gajim-mention-highlight')
@@ -28,6 +28,7 @@
 from datetime import timedelta
 
 from gi.repository import Gdk
+from gi.repository import GLib
 from gi.repository import Gtk
 from gi.repository import GObject
 from gi.repository import Gio
@@ -124,6 +125,11 @@ def __init__(self) -> None:
         self._read_marker_row = None
         self._scroll_hint_row = None
 
+        # Receipts and markers are applied once per frame
+        self._pending_receipts: set[str] = set()
+        self._pending_read_markers: set[str] = set()
+        self._marker_update_id: Optional[int] = None
+
         self._current_upper: float = 0
         self._autoscroll: bool = True
         self._request_history_at_upper: Optional[float] = None
@@ -275,6 +281,8 @@ def _reset(self) -> None:
         self._message_id_row_map = {}
         self._read_marker_row = None
         self._scroll_hint_row = None
+        self._pending_receipts.clear()
+        self._pending_read_markers.clear()
 
     def reset(self) -> None:
         assert self._contact is not None
@@ -504,7 +512,8 @@ def add_message(self,
                     display_marking: Optional[Displaymarking] = None,
                     additional_data: Optional[AdditionalDataDict] = None,
                     marker: Optional[str] = None,
-                    error: Union[CommonError, StanzaError, None] = None
+                    error: Union[CommonError, StanzaError, None] = None,
+                    needs_highlight: Optional[bool] = None
                     ) -> None:
 
         if not timestamp:
@@ -523,7 +532,8 @@ def add_message(self,
             display_marking=display_marking,
             marker=marker,
             error=error,
-            log_line_id=log_line_id)
+            log_line_id=log_line_id,
+            needs_highlight=needs_highlight)
 
         if message_id is not None:
             self._message_id_row_map[message_id] = message_row
@@ -724,17 +734,43 @@ def set_read_marker(self, id_: str) -> None:
         if id_ is None:
             return
 
-        row = self._get_row_by_message_id(id_)
-        if row is None:
-            return
+        self._pending_read_markers.add(id_)
+        self._queue_marker_update()
 
-        row.set_displayed()
-        assert self._read_marker_row is not None
-        timestamp = row.timestamp + timedelta(microseconds=1)
-        if self._read_marker_row.timestamp > timestamp:
+    def _queue_marker_update(self) -> None:
+        if self._marker_update_id is not None:
             return
 
-        self._read_marker_row.set_timestamp(timestamp)
+        self._marker_update_id = GLib.idle_add(
+            self._update_markers, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _update_markers(self) -> bool:
+        self._marker_update_id = None
+
+        for id_ in self._pending_receipts:
+            message_row = self._get_row_by_message_id(id_)
+            if message_row is not None:
+                message_row.set_receipt()
+        self._pending_receipts.clear()
+
+        # Moving the read marker resorts the list, only move it once
+        latest: Optional[datetime] = None
+        for id_ in self._pending_read_markers:
+            row = self._get_row_by_message_id(id_)
+            if row is None:
+                continue
+            row.set_displayed()
+            if latest is None or row.timestamp > latest:
+                latest = row.timestamp
+        self._pending_read_markers.clear()
+
+        if latest is None or self._read_marker_row is None:
+            return False
+
+        timestamp = latest + timedelta(microseconds=1)
+        if self._read_marker_row.timestamp <= timestamp:
+            self._read_marker_row.set_timestamp(timestamp)
+        return False
 
     def update_avatars(self) -> None:
         for row in cast(list[BaseRow], self._list_box.get_children()):
@@ -758,9 +794,8 @@ def show_message_retraction(self, stanza_id: str, text: str) -> None:
             message_row.set_retracted(text)
 
     def show_receipt(self, id_: str) -> None:
-        message_row = self._get_row_by_message_id(id_)
-        if message_row is not None:
-            message_row.set_receipt()
+        self._pending_receipts.add(id_)
+        self._queue_marker_update()
 
     def show_error(self, id_: str, error: StanzaError) -> None:
         message_row = self._get_row_by_message_id(id_)
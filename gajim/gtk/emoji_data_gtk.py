@@ -14,14 +14,22 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+from typing import Any
+from typing import NamedTuple
 from typing import Optional
 
+import json
 import logging
+import os
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
 
 from gi.repository import Gio
 from gi.repository import GLib
+from gi.repository import Gtk
 
+from gajim.common import configpaths
 from gajim.common.i18n import _
 from gajim.common.i18n import get_default_lang
 from gajim.common.i18n import get_short_lang_code
@@ -32,6 +40,9 @@
 
 REPLACEMENT_CHARACTER = 0xFFFD
 
+# Increase if the format of the parsed data changes
+CACHE_VERSION = 1
+
 SKIN_TONE_MODIFIERS = {
     # The descriptions differ slightly from the official short names, see:
     # https://github.com/unicode-org/cldr/blob/main/common/annotations/en.xml
@@ -84,7 +95,17 @@ def get_emoji_data() -> dict[str, dict[str, str]]:
 
     Short names are included among keywords.
     '''
-    return emoji_data
+    return get_emoji_index().data
+
+
+def get_emoji_index() -> EmojiIndex:
+    '''
+    Returns the emoji index, it is loaded on first use
+    '''
+    global _emoji_index  # pylint: disable=global-statement
+    if _emoji_index is None:
+        _emoji_index = EmojiIndex(load_emoji_data())
+    return _emoji_index
 
 
 def try_load_raw_emoji_data(locale: str) -> Optional[GLib.Bytes]:
@@ -192,20 +213,132 @@ def get_locale_fallbacks(desired: str) -> list[str]:
     return result
 
 
-app_locale = get_default_lang()
-log.info('Loading emoji data; application locale is %s', app_locale)
-locales = get_locale_fallbacks(app_locale)
-try:
-    log.debug('Trying locales %s', locales)
-    raw_emoji_data: Optional[GLib.Bytes] = None
-    for loc in locales:
-        raw_emoji_data = try_load_raw_emoji_data(loc)
-        if raw_emoji_data:
-            break
-    if not raw_emoji_data:
-        raise RuntimeError(f'No resource could be loaded; tried {locales}')
-
-    emoji_data = parse_emoji_data(raw_emoji_data)
-except Exception as err:
-    log.warning('Unable to load emoji data: %s', err)
-    emoji_data = {}
+class EmojiMatch(NamedTuple):
+    keyword: str
+    short_name: str
+    emoji: str
+
+
+class EmojiIndex:
+    '''
+    Keywords sorted by code point, which allows to find all keywords
+    starting with a prefix by binary search
+    '''
+
+    def __init__(self, data: dict[str, dict[str, str]]) -> None:
+        self.data = data
+        # Data is sorted already, sorting again is cheap
+        self._keywords = sorted(data)
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def search(self, prefix: str, limit: int) -> list[EmojiMatch]:
+        '''
+        Returns up to `limit` emojis with a keyword starting with `prefix`,
+        `prefix` is expected to be casefolded
+        '''
+        matches: list[EmojiMatch] = []
+        index = bisect_left(self._keywords, prefix)
+        while len(matches) < limit and index < len(self._keywords):
+            keyword = self._keywords[index]
+            if not keyword.startswith(prefix):
+                break
+
+            for short_name, emoji in self.data[keyword].items():
+                matches.append(EmojiMatch(keyword, short_name, emoji))
+                if len(matches) >= limit:
+                    break
+            index += 1
+
+        return matches
+
+
+def get_gtk_version() -> str:
+    return '%s.%s.%s' % (Gtk.get_major_version(),
+                         Gtk.get_minor_version(),
+                         Gtk.get_micro_version())
+
+
+def get_cache_path(locale: str) -> Optional[Path]:
+    try:
+        cache_dir = configpaths.get('MY_CACHE')
+    except KeyError:
+        # Paths are not initialized, e.g. in scripts
+        return None
+    return cache_dir / f'emoji_data_{locale}_{get_gtk_version()}.json'
+
+
+def load_cached_emoji_data(path: Path,
+                           locale: str
+                           ) -> Optional[dict[str, dict[str, str]]]:
+    try:
+        with path.open(encoding='utf8') as file:
+            cache: dict[str, Any] = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as error:
+        log.warning('Unable to read emoji data cache: %s', error)
+        return None
+
+    if (cache.get('version') != CACHE_VERSION or
+            cache.get('gtk_version') != get_gtk_version() or
+            cache.get('locale') != locale):
+        log.info('Emoji data cache is outdated')
+        return None
+
+    return cache['data']
+
+
+def store_emoji_data(path: Path,
+                     locale: str,
+                     data: dict[str, dict[str, str]]) -> None:
+
+    cache = {
+        'version': CACHE_VERSION,
+        'gtk_version': get_gtk_version(),
+        'locale': locale,
+        'data': data,
+    }
+
+    temp_path = path.with_name(f'{path.name}.tmp')
+    try:
+        with temp_path.open('w', encoding='utf8') as file:
+            json.dump(cache, file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, path)
+    except OSError as error:
+        log.warning('Unable to write emoji data cache: %s', error)
+
+
+def load_emoji_data(use_cache: bool = True) -> dict[str, dict[str, str]]:
+    app_locale = get_default_lang()
+    log.info('Loading emoji data; application locale is %s', app_locale)
+    locales = get_locale_fallbacks(app_locale)
+    try:
+        log.debug('Trying locales %s', locales)
+        raw_emoji_data: Optional[GLib.Bytes] = None
+        for locale in locales:
+            raw_emoji_data = try_load_raw_emoji_data(locale)
+            if raw_emoji_data:
+                break
+        if not raw_emoji_data:
+            raise RuntimeError(f'No resource could be loaded; tried {locales}')
+
+        cache_path = get_cache_path(locale) if use_cache else None
+        if cache_path is not None:
+            emoji_data = load_cached_emoji_data(cache_path, locale)
+            if emoji_data is not None:
+                log.info('Loaded emoji data from cache')
+                return emoji_data
+
+        emoji_data = parse_emoji_data(raw_emoji_data)
+        if cache_path is not None:
+            store_emoji_data(cache_path, locale, emoji_data)
+        return emoji_data
+
+    except Exception as err:
+        log.warning('Unable to load emoji data: %s', err)
+        return {}
+
+
+_emoji_index: Optional[EmojiIndex] = None
@@ -52,7 +52,6 @@
 from .app_side_bar import AppSideBar
 from .workspace_side_bar import WorkspaceSideBar
 from .main_stack import MainStack
-from .call_window import CallWindow
 from .chat_list import ChatList
 from .chat_list_row import ChatListRow
 from .chat_stack import ChatStack
@@ -64,6 +63,7 @@
 from .dialogs import InputDialog
 from .builder import get_builder
 from .filechoosers import FileSaveDialog
+from .notification import reset_message_notifications
 from .util import get_app_window
 from .util import resize_window
 from .util import restore_main_window_position
@@ -1045,6 +1045,7 @@ def mark_as_read(self,
                                                   include_silent=True)
 
         set_urgency_hint(self, False)
+        reset_message_notifications(account, jid)
         control = self.get_control()
         if control.has_active_chat():
             # Reset jump to bottom button unread counter
@@ -1252,6 +1253,9 @@ def _on_call_started(self, event: events.CallStarted) -> None:
         win = get_app_window('CallWindow')
         if win is not None:
             win.destroy()
+
+        # Loads GStreamer and Farstream, only import it when needed
+        from .call_window import CallWindow
         CallWindow(event.account, event.resource_jid)
 
     def _on_jingle_request(self, event: events.JingleRequestReceived) -> None:
@@ -52,6 +52,7 @@
 from gajim.common.helpers import allow_showing_notification
 from gajim.common.helpers import play_sound
 from gajim.common.ged import EventHelper
+from gajim.common.notification_aggregator import NotificationAggregator
 
 from .builder import get_builder
 from .util import add_css_to_widget
@@ -74,13 +75,15 @@
 }
 
 
-_notification_backend = None
+_notification_backend: Optional[NotificationBackend] = None
 
 
 class NotificationBackend(EventHelper):
     def __init__(self) -> None:
         EventHelper.__init__(self)
 
+        self._aggregator = NotificationAggregator(self._send)
+
         self.register_events([
             ('notification', ged.GUI2, self._on_notification),
             ('account-enabled', ged.GUI2, self._on_account_enabled)
@@ -92,13 +95,23 @@ def __init__(self) -> None:
 
     def _on_notification(self, event: events.Notification) -> None:
         if event.sound is not None:
-            play_sound(event.sound, event.account)
+            if self._aggregator.should_play_sound(event.sound):
+                play_sound(event.sound, event.account)
 
         if not allow_showing_notification(event.account):
             return
 
+        if event.type == 'incoming-message':
+            # Messages are grouped per chat to avoid notification storms
+            self._aggregator.add(event)
+            return
+
         self._send(event)
 
+    def reset_message_notifications(self, account: str, jid: JID) -> None:
+        # The next message starts a new group of messages
+        self._aggregator.remove(account, str(jid))
+
     def _on_account_enabled(self, event: events.AccountEnabled) -> None:
         client = app.get_client(event.account)
         client.connect_signal('state-changed', self._on_client_state_changed)
@@ -435,3 +448,8 @@ def get_notification_backend() -> NotificationBackend:
 def init() -> None:
     global _notification_backend  # pylint: disable=global-statement
     _notification_backend = get_notification_backend()
+
+
+def reset_message_notifications(account: str, jid: JID) -> None:
+    if _notification_backend is not None:
+        _notification_backend.reset_message_notifications(account, jid)
@@ -33,7 +33,6 @@
 from gajim.common.preview_helpers import get_icon_for_mime_type
 from gajim.common.types import GdkPixbufType
 
-from .preview_audio import AudioWidget
 from .builder import get_builder
 from .menus import get_preview_menu
 from .util import GajimPopover
@@ -176,6 +175,7 @@ def update(self, preview: Preview, data: Optional[GdkPixbufType]) -> None:
                     app.is_installed('GST') and
                     contains_audio_streams(preview.orig_path)):
                 self._ui.image_button.hide()
+                from .preview_audio import AudioWidget
                 audio_widget = AudioWidget(preview.orig_path)
                 self._ui.right_box.pack_end(audio_widget, False, True, 0)
                 self._ui.right_box.reorder_child(audio_widget, 1)
@@ -16,7 +16,9 @@
 
 from typing import Any
 from typing import Literal
+from typing import NamedTuple
 from typing import Optional
+from typing import Union
 
 import locale
 import logging
@@ -68,6 +70,16 @@ class Column(IntEnum):
     VISIBLE = 4
 
 
+class RowData(NamedTuple):
+    '''Values derived from a contact which are needed for filtering and
+    sorting, so the contact does not have to be resolved per row'''
+
+    name: str
+    search_name: str
+    sort_key: str
+    show: Union[PresenceShow, PresenceShowExt]
+
+
 class Roster(Gtk.ScrolledWindow, EventHelper):
     def __init__(self, account: str) -> None:
         Gtk.ScrolledWindow.__init__(self)
@@ -90,6 +102,17 @@ def __init__(self, account: str) -> None:
             JID, list[Gtk.TreeRowReference]] = defaultdict(list)
         self._group_refs: dict[str, Gtk.TreeRowReference] = {}
 
+        # Keyed by the value of the JID_OR_GROUP column
+        self._row_data: dict[str, RowData] = {}
+
+        # Contact updates are collected and drawn once per main loop
+        # iteration, this coalesces presence floods after reconnect
+        self._pending_updates: dict[JID, types.BareContact] = {}
+        self._update_source_id: Optional[int] = None
+
+        self._show_offline = app.settings.get('showoffline')
+        self._sort_by_show = app.settings.get('sort_by_show_in_roster')
+
         self._store = self._ui.contact_store
         self._store.set_sort_func(Column.TEXT, self._tree_compare_iters)
 
@@ -263,6 +286,8 @@ def _on_query_tooltip(self,
         return value
 
     def _on_setting_changed(self, *args: Any) -> None:
+        self._show_offline = app.settings.get('showoffline')
+        self._sort_by_show = app.settings.get('sort_by_show_in_roster')
         self._refilter()
 
     def _on_contact_info(self,
@@ -406,20 +431,39 @@ def _visible_func(self,
         if not model[iter_][Column.IS_CONTACT]:
             return True
 
-        return self._filter_string in model[iter_][Column.TEXT].lower()
+        data = self._row_data.get(model[iter_][Column.JID_OR_GROUP])
+        if data is None:
+            return True
+        return self._filter_string in data.search_name
 
-    def _get_contact_visible(self, contact: types.BareContact) -> bool:
+    def _is_row_visible(self, data: RowData) -> bool:
         if self._filter_enabled:
-            return self._filter_string in contact.name.lower()
+            return self._filter_string in data.search_name
 
-        if app.settings.get('showoffline'):
+        if self._show_offline:
             return True
 
-        if contact.show is PresenceShowExt.OFFLINE:
+        if data.show is PresenceShowExt.OFFLINE:
             return False
 
         return True
 
+    def _update_row_data(self, contact: types.BareContact) -> RowData:
+        name = contact.name
+        data = self._row_data.get(str(contact.jid))
+        if data is None or data.name != name:
+            search_name = name.lower()
+            data = RowData(name,
+                           search_name,
+                           locale.strxfrm(search_name),
+                           contact.show)
+
+        elif data.show != contact.show:
+            data = data._replace(show=contact.show)
+
+        self._row_data[str(contact.jid)] = data
+        return data
+
     def _set_model(self) -> None:
         self._roster.set_model(self._modelfilter)
 
@@ -447,7 +491,7 @@ def _enable_sort(self, enable: bool) -> None:
     def _initial_draw(self) -> None:
         for contact in self._client.get_module('Roster').iter_contacts():
             self._connect_contact_signals(contact)
-            self._add_or_update_contact(contact)
+            self._add_or_update_contact(contact, expand=False)
 
         self._enable_sort(True)
         self._set_model()
@@ -463,7 +507,26 @@ def _on_contact_update(self,
                            contact: types.BareContact,
                            _signal_name: str) -> None:
 
-        self._draw_contact(contact)
+        self._pending_updates[contact.jid] = contact
+        if self._update_source_id is None:
+            self._update_source_id = GLib.idle_add(
+                self._process_pending_updates,
+                priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _process_pending_updates(self) -> bool:
+        self._update_source_id = None
+        contacts = self._pending_updates
+        self._pending_updates = {}
+
+        groups: set[str] = set()
+        for contact in contacts.values():
+            if contact.jid not in self._contact_refs:
+                # Contact was removed in the meantime
+                continue
+            groups |= self._draw_contact(contact)
+
+        self._update_groups_visibility(groups)
+        return False
 
     @event_filter(['account'])
     def _on_roster_received(self, _event: RosterReceived) -> None:
@@ -475,6 +538,7 @@ def _on_roster_push(self, event: RosterPush) -> None:
 
         if event.item.subscription == 'remove':
             contact.disconnect(self)
+            self._pending_updates.pop(contact.jid, None)
             self._remove_contact(contact)
         else:
             if contact.jid not in self._contact_refs:
@@ -542,6 +606,7 @@ def _remove_contact_from_groups(self,
         self._check_for_empty_groups()
 
     def _remove_contact(self, contact: types.BareContact) -> None:
+        self._row_data.pop(str(contact.jid), None)
         refs = self._contact_refs.pop(contact.jid)
         for ref in refs:
             iter_ = self._get_iter_from_ref(ref)
@@ -558,7 +623,14 @@ def _check_for_empty_groups(self) -> None:
             self._store.remove(group_iter)
             del self._group_refs[group]
 
-    def _add_or_update_contact(self, contact: types.BareContact) -> None:
+    def _add_or_update_contact(self,
+                               contact: types.BareContact,
+                               expand: bool = True) -> None:
+
+        # Row data is used for sorting and must exist before
+        # rows are added to the store
+        self._update_row_data(contact)
+
         new_groups = set(contact.groups or [DEFAULT_GROUP])
         groups = self._get_current_groups(contact.jid)
 
@@ -569,7 +641,9 @@ def _add_or_update_contact(self, contact: types.BareContact) -> None:
         self._remove_contact_from_groups(contact, remove_from_groups)
 
         self._draw_groups()
-        self._draw_contact(contact)
+        groups = self._draw_contact(contact)
+        if expand:
+            self._update_groups_visibility(groups)
 
     def _draw_groups(self) -> None:
         for group in self._group_refs:
@@ -580,9 +654,7 @@ def _draw_group(self, group_name: str) -> None:
         if not group_iter:
             return
 
-        if self._roster.get_model() is not None:
-            group_path = self._store.get_path(group_iter)
-            self._roster.expand_row(group_path, False)
+        self._expand_group(group_iter)
 
         total_users = self._get_total_user_count()
         group_users = self._store.iter_n_children(group_iter)
@@ -596,39 +668,98 @@ def _refilter(self) -> None:
             self._roster.expand_all()
             return
 
+        # Only rows which change their visibility are written, every write
+        # makes the filter model and the treeview process the row
+        changed = False
         for group in self._store:
             group_is_visible = False
             for child in group.iterchildren():
-                contact = self._contacts.get_bare_contact(
-                    child[Column.JID_OR_GROUP])
-                is_visible = self._get_contact_visible(contact)
-                child[Column.VISIBLE] = is_visible
+                data = self._row_data[child[Column.JID_OR_GROUP]]
+                is_visible = self._is_row_visible(data)
+                if child[Column.VISIBLE] != is_visible:
+                    child[Column.VISIBLE] = is_visible
+                    changed = True
                 if is_visible:
                     group_is_visible = True
 
-            group[Column.VISIBLE] = group_is_visible
-        self._roster.expand_all()
+            if group[Column.VISIBLE] != group_is_visible:
+                group[Column.VISIBLE] = group_is_visible
+                changed = True
+
+        if changed:
+            self._roster.expand_all()
+
+    def _update_groups_visibility(self, groups: set[str]) -> None:
+        for group_name in groups:
+            group_iter = self._get_group_iter(group_name)
+            if group_iter is None:
+                continue
+
+            if not self._high_performance:
+                group_is_visible = False
+                child_iter = self._store.iter_children(group_iter)
+                while child_iter is not None:
+                    if self._store[child_iter][Column.VISIBLE]:
+                        group_is_visible = True
+                        break
+                    child_iter = self._store.iter_next(child_iter)
+
+                if self._store[group_iter][Column.VISIBLE] != group_is_visible:
+                    self._store[group_iter][Column.VISIBLE] = group_is_visible
+
+            self._expand_group(group_iter)
+
+    def _expand_group(self, group_iter: Gtk.TreeIter) -> None:
+        if self._roster.get_model() is None:
+            return
+
+        path = self._modelfilter.convert_child_path_to_path(
+            self._store.get_path(group_iter))
+        if path is not None:
+            self._roster.expand_row(path, False)
+
+    def _draw_contact(self, contact: types.BareContact) -> set[str]:
+        '''Draws all rows of the contact and returns the groups of the rows
+        '''
 
-    def _draw_contact(self, contact: types.BareContact) -> None:
+        old_data = self._row_data.get(str(contact.jid))
+        data = self._update_row_data(contact)
+        resort = (old_data is None or
+                  old_data.sort_key != data.sort_key or
+                  (self._sort_by_show and old_data.show != data.show))
+
+        groups: set[str] = set()
         for ref in self._contact_refs[contact.jid]:
-            self._draw_contact_row(ref, contact)
-        self._roster.expand_all()
+            iter_ = self._draw_contact_row(ref, contact, data, resort)
+            group_iter = self._store.iter_parent(iter_)
+            assert group_iter is not None
+            groups.add(self._store[group_iter][Column.JID_OR_GROUP])
+        return groups
 
     def _draw_contact_row(self,
                           ref: Gtk.TreeRowReference,
-                          contact: types.BareContact):
+                          contact: types.BareContact,
+                          data: RowData,
+                          resort: bool) -> Gtk.TreeIter:
 
         iter_ = self._get_iter_from_ref(ref)
+        row = self._store[iter_]
 
-        name = GLib.markup_escape_text(contact.name)
+        name = GLib.markup_escape_text(data.name)
         if contact.is_blocked:
             name = f'<span strikethrough="true">{name}</span>'
-        self._store[iter_][Column.TEXT] = name
+        if resort or row[Column.TEXT] != name:
+            # Setting the sort column makes the store re-sort the row
+            row[Column.TEXT] = name
 
         surface = contact.get_avatar(
             AvatarSize.ROSTER, self.get_scale_factor())
-        self._store[iter_][Column.AVATAR] = surface
-        self._store[iter_][Column.VISIBLE] = self._get_contact_visible(contact)
+        row[Column.AVATAR] = surface
+
+        is_visible = self._is_row_visible(data)
+        if row[Column.VISIBLE] != is_visible:
+            row[Column.VISIBLE] = is_visible
+        return iter_
 
     def _get_total_user_count(self) -> int:
         count = 0
@@ -688,25 +819,22 @@ def _tree_compare_iters(self,
 
         is_contact = model.iter_parent(iter1)
         if is_contact:
-            name1 = model[iter1][Column.TEXT]
-            name2 = model[iter2][Column.TEXT]
-
-            if not app.settings.get('sort_by_show_in_roster'):
-                return locale.strcoll(name1.lower(), name2.lower())
-
-            contact1 = self._contacts.get_bare_contact(
-                model[iter1][Column.JID_OR_GROUP])
-            contact2 = self._contacts.get_bare_contact(
-                model[iter2][Column.JID_OR_GROUP])
-
-            if contact1.show != contact2.show:
-                if contact1.show == PresenceShow.DND:
+            data1 = self._row_data.get(model[iter1][Column.JID_OR_GROUP])
+            data2 = self._row_data.get(model[iter2][Column.JID_OR_GROUP])
+            if data1 is None or data2 is None:
+                # Row is not drawn yet
+                return 0
+
+            if self._sort_by_show and data1.show != data2.show:
+                if data1.show == PresenceShow.DND:
                     return 1
-                if contact2.show == PresenceShow.DND:
+                if data2.show == PresenceShow.DND:
                     return -1
-                return -1 if contact1.show > contact2.show else 1
+                return -1 if data1.show > data2.show else 1
 
-            return locale.strcoll(name1.lower(), name2.lower())
+            if data1.sort_key == data2.sort_key:
+                return 0
+            return -1 if data1.sort_key < data2.sort_key else 1
 
         # Group
         group1 = model[iter1][Column.JID_OR_GROUP]
@@ -716,10 +844,17 @@ def _tree_compare_iters(self,
     def _clear(self):
         self._contact_refs.clear()
         self._group_refs.clear()
+        self._row_data.clear()
+        self._pending_updates.clear()
         self._store.clear()
 
     def _on_destroy(self, _roster: Roster) -> None:
         app.settings.disconnect_signals(self)
+        if self._update_source_id is not None:
+            GLib.source_remove(self._update_source_id)
+            self._update_source_id = None
+        self._pending_updates.clear()
+        self._row_data.clear()
         self._contact_refs.clear()
         self._group_refs.clear()
         self._unset_model()
@@ -272,40 +272,21 @@ def _on_last_date_selected(self, _button: Gtk.Button) -> None:
         self._ui.calendar.select_day(self._last_date.day)
 
     def _on_previous_date_selected(self, _button: Gtk.Button) -> None:
-        delta = timedelta(days=-1)
-        assert self._first_date is not None
-        self._select_date(delta, self._first_date, Direction.NEXT)
+        self._select_date(Direction.PREV)
 
     def _on_next_date_selected(self, _button: Gtk.Button) -> None:
-        delta = timedelta(days=1)
-        assert self._last_date is not None
-        self._select_date(delta, self._last_date, Direction.PREV)
-
-    def _select_date(self,
-                     delta: timedelta,
-                     end_date: datetime,
-                     direction: Direction
-                     ) -> None:
-        # Iterate through days until history entry found or
-        # supplied end_date (first_date/last_date) reached
+        self._select_date(Direction.NEXT)
+
+    def _select_date(self, direction: Direction) -> None:
+        # Select the closest day with history entries in direction
         year, month, day = self._ui.calendar.get_date()
         py_m = python_month(month)
         date = datetime(year, py_m, day)
 
-        history = None
-        while history is None:
-            if direction == Direction.PREV:
-                if end_date <= date:
-                    return
-            else:
-                if end_date >= date:
-                    return
-
-            date = date + delta
-            if date == end_date:
-                break
-            history = app.storage.archive.date_has_history(
-                self._account, self._jid, date)
+        date = app.storage.archive.get_adjacent_history_date(
+            self._account, self._jid, date, direction == Direction.NEXT)
+        if date is None:
+            return
 
         gtk_m = gtk_month(date.month)
         self._ui.calendar.select_month(gtk_m, date.year)
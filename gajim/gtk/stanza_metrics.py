@@ -0,0 +1,195 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from typing import Optional
+
+import logging
+import time
+
+from gi.repository import Gdk
+from gi.repository import GLib
+from gi.repository import Gtk
+
+from gajim.common import app
+from gajim.common.i18n import _
+from gajim.common.stanza_metrics import AccountMetrics
+from gajim.common.stanza_metrics import Histogram
+
+from .dialogs import ErrorDialog
+from .dialogs import InformationDialog
+
+log = logging.getLogger('gajim.gui.stanza_metrics')
+
+
+def _format_histogram(histogram: Histogram) -> str:
+    if histogram.count == 0:
+        return '-'
+    return _('%(count)s × %(average).1f ms, max %(max).1f ms') % {
+        'count': histogram.count,
+        'average': histogram.average * 1000,
+        'max': histogram.max * 1000}
+
+
+class StanzaMetricsWindow(Gtk.ApplicationWindow):
+    def __init__(self) -> None:
+        Gtk.ApplicationWindow.__init__(self)
+        self.set_name('StanzaMetricsWindow')
+        self.set_application(app.app)
+        self.set_position(Gtk.WindowPosition.CENTER)
+        self.set_default_size(700, 600)
+        self.set_show_menubar(False)
+        self.set_title(_('Stanza Metrics'))
+        self.set_type_hint(Gdk.WindowTypeHint.DIALOG)
+
+        if app.settings.get('use_kib_mib'):
+            self._units = GLib.FormatSizeFlags.IEC_UNITS
+        else:
+            self._units = GLib.FormatSizeFlags.DEFAULT
+
+        self._store = Gtk.TreeStore(str, str)
+        self._treeview = Gtk.TreeView(model=self._store)
+        self._treeview.set_headers_visible(False)
+
+        for column_id, expand in ((0, True), (1, False)):
+            renderer = Gtk.CellRendererText()
+            column = Gtk.TreeViewColumn(None, renderer, text=column_id)
+            column.set_expand(expand)
+            self._treeview.append_column(column)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_vexpand(True)
+        scrolled.add(self._treeview)
+
+        self._since_label = Gtk.Label()
+        self._since_label.get_style_context().add_class('dim-label')
+
+        refresh_button = Gtk.Button.new_from_icon_name(
+            'view-refresh-symbolic', Gtk.IconSize.BUTTON)
+        refresh_button.set_tooltip_text(_('Refresh'))
+        refresh_button.connect('clicked', self._on_refresh_clicked)
+
+        reset_button = Gtk.Button.new_with_label(_('Reset'))
+        reset_button.connect('clicked', self._on_reset_clicked)
+
+        export_button = Gtk.Button.new_with_label(_('Export…'))
+        export_button.set_tooltip_text(
+            _('Export in the Prometheus text format'))
+        export_button.connect('clicked', self._on_export_clicked)
+
+        actionbar = Gtk.ActionBar()
+        actionbar.pack_start(refresh_button)
+        actionbar.pack_start(self._since_label)
+        actionbar.pack_end(export_button)
+        actionbar.pack_end(reset_button)
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        box.add(scrolled)
+        box.add(actionbar)
+        self.add(box)
+
+        self.connect('key-press-event', self._on_key_press)
+
+        app.stanza_metrics.start()
+        self._update()
+        self.show_all()
+
+    def _on_key_press(self, _widget: Gtk.Widget, event: Gdk.EventKey) -> None:
+        if event.keyval == Gdk.KEY_Escape:
+            self.destroy()
+
+    def _on_refresh_clicked(self, _button: Gtk.Button) -> None:
+        self._update()
+
+    def _on_reset_clicked(self, _button: Gtk.Button) -> None:
+        app.stanza_metrics.reset()
+        self._update()
+
+    def _on_export_clicked(self, _button: Gtk.Button) -> None:
+        try:
+            path = app.stanza_metrics.export_prometheus()
+        except OSError as error:
+            log.warning('Unable to export stanza metrics: %s', error)
+            ErrorDialog(_('Export Failed'), str(error), transient_for=self)
+            return
+
+        InformationDialog(_('Metrics Exported'),
+                          _('Stanza metrics have been written to %s') % path,
+                          transient_for=self)
+
+    def _add_row(self,
+                 parent: Optional[Gtk.TreeIter],
+                 name: str,
+                 value: str = '') -> Gtk.TreeIter:
+        return self._store.append(parent, [name, value])
+
+    def _update(self) -> None:
+        self._store.clear()
+
+        started = time.strftime('%X', time.localtime(
+            app.stanza_metrics.started))
+        self._since_label.set_text(_('Since %s') % started)
+
+        for account, metrics in sorted(
+                app.stanza_metrics.get_accounts().items()):
+            label = app.get_account_label(account) \
+                if account in app.settings.get_accounts() else account
+            account_iter = self._add_row(None, label)
+            self._add_account_rows(account_iter, metrics)
+
+        self._treeview.expand_all()
+
+    def _add_account_rows(self,
+                          account_iter: Gtk.TreeIter,
+                          metrics: AccountMetrics) -> None:
+
+        for direction, title in (('in', _('Received')), ('out', _('Sent'))):
+            size = GLib.format_size_full(metrics.bytes[direction],
+                                         self._units)
+            direction_iter = self._add_row(account_iter, title, size)
+
+            for (stanza_direction, type_), count in sorted(
+                    metrics.stanzas.items()):
+                if stanza_direction != direction:
+                    continue
+                type_iter = self._add_row(direction_iter, type_, str(count))
+
+                namespaces = [(namespace, ns_count) for
+                              (ns_direction, ns_type, namespace), ns_count
+                              in metrics.namespaces.items()
+                              if ns_direction == direction and
+                              ns_type == type_]
+                namespaces.sort(key=lambda item: item[1], reverse=True)
+                for namespace, ns_count in namespaces:
+                    self._add_row(type_iter, namespace, str(ns_count))
+
+        iq_iter = self._add_row(account_iter,
+                                _('IQ Round Trip'),
+                                _format_histogram(metrics.iq_latency))
+        if metrics.iq_timeouts:
+            self._add_row(iq_iter,
+                          _('Unanswered'),
+                          str(metrics.iq_timeouts))
+
+        handlers = sorted(metrics.handlers.items(),
+                          key=lambda item: item[1].sum,
+                          reverse=True)
+        handlers_iter = self._add_row(account_iter, _('Stanza Handlers'))
+        for handler, histogram in handlers:
+            if histogram.count == 0:
+                continue
+            self._add_row(handlers_iter,
+                          handler.removeprefix('gajim.common.modules.'),
+                          _format_histogram(histogram))
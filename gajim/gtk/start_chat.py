@@ -16,6 +16,7 @@
 
 from typing import cast
 from typing import Any
+from typing import NamedTuple
 from typing import Optional
 from typing import Union
 
@@ -63,12 +64,131 @@
 
 ContactT = Union[BareContact, GroupchatContact]
 
+# Number of matching rows which are materialized at once, more rows are
+# added when scrolling to the end of the list
+ROWS_PER_PAGE = 50
+
+# Delay in ms after which a changed query is applied to the list
+QUERY_DELAY = 50
+
 
 class Search(IntEnum):
     CONTACT = 0
     GLOBAL = 1
 
 
+class IndexEntry(NamedTuple):
+    account: str
+    jid: Optional[JID]
+    name: str
+    groupchat: bool
+    is_new: bool
+    search_text: str
+
+
+class ContactIndex:
+    '''Prebuilt search index over all rows of the Start Chat dialog.
+
+    Entries are kept in display order, a query returns the matching
+    entries without touching any widget.
+    '''
+
+    def __init__(self) -> None:
+        self._entries: list[IndexEntry] = []
+        self._last_query: Optional[tuple[str, str, bool]] = None
+        self._last_result: list[IndexEntry] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _get_sort_key(entry: IndexEntry) -> tuple[str, bool, bool, str]:
+        return (locale.strxfrm(entry.account.lower()),
+                entry.is_new,
+                entry.groupchat,
+                locale.strxfrm(entry.name.lower()))
+
+    def add(self,
+            account: str,
+            jid: Optional[JID],
+            name: str,
+            groupchat: bool = False,
+            groups: Optional[set[str]] = None,
+            account_label: Optional[str] = None
+            ) -> IndexEntry:
+
+        parts = [name, str(jid)]
+        if groups:
+            parts.extend(groups)
+        if account_label is not None:
+            parts.append(account_label)
+
+        entry = IndexEntry(account,
+                           jid,
+                           name,
+                           groupchat,
+                           jid is None,
+                           ' '.join(parts).casefold())
+        self._entries.append(entry)
+        self._invalidate()
+        return entry
+
+    def sort(self) -> None:
+        self._entries.sort(key=self._get_sort_key)
+        self._invalidate()
+
+    def remove(self, account: str, jid: str) -> list[IndexEntry]:
+        removed = [entry for entry in self._entries
+                   if entry.account == account and str(entry.jid) == jid]
+        for entry in removed:
+            self._entries.remove(entry)
+        self._invalidate()
+        return removed
+
+    def _invalidate(self) -> None:
+        self._last_query = None
+        self._last_result = []
+
+    def query(self,
+              text: str,
+              chat_filter: str = 'all',
+              show_new: bool = False
+              ) -> list[IndexEntry]:
+
+        text = text.casefold()
+        candidates = self._entries
+        if self._last_query is not None:
+            last_text, last_filter, last_show_new = self._last_query
+            if (last_filter == chat_filter and
+                    last_show_new == show_new and
+                    text.startswith(last_text)):
+                # The query only got more specific, all matches are
+                # contained in the previous result
+                candidates = self._last_result
+
+        tokens = text.split()
+        result: list[IndexEntry] = []
+        for entry in candidates:
+            if entry.is_new:
+                if show_new:
+                    result.append(entry)
+                continue
+
+            if chat_filter == 'chats' and entry.groupchat:
+                continue
+
+            if chat_filter == 'group_chats' and not entry.groupchat:
+                continue
+
+            search_text = entry.search_text
+            if all(token in search_text for token in tokens):
+                result.append(entry)
+
+        self._last_query = (text, chat_filter, show_new)
+        self._last_result = result
+        return result
+
+
 class StartChatDialog(Gtk.ApplicationWindow):
     def __init__(self,
                  initial_jid: Optional[str] = None,
@@ -103,11 +223,19 @@ def __init__(self,
         self.new_contact_rows: dict[str, Optional[ContactRow]] = {}
         self._accounts = app.get_enabled_accounts_with_labels()
 
-        rows: list[ContactRow] = []
+        # Rows are only created for matches which are displayed
+        self._index = ContactIndex()
+        self._rows: dict[IndexEntry, ContactRow] = {}
+        self._matches: list[IndexEntry] = []
+        self._shown_matches = 0
+        self._query_source_id: Optional[int] = None
+        self._applied_query: Optional[tuple[str, str, bool]] = None
+
         self._add_accounts()
-        self._add_contacts(rows)
-        self._add_groupchats(rows)
-        self._add_new_contact_rows(rows)
+        self._add_contacts()
+        self._add_groupchats()
+        self._add_new_contact_rows()
+        self._index.sort()
 
         self._ui.search_entry.connect(
             'search-changed', self._on_search_changed)
@@ -119,8 +247,8 @@ def __init__(self,
             'stop-search', lambda *args: self._ui.search_entry.set_text(''))
 
         self._ui.listbox.set_placeholder(self._ui.placeholder)
-        self._ui.listbox.set_filter_func(self._filter_func, None)
         self._ui.listbox.connect('row-activated', self._on_row_activated)
+        self._ui.scrolledwindow.connect('edge-reached', self._on_edge_reached)
 
         self._global_search_listbox = GlobalSearch()
         self._global_search_listbox.connect('row-activated',
@@ -141,23 +269,24 @@ def __init__(self,
         self.connect('key-press-event', self._on_key_press)
         self.connect('destroy', self._on_destroy)
 
-        if rows:
-            self._load_contacts(rows)
-
         self._initial_message: dict[str, Optional[str]] = {}
         if initial_jid is not None:
             self._initial_message[initial_jid] = initial_message
             self._ui.search_entry.set_text(initial_jid)
+            # search-changed is emitted delayed, validate the JID now.
+            # The query for the same text is not run again afterwards.
+            self._on_search_changed(self._ui.search_entry)
 
-        self.select_first_row()
+        self._apply_query()
         self._ui.connect_signals(self)
         self.show_all()
 
     def remove_row(self, account: str, jid: str) -> None:
-        for row in cast(list[ContactRow], self._ui.listbox.get_children()):
-            if row.account == account and row.jid == jid:
+        for entry in self._index.remove(account, jid):
+            row = self._rows.pop(entry, None)
+            if row is not None:
                 row.destroy()
-                return
+        self._schedule_query()
 
     def _global_search_active(self) -> bool:
         return self._ui.global_search_toggle.get_active()
@@ -166,52 +295,120 @@ def _add_accounts(self) -> None:
         for account in self._accounts:
             self._ui.account_store.append([None, *account])
 
-    def _add_contacts(self, rows: list[ContactRow]):
-        show_account = len(self._accounts) > 1
+    def _get_account_label(self, account: str) -> Optional[str]:
+        if len(self._accounts) > 1:
+            return app.get_account_label(account)
+        return None
+
+    def _add_contacts(self) -> None:
         for account, _label in self._accounts:
+            account_label = self._get_account_label(account)
             client = app.get_client(account)
-            for jid, _data in client.get_module('Roster').iter():
-                contact = client.get_module('Contacts').get_contact(jid)
-                rows.append(ContactRow(account,
-                                       contact,
-                                       jid,
-                                       contact.name,
-                                       show_account))
-            self_contact = client.get_module('Contacts').get_contact(
-                client.get_own_jid().bare)
-            rows.append(ContactRow(account,
-                                   self_contact,
-                                   self_contact.jid,
-                                   _('Note to myself'),
-                                   show_account))
-
-    def _add_groupchats(self, rows: list[ContactRow]) -> None:
-        show_account = len(self._accounts) > 1
+            contacts = client.get_module('Contacts')
+            for jid, data in client.get_module('Roster').iter():
+                name = data.name or contacts.get_contact(jid).name
+                self._index.add(account,
+                                jid,
+                                name,
+                                groups=data.groups,
+                                account_label=account_label)
+
+            self._index.add(account,
+                            client.get_own_jid().new_as_bare(),
+                            _('Note to myself'),
+                            account_label=account_label)
+
+    def _add_groupchats(self) -> None:
         for account, _label in self._accounts:
+            account_label = self._get_account_label(account)
             client = app.get_client(account)
             bookmarks = client.get_module('Bookmarks').bookmarks
             for bookmark in bookmarks:
                 contact = client.get_module('Contacts').get_contact(
                     bookmark.jid, groupchat=True)
-                rows.append(ContactRow(account,
-                                       contact,
-                                       bookmark.jid,
-                                       contact.name,
-                                       show_account,
-                                       groupchat=True))
-
-    def _add_new_contact_rows(self, rows: list[ContactRow]) -> None:
+                self._index.add(account,
+                                bookmark.jid,
+                                contact.name,
+                                groupchat=True,
+                                account_label=account_label)
+
+    def _add_new_contact_rows(self) -> None:
+        show_account = len(self._accounts) > 1
         for account, _label in self._accounts:
-            show_account = len(self._accounts) > 1
             row = ContactRow(account, None, None, None, show_account)
             self.new_contact_rows[account] = row
-            rows.append(row)
+            entry = self._index.add(account, None, row.name or '')
+            self._rows[entry] = row
+
+    def _get_row(self, entry: IndexEntry) -> ContactRow:
+        row = self._rows.get(entry)
+        if row is not None:
+            return row
+
+        client = app.get_client(entry.account)
+        contact = client.get_module('Contacts').get_contact(
+            entry.jid, groupchat=entry.groupchat)
+        row = ContactRow(entry.account,
+                         contact,
+                         entry.jid,
+                         entry.name,
+                         len(self._accounts) > 1,
+                         groupchat=entry.groupchat)
+        self._rows[entry] = row
+        return row
+
+    def _schedule_query(self) -> None:
+        if self._query_source_id is not None:
+            GLib.source_remove(self._query_source_id)
+        self._query_source_id = GLib.timeout_add(QUERY_DELAY,
+                                                 self._on_query_timeout)
+
+    def _on_query_timeout(self) -> bool:
+        self._query_source_id = None
+        self._apply_query()
+        return False
+
+    def _get_query(self) -> tuple[str, str, bool]:
+        return (self._ui.search_entry.get_text(),
+                self._current_filter,
+                self._search_is_valid_jid)
+
+    def _apply_query(self) -> None:
+        if self._query_source_id is not None:
+            GLib.source_remove(self._query_source_id)
+            self._query_source_id = None
+
+        self._applied_query = self._get_query()
+        text, chat_filter, show_new = self._applied_query
+        self._matches = self._index.query(text,
+                                          chat_filter=chat_filter,
+                                          show_new=show_new)
+
+        for row in self._ui.listbox.get_children():
+            self._ui.listbox.remove(row)
+
+        self._shown_matches = 0
+        self._show_more_matches()
+        self.select_first_row()
+
+    def _show_more_matches(self) -> bool:
+        if self._shown_matches >= len(self._matches):
+            return False
 
-    def _load_contacts(self, rows: list[ContactRow]) -> None:
-        for row in rows:
-            self._ui.listbox.add(row)
+        end = self._shown_matches + ROWS_PER_PAGE
+        for entry in self._matches[self._shown_matches:end]:
+            self._ui.listbox.add(self._get_row(entry))
+        self._shown_matches = min(end, len(self._matches))
+        return True
 
-        self._ui.listbox.set_sort_func(self._sort_func, None)
+    def _on_edge_reached(self,
+                         _scrolledwindow: Gtk.ScrolledWindow,
+                         pos: Gtk.PositionType
+                         ) -> None:
+        if pos != Gtk.PositionType.BOTTOM:
+            return
+        if self._current_listbox_is(Search.CONTACT):
+            self._show_more_matches()
 
     def _on_page_changed(self, stack: Gtk.Stack, _param: Any) -> None:
         if stack.get_visible_child_name() == 'account':
@@ -336,7 +533,7 @@ def _on_filter_bar_toggled(self, toggle_button: Gtk.ToggleButton) -> None:
 
     def _on_chat_filter_changed(self, _filter: ChatFilter, name: str) -> None:
         self._current_filter = name
-        self._ui.listbox.invalidate_filter()
+        self._schedule_query()
 
     def _start_new_chat(self, row: ContactRow) -> None:
         if row.is_new:
@@ -535,7 +732,6 @@ def _on_global_search_toggle(self, button: Gtk.ToggleButton) -> None:
             self._set_listbox(self._global_search_listbox)
             if self._ui.search_entry.get_text():
                 self._start_search()
-            self._ui.listbox.invalidate_filter()
         else:
             self._ui.filter_bar_toggle.set_sensitive(True)
             self._ui.search_entry.set_text('')
@@ -565,7 +761,9 @@ def _on_search_changed(self, search_entry: Gtk.SearchEntry) -> None:
                 self._update_new_contact_rows(search_text)
                 self._search_is_valid_jid = True
 
-        self._ui.listbox.invalidate_filter()
+        if self._get_query() == self._applied_query:
+            return
+        self._schedule_query()
 
     def _show_search_entry_error(self, state: bool):
         icon_name = 'dialog-warning-symbolic' if state else None
@@ -599,6 +797,9 @@ def _select_new_match(self,
         while True:
             new_selected_row = self._ui.listbox.get_row_at_index(index)
             if new_selected_row is None:
+                if (direction == Direction.NEXT and
+                        self._show_more_matches()):
+                    continue
                 return
             if new_selected_row.get_child_visible():
                 self._ui.listbox.select_row(new_selected_row)
@@ -610,57 +811,13 @@ def _select_new_match(self,
                 index -= 1
 
     def select_first_row(self) -> None:
-        first_row = self._ui.listbox.get_row_at_y(0)
+        # Rows which were just added have no allocation yet
+        first_row = self._ui.listbox.get_row_at_index(0)
         self._ui.listbox.select_row(first_row)
 
     def _scroll_to_first_row(self) -> None:
         self._ui.scrolledwindow.get_vadjustment().set_value(0)
 
-    def _filter_func(self, row: ContactRow, _user_data: Any) -> bool:
-        if row.contact is None:
-            # new contact row
-            return self._search_is_valid_jid
-
-        search_text = self._ui.search_entry.get_text().lower()
-        search_text_list = search_text.split()
-        row_text = row.get_search_text().lower()
-
-        if self._current_filter == 'chats' and row.groupchat:
-            return False
-
-        if self._current_filter == 'group_chats' and not row.groupchat:
-            return False
-
-        for text in search_text_list:
-            if text not in row_text:
-                GLib.timeout_add(50, self.select_first_row)
-                return False
-        GLib.timeout_add(50, self.select_first_row)
-        return True
-
-    @staticmethod
-    def _sort_func(row1: ContactRow, row2: ContactRow, _user_data: Any) -> int:
-        name1 = row1.get_search_text()
-        name2 = row2.get_search_text()
-        account1 = row1.account
-        account2 = row2.account
-        is_groupchat1 = row1.groupchat
-        is_groupchat2 = row2.groupchat
-        new1 = row1.is_new
-        new2 = row2.is_new
-
-        result = locale.strcoll(account1.lower(), account2.lower())
-        if result != 0:
-            return result
-
-        if new1 != new2:
-            return 1 if new1 else -1
-
-        if is_groupchat1 != is_groupchat2:
-            return 1 if is_groupchat1 else -1
-
-        return locale.strcoll(name1.lower(), name2.lower())
-
     def _start_search(self) -> None:
         self._search_stopped = False
         accounts = app.get_connected_accounts()
@@ -749,8 +906,13 @@ def _process_search_result(self,
             self._global_search_listbox.add(ResultRow(item))
 
     def _on_destroy(self, *args: Any) -> None:
-        self._ui.listbox.set_filter_func(None)
+        if self._query_source_id is not None:
+            GLib.source_remove(self._query_source_id)
+            self._query_source_id = None
         self._ui.listbox.destroy()
+        for row in self._rows.values():
+            row.destroy()
+        self._rows.clear()
         self._destroyed = True
         app.cancel_tasks(self)
         app.check_finalize(self)
@@ -157,27 +157,29 @@ def _on_save(self, _button: Gtk.Button) -> None:
                 self._avatar_sha = app.app.avatar_storage.save_avatar(data)
 
         if self._workspace_id is not None:
-            app.settings.set_workspace_setting(
-                self._workspace_id, 'name', name)
-            app.settings.set_workspace_setting(
-                self._workspace_id, 'color', rgba.to_string())
-            if self._avatar_sha is None:
+            with app.settings.batch():
                 app.settings.set_workspace_setting(
-                    self._workspace_id, 'avatar_sha', '')
-            else:
+                    self._workspace_id, 'name', name)
                 app.settings.set_workspace_setting(
-                    self._workspace_id, 'avatar_sha', self._avatar_sha)
+                    self._workspace_id, 'color', rgba.to_string())
+                if self._avatar_sha is None:
+                    app.settings.set_workspace_setting(
+                        self._workspace_id, 'avatar_sha', '')
+                else:
+                    app.settings.set_workspace_setting(
+                        self._workspace_id, 'avatar_sha', self._avatar_sha)
 
             app.window.update_workspace(self._workspace_id)
             self.destroy()
             return
 
-        workspace_id = app.settings.add_workspace(name)
-        app.settings.set_workspace_setting(
-            workspace_id, 'color', rgba.to_string())
-        if self._avatar_sha is not None:
+        with app.settings.batch():
+            workspace_id = app.settings.add_workspace(name)
             app.settings.set_workspace_setting(
-                workspace_id, 'avatar_sha', self._avatar_sha)
+                workspace_id, 'color', rgba.to_string())
+            if self._avatar_sha is not None:
+                app.settings.set_workspace_setting(
+                    workspace_id, 'avatar_sha', self._avatar_sha)
 
         app.window.add_workspace(workspace_id)
         self.destroy()
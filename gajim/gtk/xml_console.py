@@ -13,10 +13,14 @@
 # along with Gajim. If not, see <http://www.gnu.org/licenses/>.
 
 from typing import Any
+from typing import NamedTuple
 from typing import Optional
 from typing import Union
 
+import logging
 import time
+from collections import deque
+from pathlib import Path
 
 import nbxmpp
 from gi.repository import Gdk
@@ -25,9 +29,8 @@
 from gi.repository import GtkSource
 
 from gajim.common import app
+from gajim.common import configpaths
 from gajim.common import ged
-from gajim.common.events import AccountDisabled
-from gajim.common.events import AccountEnabled
 from gajim.common.events import StanzaReceived
 from gajim.common.events import StanzaSent
 from gajim.common.const import Direction
@@ -45,6 +48,91 @@
 from .const import SettingKind
 from .const import SettingType
 
+log = logging.getLogger('gajim.gui.xml_console')
+
+# Number of stanzas kept in memory
+MAX_STANZAS = 5000
+
+# Number of stanzas shown in the text view
+MAX_DISPLAYED = 500
+
+CAPTURE_MAX_SIZE = 10 * 1024 * 1024
+CAPTURE_BACKUPS = 3
+
+
+class StanzaEntry(NamedTuple):
+    account: str
+    kind: str
+    type_: str
+    timestamp: float
+    stanza: str
+
+
+class StanzaCapture:
+    '''
+    Appends stanzas to a file, which is rotated after reaching max_size
+    '''
+
+    def __init__(self,
+                 path: Path,
+                 max_size: int = CAPTURE_MAX_SIZE,
+                 backups: int = CAPTURE_BACKUPS
+                 ) -> None:
+
+        self._path = path
+        self._max_size = max_size
+        self._backups = backups
+        self._file = path.open('a', encoding='utf8')
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def write(self, text: str) -> None:
+        self._file.write(text)
+        if self._file.tell() >= self._max_size:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        for index in range(self._backups - 1, 0, -1):
+            source = self._path.with_name(f'{self._path.name}.{index}')
+            if source.exists():
+                source.replace(
+                    self._path.with_name(f'{self._path.name}.{index + 1}'))
+
+        if self._backups > 0:
+            self._path.replace(self._path.with_name(f'{self._path.name}.1'))
+        self._file = self._path.open('w', encoding='utf8')
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def get_stanza_type(stanza: str, kind: str) -> str:
+    if stanza.startswith('<presence'):
+        return 'presence'
+    if stanza.startswith('<message'):
+        return 'message'
+    if stanza.startswith('<iq'):
+        return 'iq'
+    if stanza.startswith('<r') or stanza.startswith('<a'):
+        return 'stream'
+    return kind
+
+
+def format_stanza(stanza: str) -> str:
+    if not stanza.startswith('<') or stanza.startswith('<?'):
+        return stanza
+
+    try:
+        node = nbxmpp.Node(node=stanza)
+    except Exception:
+        # Stream headers and other fragments are no complete XML documents
+        return stanza
+    # pylint: disable=unnecessary-dunder-call
+    return node.__str__(fancy=True)
+
 
 class XMLConsoleWindow(Gtk.ApplicationWindow, EventHelper):
     def __init__(self) -> None:
@@ -69,6 +157,13 @@ def __init__(self) -> None:
         self.last_stanza = None
         self.last_search = ''
 
+        self._stanzas: deque[StanzaEntry] = deque(maxlen=MAX_STANZAS)
+        self._pending: list[StanzaEntry] = []
+        self._flush_id: Optional[int] = None
+        # Number of lines of each block in the text buffer
+        self._displayed_lines: deque[int] = deque()
+        self._capture: Optional[StanzaCapture] = None
+
         self._ui = get_builder('xml_console.ui')
         self.set_titlebar(self._ui.headerbar)
         self._set_titlebar()
@@ -88,7 +183,24 @@ def __init__(self) -> None:
             self._combo.append(account, label)
         self._ui.actionbar.pack_end(self._combo)
 
-        self._create_tags()
+        stats_button = Gtk.Button.new_from_icon_name(
+            'utilities-system-monitor-symbolic', Gtk.IconSize.BUTTON)
+        stats_button.set_tooltip_text(_('Event Handler Statistics'))
+        stats_button.connect('clicked', self._on_event_stats)
+        self._ui.actionbar.pack_start(stats_button)
+
+        latency_button = Gtk.Button.new_from_icon_name(
+            'document-open-recent-symbolic', Gtk.IconSize.BUTTON)
+        latency_button.set_tooltip_text(_('Main Loop Latency'))
+        latency_button.connect('clicked', self._on_main_loop_stats)
+        self._ui.actionbar.pack_start(latency_button)
+
+        self._capture_button = Gtk.ToggleButton()
+        self._capture_button.set_image(Gtk.Image.new_from_icon_name(
+            'media-record-symbolic', Gtk.IconSize.BUTTON))
+        self._capture_button.set_tooltip_text(_('Record Stanzas to File'))
+        self._capture_button.connect('toggled', self._on_capture_toggled)
+        self._ui.actionbar.pack_start(self._capture_button)
 
         source_manager = GtkSource.LanguageManager.get_default()
         lang = source_manager.get_language('xml')
@@ -110,11 +222,13 @@ def __init__(self) -> None:
             ('stanza-received', ged.GUI1, self._on_stanza_received),
             ('stanza-sent', ged.GUI1, self._on_stanza_sent),
             ('style-changed', ged.GUI1, self._on_style_changed),
-            ('account-enabled', ged.GUI1, self._on_account_changed),
-            ('account-disabled', ged.GUI1, self._on_account_changed)
         ])
 
     def _on_destroy(self, *args: Any) -> None:
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+        self._stop_capture()
         self._ui.popover.destroy()
         app.check_finalize(self)
 
@@ -136,35 +250,6 @@ def _set_titlebar(self) -> None:
             title = app.get_jid_from_account(self._selected_account)
         self._ui.headerbar.set_subtitle(title)
 
-    def _on_account_changed(self,
-                            event: Union[AccountEnabled, AccountDisabled]
-                            ) -> None:
-        buf = self._ui.sourceview.get_buffer()
-
-        if isinstance(event, AccountEnabled):
-            buf.create_tag(event.account)
-        else:
-            start, end = buf.get_bounds()
-            buf.remove_tag_by_name(event.account, start, end)
-
-    def _create_tags(self) -> None:
-        tags = [
-            'incoming',
-            'outgoing',
-            'presence',
-            'message',
-            'stream',
-            'iq'
-        ]
-
-        for account in app.settings.get_active_accounts():
-            tags.append(account)
-
-        tags.append('AccountWizard')
-
-        for tag_name in tags:
-            self._ui.sourceview.get_buffer().create_tag(tag_name)
-
     def _on_key_press(self, _widget: Gtk.Widget, event: Gdk.EventKey) -> None:
         if event.keyval == Gdk.KEY_Escape:
             if self._ui.search_revealer.get_child_revealed():
@@ -386,91 +471,182 @@ def _on_filter_options(self, _button: Gtk.Button) -> None:
     def _on_filter_destroyed(self, _widget: Gtk.Widget) -> None:
         self.filter_dialog = None
 
-    def _on_clear(self, _button: Gtk.Button) -> None:
-        self._ui.sourceview.get_buffer().set_text('')
+    def _on_event_stats(self, _button: Gtk.Button) -> None:
+        if not app.ged.profiling:
+            # Profiling adds a small overhead to every event, so it is
+            # only enabled on request
+            app.ged.start_profiling()
+            report = _('Event handler profiling started, '
+                       'click again to show the statistics')
+        else:
+            report = app.ged.get_profiling_report(limit=50)
 
-    def _set_account(self, value: str, _data: Any) -> None:
-        self._selected_account = value
-        self._set_titlebar()
+        is_at_the_end = at_the_end(self._ui.scrolled)
+        self._insert_text(
+            '<!-- {title} {time}\n{report}\n-->\n\n'.format(
+                title=_('Event Handler Statistics'),
+                time=time.strftime('%c'),
+                report=report))
+        self._trim_buffer()
+        if is_at_the_end:
+            GLib.idle_add(scroll_to_end, self._ui.scrolled)
+
+    def _on_main_loop_stats(self, _button: Gtk.Button) -> None:
+        if not app.main_loop_monitor.running:
+            app.main_loop_monitor.start()
+            report = _('Main loop monitoring started, '
+                       'click again to show the slowest callbacks')
+        else:
+            report = app.main_loop_monitor.get_report(limit=20)
 
-        active_accounts = app.settings.get_active_accounts()
-        active_accounts.append('AccountWizard')
+        is_at_the_end = at_the_end(self._ui.scrolled)
+        self._insert_text(
+            '<!-- {title} {time}\n{report}\n-->\n\n'.format(
+                title=_('Main Loop Latency'),
+                time=time.strftime('%c'),
+                report=report))
+        self._trim_buffer()
+        if is_at_the_end:
+            GLib.idle_add(scroll_to_end, self._ui.scrolled)
+
+    def _on_capture_toggled(self, button: Gtk.ToggleButton) -> None:
+        if not button.get_active():
+            self._stop_capture()
+            return
 
-        table = self._ui.sourceview.get_buffer().get_tag_table()
+        path = configpaths.get('DEBUG') / 'xml_console.log'
+        try:
+            self._capture = StanzaCapture(path)
+        except OSError as error:
+            log.warning('Unable to open capture file: %s', error)
+            button.set_active(False)
+            ErrorDialog(_('Recording Failed'), str(error))
+            return
+
+        log.info('Recording stanzas to %s', path)
+        self._insert_text(f'<!-- Recording stanzas to {path} -->\n\n')
 
-        if value == 'AllAccounts':
-            for account in active_accounts:
-                tag = table.lookup(account)
-                if tag is not None:
-                    tag.set_property('invisible', False)
+    def _stop_capture(self) -> None:
+        if self._capture is None:
             return
+        self._capture.close()
+        self._capture = None
+
+    def _on_clear(self, _button: Gtk.Button) -> None:
+        self._stanzas.clear()
+        self._pending.clear()
+        self._displayed_lines.clear()
+        self._ui.sourceview.get_buffer().set_text('')
 
-        for account in active_accounts:
-            tag = table.lookup(account)
-            if tag is not None:
-                tag.set_property('invisible', account != value)
+    def _set_account(self, value: str, _data: Any) -> None:
+        self._selected_account = value
+        self._set_titlebar()
+        self._redraw()
 
     def _on_setting(self, value: bool, data: str) -> None:
         setattr(self, data, value)
-        value = not value
-        table = self._ui.sourceview.get_buffer().get_tag_table()
-        tag = table.lookup(data)
-        if tag is None:
-            return
+        self._redraw()
+
+    def _matches_filter(self, entry: StanzaEntry) -> bool:
+        if (self._selected_account != 'AllAccounts' and
+                entry.account != self._selected_account):
+            return False
+        return (getattr(self, entry.kind) and
+                getattr(self, entry.type_, True))
+
+    def _redraw(self) -> None:
+        self._pending.clear()
+        self._displayed_lines.clear()
+        self._ui.sourceview.get_buffer().set_text('')
 
-        if data in ('incoming', 'outgoing'):
-            if value:
-                tag.set_priority(table.get_size() - 1)
-            else:
-                tag.set_priority(0)
+        entries = [entry for entry in self._stanzas
+                   if self._matches_filter(entry)]
+        for entry in entries[-MAX_DISPLAYED:]:
+            self._insert_entry(entry)
 
-        tag.set_property('invisible', value)
+        GLib.idle_add(scroll_to_end, self._ui.scrolled)
 
     def _on_stanza_received(self, event: StanzaReceived):
-        self._print_stanza(event, 'incoming')
+        self._add_stanza(event, 'incoming')
 
     def _on_stanza_sent(self, event: StanzaSent):
-        self._print_stanza(event, 'outgoing')
+        self._add_stanza(event, 'outgoing')
 
-    def _print_stanza(self,
-                      event: Union[StanzaReceived, StanzaSent],
-                      kind: str
-                      ) -> None:
-        if event.account == 'AccountWizard':
-            account_label = 'Account Wizard'
-        else:
-            account_label = app.get_account_label(event.account)
+    def _add_stanza(self,
+                    event: Union[StanzaReceived, StanzaSent],
+                    kind: str
+                    ) -> None:
 
         stanza = event.stanza
         if not isinstance(stanza, str):
-            # pylint: disable=unnecessary-dunder-call
-            stanza = stanza.__str__(fancy=True)
+            stanza = str(stanza)
 
         if not stanza:
             return
 
-        is_at_the_end = at_the_end(self._ui.scrolled)
+        entry = StanzaEntry(account=event.account,
+                            kind=kind,
+                            type_=get_stanza_type(stanza, kind),
+                            timestamp=time.time(),
+                            stanza=stanza)
+        self._stanzas.append(entry)
 
-        buffer_ = self._ui.sourceview.get_buffer()
-        end_iter = buffer_.get_end_iter()
-
-        type_ = kind
-        if stanza.startswith('<presence'):
-            type_ = 'presence'
-        elif stanza.startswith('<message'):
-            type_ = 'message'
-        elif stanza.startswith('<iq'):
-            type_ = 'iq'
-        elif stanza.startswith('<r') or stanza.startswith('<a'):
-            type_ = 'stream'
-
-        stanza = '<!-- {kind} {time} ({account}) -->\n{stanza}\n\n'.format(
-            kind=kind.capitalize(),
-            time=time.strftime('%c'),
-            account=account_label,
-            stanza=stanza)
-        buffer_.insert_with_tags_by_name(
-            end_iter, stanza, type_, kind, event.account)
+        if self._capture is not None:
+            self._capture.write(self._get_header(entry) + stanza + '\n\n')
+
+        if not self._matches_filter(entry):
+            return
+
+        self._pending.append(entry)
+        if self._flush_id is None:
+            self._flush_id = GLib.idle_add(self._flush_pending)
+
+    def _flush_pending(self) -> bool:
+        self._flush_id = None
+
+        # Stanzas which would be trimmed right away are never formatted
+        entries = self._pending[-MAX_DISPLAYED:]
+        self._pending.clear()
+
+        is_at_the_end = at_the_end(self._ui.scrolled)
+        for entry in entries:
+            self._insert_entry(entry)
+        self._trim_buffer()
 
         if is_at_the_end:
             GLib.idle_add(scroll_to_end, self._ui.scrolled)
+        return False
+
+    @staticmethod
+    def _get_header(entry: StanzaEntry) -> str:
+        if entry.account == 'AccountWizard':
+            account_label = 'Account Wizard'
+        else:
+            account_label = app.get_account_label(entry.account)
+
+        return '<!-- {kind} {time} ({account}) -->\n'.format(
+            kind=entry.kind.capitalize(),
+            time=time.strftime('%c', time.localtime(entry.timestamp)),
+            account=account_label)
+
+    def _insert_entry(self, entry: StanzaEntry) -> None:
+        self._insert_text('{header}{stanza}\n\n'.format(
+            header=self._get_header(entry),
+            stanza=format_stanza(entry.stanza)))
+
+    def _insert_text(self, text: str) -> None:
+        buffer_ = self._ui.sourceview.get_buffer()
+        buffer_.insert(buffer_.get_end_iter(), text)
+        self._displayed_lines.append(text.count('\n'))
+
+    def _trim_buffer(self) -> None:
+        lines = 0
+        while len(self._displayed_lines) > MAX_DISPLAYED:
+            lines += self._displayed_lines.popleft()
+
+        if not lines:
+            return
+
+        buffer_ = self._ui.sourceview.get_buffer()
+        buffer_.delete(buffer_.get_start_iter(),
+                       buffer_.get_iter_at_line(lines))
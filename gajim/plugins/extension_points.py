@@ -0,0 +1,157 @@
+# This file is part of Gajim.
+#
+# Gajim is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published
+# by the Free Software Foundation; version 3 only.
+#
+# Gajim is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Gajim. If not, see <http://www.gnu.org/licenses/>.
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Iterator
+from typing import Optional
+from typing import TYPE_CHECKING
+
+import sys
+import weakref
+
+if TYPE_CHECKING:
+    from gi.repository import Gtk
+
+_Key = tuple[str, Hashable]
+
+
+def _is_widget(obj: Any) -> bool:
+    # Without GUI Gtk is not imported, no object can be a widget then
+    gtk = sys.modules.get('gi.repository.Gtk')
+    return gtk is not None and isinstance(obj, gtk.Widget)
+
+
+def _get_key(obj: Any) -> _Key:
+    # Values like strings can not be weakly referenced, they are indexed by
+    # equality so remove() finds them with an equal but distinct value
+    try:
+        weakref.ref(obj)
+    except TypeError:
+        try:
+            hash(obj)
+        except TypeError:
+            return ('id', id(obj))
+        return ('value', obj)
+    return ('id', id(obj))
+
+
+class _ExtensionPointCalls:
+
+    __slots__ = ('_ref', 'args_list', 'destroy_handler_id')
+
+    def __init__(self,
+                 obj: Any,
+                 on_collected: Callable[[Any], None]
+                 ) -> None:
+
+        try:
+            self._ref = weakref.ref(obj, on_collected)
+        except TypeError:
+            # Strings, tuples and similar values can not be weakly
+            # referenced, they do not keep any widget alive either
+            self._ref = lambda: obj
+
+        # Remaining arguments of every distinct call with this object
+        self.args_list: list[tuple[Any, ...]] = []
+        self.destroy_handler_id: Optional[int] = None
+
+    @property
+    def obj(self) -> Any:
+        return self._ref()
+
+
+class ExtensionPointRegistry:
+    '''
+    Stores the calls of GUI extension points, so they can be replayed for
+    plugins which are activated later.
+
+    Calls are indexed by the extension point name and the identity of the
+    first argument, or its value if it can not be weakly referenced. The
+    first argument is only weakly referenced if possible, its calls are
+    dropped when it is garbage collected or, for widgets, destroyed.
+    '''
+
+    def __init__(self) -> None:
+        self._calls: dict[str, dict[_Key, _ExtensionPointCalls]] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._calls
+
+    def __len__(self) -> int:
+        return sum(len(calls) for calls in self._calls.values())
+
+    def add(self, name: str, args: tuple[Any, ...]) -> None:
+        obj = args[0] if args else None
+        key = _get_key(obj)
+
+        calls = self._calls.setdefault(name, {})
+        entry = calls.get(key)
+        if entry is None:
+            entry = _ExtensionPointCalls(
+                obj, lambda _ref: self._discard(name, key))
+            if _is_widget(obj):
+                entry.destroy_handler_id = obj.connect(
+                    'destroy', self._on_destroy, name, key)
+            calls[key] = entry
+
+        if args[1:] not in entry.args_list:
+            entry.args_list.append(args[1:])
+
+    def remove(self, name: str, obj: Any) -> None:
+        entry = self._discard(name, _get_key(obj))
+        if entry is None or entry.destroy_handler_id is None:
+            return
+
+        obj = entry.obj
+        if obj is not None:
+            obj.disconnect(entry.destroy_handler_id)
+
+    def get_calls(self, name: str) -> Iterator[tuple[Any, ...]]:
+        calls = self._calls.get(name)
+        if calls is None:
+            return
+
+        # Handlers may add or remove extension points
+        for entry in list(calls.values()):
+            obj = entry.obj
+            if obj is None:
+                continue
+            for args in entry.args_list:
+                yield (obj, *args)
+
+    def _discard(self,
+                 name: str,
+                 key: _Key
+                 ) -> Optional[_ExtensionPointCalls]:
+
+        calls = self._calls.get(name)
+        if calls is None:
+            return None
+
+        entry = calls.pop(key, None)
+        if not calls:
+            del self._calls[name]
+        return entry
+
+    def _on_destroy(self,
+                    _widget: Gtk.Widget,
+                    name: str,
+                    key: _Key
+                    ) -> None:
+
+        self._discard(name, key)
@@ -13,12 +13,15 @@
 # along with Gajim.  If not, see <http://www.gnu.org/licenses/>.
 
 from typing import Optional
+from typing import TYPE_CHECKING
 
 from pathlib import Path
 
 from gajim.common import configpaths
 from gajim.plugins import plugins_i18n
-from gajim.gui.builder import Builder
+
+if TYPE_CHECKING:
+    from gajim.gui.builder import Builder
 
 
 class GajimPluginActivateException(Exception):
@@ -27,7 +30,9 @@ class GajimPluginActivateException(Exception):
     '''
 
 
-def get_builder(file_name: str, widgets: Optional[list[str]] = None) -> Builder:
+def get_builder(file_name: str,
+                widgets: Optional[list[str]] = None) -> 'Builder':
+    from gajim.gui.builder import Builder
     return Builder(file_name,     # pyright: ignore
                    widgets,
                    domain=plugins_i18n.DOMAIN,
@@ -43,8 +43,10 @@
 from gajim.common.i18n import _
 from gajim.common.exceptions import PluginsystemError
 from gajim.common.helpers import Singleton
+from gajim.common.startup_timeline import timeline
 from gajim.plugins.plugins_i18n import _ as p_
 
+from gajim.plugins.extension_points import ExtensionPointRegistry
 from gajim.plugins.helpers import GajimPluginActivateException
 from gajim.plugins.helpers import is_shipped_plugin
 from gajim.plugins.gajimplugin import GajimPlugin
@@ -170,7 +172,7 @@ def __init__(self):
         These are object instances of classes held `plugins`, but only those
         that were activated.
         '''
-        self.gui_extension_points: dict[str, Any] = {}
+        self.gui_extension_points = ExtensionPointRegistry()
         '''
         Registered GUI extension points.
         '''
@@ -186,7 +188,8 @@ def __init__(self):
         '''
 
         self.update_plugins()
-        self._load_manifests()
+        with timeline.phase('Load plugin manifests'):
+            self._load_manifests()
 
     def update_plugins(self,
                        replace: bool = True,
@@ -404,9 +407,8 @@ def remove_gui_extension_point(self,
         Each `PluginManager.gui_extension_point` call should have a call of
         `PluginManager.remove_gui_extension_point` related to it.
 
-        :note: in current implementation different arguments mean different
-                extension points. The same arguments and the same name mean
-                the same extension point.
+        :note: extension points are identified by their name and the
+                first argument. All calls with this argument are removed.
 
         :param gui_extpoint_name: name of GUI extension point.
         :param args: arguments that `PluginManager.gui_extension_point` was
@@ -414,13 +416,7 @@ def remove_gui_extension_point(self,
                 extension point name) to identify element to be removed.
         :type args: tuple
         '''
-        if gui_extpoint_name in self.gui_extension_points:
-            extension_points = list(self.gui_extension_points[
-                gui_extpoint_name])
-            for ext_point in extension_points:
-                if args[0] in ext_point:
-                    self.gui_extension_points[gui_extpoint_name].remove(
-                        ext_point)
+        self.gui_extension_points.remove(gui_extpoint_name, args[0])
 
         if gui_extpoint_name not in self.gui_extension_points_handlers:
             return
@@ -438,10 +434,9 @@ def _add_gui_extension_point_call_to_list(self,
         Adds GUI extension point call to list of calls.
 
         This is done only if such call hasn't been added already
-        (same extension point name and same arguments).
-
-        :note: This is assumption that GUI extension points are different only
-        if they have different name or different arguments.
+        (same extension point name and same arguments). The first argument
+        is only weakly referenced, calls are dropped automatically when it
+        is garbage collected or destroyed.
 
         :param gui_extpoint_name: GUI extension point name used to identify it
                 by plugins.
@@ -451,10 +446,7 @@ def _add_gui_extension_point_call_to_list(self,
         :type args: tuple
 
         '''
-        if (gui_extpoint_name not in self.gui_extension_points or
-                args not in self.gui_extension_points[gui_extpoint_name]):
-            self.gui_extension_points.setdefault(gui_extpoint_name, []).append(
-                args)
+        self.gui_extension_points.add(gui_extpoint_name, args)
 
     def _execute_all_handlers_of_gui_extension_point(self,
                                                      gui_extpoint_name: str,
@@ -548,16 +540,15 @@ def deactivate_plugin(self, plugin: GajimPlugin) -> None:
         # for each handled GUI extension point)
         for gui_extpoint_name, gui_extpoint_handlers in \
                 plugin.gui_extension_points.items():
-            if gui_extpoint_name in self.gui_extension_points:
-                for gui_extension_point_args in self.gui_extension_points[
-                        gui_extpoint_name]:
-                    handler = gui_extpoint_handlers[1]
-                    if handler:
-                        try:
-                            handler(*gui_extension_point_args)
-                        except Exception:
-                            log.warning('Error executing %s',
-                                        handler, exc_info=True)
+            handler = gui_extpoint_handlers[1]
+            if handler:
+                for gui_extension_point_args in \
+                        self.gui_extension_points.get_calls(gui_extpoint_name):
+                    try:
+                        handler(*gui_extension_point_args)
+                    except Exception:
+                        log.warning('Error executing %s',
+                                    handler, exc_info=True)
 
         self._remove_events_handler_from_ged(plugin)
         self._remove_name_from_encryption_plugins(plugin)
@@ -590,16 +581,15 @@ def _handle_all_gui_extension_points_with_plugin(self,
                                                      ) -> None:
         for gui_extpoint_name, gui_extpoint_handlers in \
                 plugin.gui_extension_points.items():
-            if gui_extpoint_name in self.gui_extension_points:
-                for gui_extension_point_args in self.gui_extension_points[
-                        gui_extpoint_name]:
-                    handler = gui_extpoint_handlers[0]
-                    if handler:
-                        try:
-                            handler(*gui_extension_point_args)
-                        except Exception:
-                            log.warning('Error executing %s',
-                                        handler, exc_info=True)
+            handler = gui_extpoint_handlers[0]
+            if handler:
+                for gui_extension_point_args in \
+                        self.gui_extension_points.get_calls(gui_extpoint_name):
+                    try:
+                        handler(*gui_extension_point_args)
+                    except Exception:
+                        log.warning('Error executing %s',
+                                    handler, exc_info=True)
 
     def register_modules_for_account(self, client: Client) -> None:
         '''
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+
+# Benchmarks the queries of the message archive (logs.db)
+#
+# Synthetic archives of different sizes are generated with
+# generate_archive.py, alternatively a copy of an existing logs.db is
+# used. The public methods of MessageArchiveStorage are timed on the
+# busiest 1:1 chat and group chat: history paging, search, duplicate
+# detection, calendar queries, export and cleanup.
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+
+import argparse
+import datetime
+import json
+import logging
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from gajim.common import app  # noqa: E402
+from gajim.common import configpaths  # noqa: E402
+from gajim.common.const import JIDConstant  # noqa: E402
+from gajim.common.const import KindConstant  # noqa: E402
+from gajim.common.helpers import AdditionalDataDict  # noqa: E402
+from gajim.common.storage.archive import MessageArchiveStorage  # noqa: E402
+
+from generate_archive import ArchiveConfig  # noqa: E402
+from generate_archive import generate  # noqa: E402
+
+SEARCH_WORD = 'restarting'
+SAMPLE_SIZE = 100
+PAGE_SIZE = 50
+PAGES = 10
+
+
+class ArchiveSettings:
+    '''
+    Provides the settings used by MessageArchiveStorage, account names
+    are the JIDs of the accounts
+    '''
+
+    def __init__(self, accounts: list[str], max_age: int) -> None:
+        self._accounts = accounts
+        self._max_age = max_age
+
+    def get_accounts(self) -> list[str]:
+        return self._accounts
+
+    def get_active_accounts(self) -> list[str]:
+        return self._accounts
+
+    def get_account_setting(self, account: str, setting: str) -> Any:
+        if setting == 'name':
+            return account.split('@')[0]
+        if setting == 'hostname':
+            return account.split('@')[1]
+        if setting == 'chat_history_max_age':
+            return self._max_age
+        raise KeyError(setting)
+
+
+class Target(NamedTuple):
+    account: str
+    jid: str
+    first: float
+    last: float
+    stanza_ids: list[str]
+    message_ids: list[str]
+
+
+class Timing(NamedTuple):
+    median: float
+    max: float
+
+
+def measure(func: Callable[[], object], runs: int) -> Timing:
+    times: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return Timing(statistics.median(times), max(times))
+
+
+def find_target(con: sqlite3.Connection, type_: JIDConstant) -> Target:
+    # The busiest chat of this type
+    account_id, jid_id, jid, first, last = con.execute('''
+        SELECT account_id, jid_id, jid, MIN(time), MAX(time)
+        FROM logs NATURAL JOIN jids
+        WHERE type = ? AND account_id IS NOT NULL
+        GROUP BY account_id, jid_id
+        ORDER BY COUNT(*) DESC LIMIT 1''', (type_,)).fetchone()
+
+    account = con.execute('SELECT jid FROM jids WHERE jid_id = ?',
+                          (account_id,)).fetchone()[0]
+
+    def _sample(column: str) -> list[str]:
+        rows = con.execute(f'''
+            SELECT {column} FROM logs
+            WHERE jid_id = ? AND {column} IS NOT NULL
+            ORDER BY random() LIMIT ?''', (jid_id, SAMPLE_SIZE)).fetchall()
+        return [row[0] for row in rows]
+
+    return Target(account, jid, first, last,
+                  _sample('stanza_id'), _sample('message_id'))
+
+
+def open_storage(database: Path,
+                 config_root: Path,
+                 max_age: int
+                 ) -> tuple[MessageArchiveStorage, Target, Target]:
+
+    configpaths.set_config_root(str(config_root))
+    configpaths.init()
+    path = configpaths.get('LOG_DB')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Benchmarks modify the archive, never use the original
+    shutil.copyfile(database, path)
+
+    con = sqlite3.connect(path)
+    accounts = [row[0] for row in con.execute('''
+        SELECT jid FROM jids
+        WHERE jid_id IN (SELECT DISTINCT account_id FROM logs)''')]
+    chat = find_target(con, JIDConstant.NORMAL_TYPE)
+    muc = find_target(con, JIDConstant.ROOM_TYPE)
+    con.close()
+
+    app.settings = ArchiveSettings(accounts, max_age)  # pyright: ignore
+
+    storage = MessageArchiveStorage()
+    storage.init()
+    return storage, chat, muc
+
+
+def page_history(storage: MessageArchiveStorage, target: Target) -> None:
+    timestamp = target.last + 1
+    for _ in range(PAGES):
+        rows = storage.get_conversation_before_after(
+            target.account, target.jid, True, timestamp, PAGE_SIZE)
+        if not rows:
+            break
+        timestamp = rows[-1].time
+
+
+def find_stanza_ids(storage: MessageArchiveStorage,
+                    target: Target,
+                    stanza_ids: list[str],
+                    groupchat: bool) -> None:
+    for stanza_id in stanza_ids:
+        storage.find_stanza_id(target.account, target.jid, stanza_id,
+                               groupchat=groupchat)
+
+
+def insert_messages(storage: MessageArchiveStorage, target: Target) -> None:
+    for _ in range(SAMPLE_SIZE):
+        storage.insert_into_logs(
+            target.account,
+            target.jid,
+            time.time(),
+            KindConstant.CHAT_MSG_RECV,
+            message='Benchmark message',
+            additional_data=AdditionalDataDict(),
+            stanza_id=uuid.uuid4().hex,
+            message_id=uuid.uuid4().hex)
+    storage._commit()  # pylint: disable=protected-access
+
+
+def set_markers(storage: MessageArchiveStorage, target: Target) -> None:
+    for message_id in target.message_ids:
+        storage.set_marker(target.account, target.jid, message_id,
+                           'received')
+    storage.flush_markers()
+
+
+def get_target_queries(storage: MessageArchiveStorage,
+                       target: Target,
+                       groupchat: bool
+                       ) -> dict[str, Callable[[], object]]:
+
+    account, jid = target.account, target.jid
+    middle = (target.first + target.last) / 2
+    day = datetime.datetime.fromtimestamp(middle).replace(
+        hour=0, minute=0, second=0, microsecond=0)
+    missing_ids = [uuid.uuid4().hex for _ in range(SAMPLE_SIZE)]
+
+    return {
+        'get_conversation_before_after':
+            lambda: storage.get_conversation_before_after(
+                account, jid, True, target.last + 1, PAGE_SIZE),
+        f'history paging, {PAGES} pages':
+            lambda: page_history(storage, target),
+        'get_conversation_around':
+            lambda: storage.get_conversation_around(account, jid, middle),
+        'get_conversation_between, one day':
+            lambda: storage.get_conversation_between(
+                account, jid, day.timestamp() + 86400, day.timestamp()),
+        'get_last_conversation_line':
+            lambda: storage.get_last_conversation_line(account, jid),
+        'search_log':
+            lambda: list(storage.search_log(account, jid, SEARCH_WORD)),
+        f'find_stanza_id, {SAMPLE_SIZE} found':
+            lambda: find_stanza_ids(storage, target, target.stanza_ids,
+                                    groupchat),
+        f'find_stanza_id, {SAMPLE_SIZE} missing':
+            lambda: find_stanza_ids(storage, target, missing_ids, groupchat),
+        'get_days_with_history':
+            lambda: storage.get_days_with_history(
+                account, jid, day.year, day.month),
+        'get_first_history_timestamp':
+            lambda: storage.get_first_history_timestamp(account, jid),
+        'get_last_history_timestamp':
+            lambda: storage.get_last_history_timestamp(account, jid),
+        'date_has_history':
+            lambda: storage.date_has_history(account, jid, day),
+        'get_first_message_meta_for_date':
+            lambda: storage.get_first_message_meta_for_date(
+                account, jid, day),
+        'get_last_correctable_message':
+            lambda: storage.get_last_correctable_message(
+                account, jid, target.message_ids[0]),
+        'export':
+            lambda: list(storage.get_messages_for_export(account, jid)),
+    }
+
+
+def get_queries(storage: MessageArchiveStorage,
+                chat: Target,
+                muc: Target
+                ) -> dict[str, Callable[[], object]]:
+
+    queries: dict[str, Callable[[], object]] = {}
+    for kind, target in (('chat', chat), ('muc', muc)):
+        target_queries = get_target_queries(storage, target, kind == 'muc')
+        for name, func in target_queries.items():
+            queries[f'{name} ({kind})'] = func
+
+    room = SimpleNamespace(account=muc.account, jid=muc.jid)
+    queries.update({
+        'get_recent_muc_nicks (muc)':
+            lambda: storage.get_recent_muc_nicks(room),  # type: ignore
+        'search_all_logs':
+            lambda: list(storage.search_all_logs(SEARCH_WORD)),
+        'get_conversation_jids':
+            lambda: storage.get_conversation_jids(chat.account),
+        f'insert_into_logs, {SAMPLE_SIZE} messages':
+            lambda: insert_messages(storage, chat),
+        f'set_marker, {SAMPLE_SIZE} markers':
+            lambda: set_markers(storage, chat),
+    })
+    return queries
+
+
+def run_benchmark(database: Path,
+                  runs: int,
+                  max_age: int) -> dict[str, dict[str, float]]:
+
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as config_root:
+        start = time.perf_counter()
+        storage, chat, muc = open_storage(database, Path(config_root),
+                                          max_age)
+        duration = time.perf_counter() - start
+        results['init'] = Timing(duration, duration)._asdict()
+        print_timing('init', Timing(duration, duration))
+
+        for name, func in get_queries(storage, chat, muc).items():
+            timing = measure(func, runs)
+            results[name] = timing._asdict()
+            print_timing(name, timing)
+
+        # These remove messages, they are measured once at the end
+        destructive = {
+            'remove_history (chat)':
+                lambda: storage.remove_history(chat.account, chat.jid),
+            'cleanup_chat_history':
+                storage.cleanup_chat_history,
+        }
+        for name, func in destructive.items():
+            timing = measure(func, 1)
+            results[name] = timing._asdict()
+            print_timing(name, timing)
+
+        storage.shutdown()
+    return results
+
+
+def print_timing(name: str, timing: Timing) -> None:
+    print(f'{name:<48} '
+          f'median {timing.median * 1000:>10.2f} ms  '
+          f'max {timing.max * 1000:>10.2f} ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark the message archive')
+    parser.add_argument('--scales', type=int, nargs='+',
+                        default=[10000, 100000, 1000000],
+                        help='Number of messages of the generated archives')
+    parser.add_argument('--database', type=Path,
+                        help='Benchmark a copy of this logs.db instead of '
+                             'generated archives')
+    parser.add_argument('--accounts', type=int, default=2,
+                        help='Number of accounts')
+    parser.add_argument('--contacts', type=int, default=200,
+                        help='Number of contacts with 1:1 chats')
+    parser.add_argument('--mucs', type=int, default=30,
+                        help='Number of group chats')
+    parser.add_argument('--muc-ratio', type=float, default=0.6,
+                        help='Share of group chat messages')
+    parser.add_argument('--years', type=float, default=5,
+                        help='Number of years the archive spans')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for generating the archives')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of runs, the median is reported')
+    parser.add_argument('--max-age', type=int, default=365 * 24 * 60 * 60,
+                        help='chat_history_max_age used for the cleanup')
+    parser.add_argument('--output', type=Path,
+                        help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    # Slow queries are logged as warnings, they are reported anyway
+    logging.getLogger('gajim').setLevel(logging.ERROR)
+
+    results: dict[str, Any] = {'runs': args.runs, 'archives': {}}
+    if args.database is not None:
+        print(f'Archive {args.database}')
+        results['archives'][str(args.database)] = run_benchmark(
+            args.database, args.runs, args.max_age)
+
+    else:
+        for messages in args.scales:
+            config = ArchiveConfig(accounts=args.accounts,
+                                   contacts=args.contacts,
+                                   mucs=args.mucs,
+                                   muc_ratio=args.muc_ratio,
+                                   messages=messages,
+                                   years=args.years,
+                                   seed=args.seed)
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                database = Path(tmp_dir) / 'logs.db'
+                start = time.perf_counter()
+                generate(database, config)
+                print(f'\n{messages} messages, generated in '
+                      f'{time.perf_counter() - start:.1f}s')
+                results['archives'][str(messages)] = run_benchmark(
+                    database, args.runs, args.max_age)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2),
+                               encoding='utf8')
+
+
+if __name__ == '__main__':
+    main()
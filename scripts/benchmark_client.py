@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+
+# Benchmarks Gajim end-to-end against a local fake XMPP server
+#
+# Gajim runs headless in this process and connects to the server from
+# fake_xmpp_server.py, no network, display or XMPP server is needed.
+# The client is driven through scenarios: login with a roster of N items,
+# joining a MUC with N occupants, MAM catch-up of N messages, a message
+# flood with M messages per second and a presence storm. For every
+# scenario throughput, main loop latency, time spent in SQLite and RSS are
+# recorded. Results are written as JSON, later runs can be compared
+# against them to find regressions.
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+
+import argparse
+import json
+import platform
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from gajim.gajim import _check_core_deps  # noqa: E402
+
+_check_core_deps()
+
+from gi.repository import Gio  # noqa: E402
+from gi.repository import GLib  # noqa: E402
+from nbxmpp.const import ConnectionProtocol  # noqa: E402
+from nbxmpp.const import ConnectionType  # noqa: E402
+
+import gajim  # noqa: E402
+from gajim.common import app  # noqa: E402
+from gajim.common import ged  # noqa: E402
+from gajim.common.const import MUCJoinedState  # noqa: E402
+from gajim.common.headless import HeadlessApplication  # noqa: E402
+
+from fake_xmpp_server import C2SSession  # noqa: E402
+from fake_xmpp_server import FakeServer  # noqa: E402
+from fake_xmpp_server import MessageFlood  # noqa: E402
+from fake_xmpp_server import ServerConfig  # noqa: E402
+
+ACCOUNT = 'benchmark'
+USERNAME = 'user'
+ROOM_JID = 'benchmark@conference.localhost'
+
+DEFAULT_THRESHOLD = 0.2
+# Stalls longer than this are recorded by the main loop monitor
+STALL_THRESHOLD = 0.1
+
+# Values compared against the baseline and whether higher is better
+COMPARED_VALUES = {
+    'duration': False,
+    'throughput': True,
+    'loop_latency_max': False,
+    'sqlite_time': False,
+}
+
+
+def get_rss() -> int:
+    '''
+    Returns the current resident set size in KiB
+    '''
+    try:
+        with open('/proc/self/status', encoding='utf8') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def get_max_rss() -> int:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def get_commit() -> Optional[str]:
+    result = subprocess.run(['git', 'rev-parse', 'HEAD'],
+                            cwd=REPO_DIR,
+                            capture_output=True,
+                            text=True,
+                            check=False)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+class SQLiteStats:
+    def __init__(self) -> None:
+        self.time = 0.0
+        self.statements = 0
+
+    def reset(self) -> None:
+        self.time = 0.0
+        self.statements = 0
+
+    def add(self, start: float, statements: int = 0) -> None:
+        self.time += time.perf_counter() - start
+        self.statements += statements
+
+
+class TimedCursor:
+    '''
+    Measures fetching rows, SQLite executes statements step by step
+    while rows are fetched
+    '''
+
+    def __init__(self, cursor: sqlite3.Cursor, stats: SQLiteStats) -> None:
+        self._cursor = cursor
+        self._stats = stats
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __iter__(self) -> Any:
+        return iter(self.fetchall())
+
+    def fetchone(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return self._cursor.fetchone()
+        finally:
+            self._stats.add(start)
+
+    def fetchmany(self, *args: Any) -> list[Any]:
+        start = time.perf_counter()
+        try:
+            return self._cursor.fetchmany(*args)
+        finally:
+            self._stats.add(start)
+
+    def fetchall(self) -> list[Any]:
+        start = time.perf_counter()
+        try:
+            return self._cursor.fetchall()
+        finally:
+            self._stats.add(start)
+
+
+class TimedConnection:
+    '''
+    Wraps the connection of a storage and measures the time spent in
+    SQLite
+    '''
+
+    def __init__(self,
+                 connection: sqlite3.Connection,
+                 stats: SQLiteStats) -> None:
+        self._connection = connection
+        self._stats = stats
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def __enter__(self) -> Any:
+        return self._connection.__enter__()
+
+    def __exit__(self, *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return self._connection.__exit__(*args)
+        finally:
+            self._stats.add(start)
+
+    def _timed(self, func: Callable[..., Any], *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self._stats.add(start, 1)
+
+    def execute(self, *args: Any) -> TimedCursor:
+        return TimedCursor(self._timed(self._connection.execute, *args),
+                           self._stats)
+
+    def executemany(self, *args: Any) -> TimedCursor:
+        return TimedCursor(self._timed(self._connection.executemany, *args),
+                           self._stats)
+
+    def executescript(self, *args: Any) -> TimedCursor:
+        return TimedCursor(self._timed(self._connection.executescript, *args),
+                           self._stats)
+
+    def commit(self) -> None:
+        self._timed(self._connection.commit)
+
+
+@dataclass
+class ScenarioResult:
+    items: int
+    duration: float = 0.0
+    throughput: float = 0.0
+    loop_latency_avg: float = 0.0
+    loop_latency_max: float = 0.0
+    loop_stalls: int = 0
+    sqlite_time: float = 0.0
+    sqlite_statements: int = 0
+    rss_kib: int = 0
+    timeout: bool = False
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+class Scenario(NamedTuple):
+    name: str
+    items: int
+    # Called with a function which has to be called when the scenario
+    # is finished
+    run: Callable[[Callable[[], None]], None]
+
+
+class BenchmarkRunner:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self._args = args
+        self._server = FakeServer(ServerConfig(
+            roster_size=args.roster,
+            muc_occupants=args.occupants))
+        self._session: Optional[C2SSession] = None
+        self._sqlite = SQLiteStats()
+
+        self._scenarios: deque[Scenario] = deque([
+            Scenario('login', args.roster, self._run_login),
+            Scenario('muc_join', args.occupants, self._run_muc_join),
+            Scenario('mam_catch_up', args.mam, self._run_mam_catch_up),
+            Scenario('message_flood', args.messages, self._run_message_flood),
+            Scenario('presence_storm', args.presences,
+                     self._run_presence_storm),
+        ])
+        self._current: Optional[Scenario] = None
+        self._result: Optional[ScenarioResult] = None
+        self._start = 0.0
+        self._timeout_id: Optional[int] = None
+        self._handlers: list[tuple[str, Callable[..., Any]]] = []
+        self._latencies: list[float] = []
+        self._event_count = 0
+
+        self.results: dict[str, ScenarioResult] = {}
+
+    def start(self) -> None:
+        self._server.start(self._on_connected)
+
+        for storage in (app.storage.cache,
+                        app.storage.archive,
+                        app.storage.events):
+            storage._con = TimedConnection(  # pyright: ignore
+                storage._con, self._sqlite)
+
+        app.main_loop_monitor.start(STALL_THRESHOLD)
+        self._next_scenario()
+
+    def _on_connected(self, session: C2SSession) -> None:
+        self._session = session
+
+    @property
+    def session(self) -> C2SSession:
+        assert self._session is not None
+        return self._session
+
+    def _register(self, event_name: str, handler: Callable[..., Any]) -> None:
+        app.ged.register_event_handler(event_name, ged.POSTGUI, handler)
+        self._handlers.append((event_name, handler))
+
+    def _count_event(self, *args: Any) -> None:
+        self._event_count += 1
+
+    def _next_scenario(self) -> bool:
+        if not self._scenarios:
+            self._finish()
+            return False
+
+        self._current = self._scenarios.popleft()
+        self._result = ScenarioResult(self._current.items)
+        self._latencies.clear()
+        self._event_count = 0
+        print(f'Running {self._current.name} ({self._current.items})',
+              flush=True)
+
+        app.main_loop_monitor.reset()
+        self._sqlite.reset()
+        self._timeout_id = GLib.timeout_add_seconds(self._args.timeout,
+                                                    self._on_timeout)
+        self._start = time.perf_counter()
+        self._current.run(self._on_scenario_finished)
+        return False
+
+    def _on_scenario_finished(self) -> None:
+        duration = time.perf_counter() - self._start
+        if self._timeout_id is not None:
+            GLib.source_remove(self._timeout_id)
+            self._timeout_id = None
+
+        for event_name, handler in self._handlers:
+            app.ged.remove_event_handler(event_name, ged.POSTGUI, handler)
+        self._handlers.clear()
+
+        assert self._current is not None
+        assert self._result is not None
+        result = self._result
+        result.duration = duration
+        if duration > 0:
+            result.throughput = result.items / duration
+
+        stats = app.main_loop_monitor.get_latency_stats()
+        result.loop_latency_avg = stats.average
+        result.loop_latency_max = stats.max
+        result.loop_stalls = sum(offender.count for offender
+                                 in app.main_loop_monitor.get_offenders())
+        result.sqlite_time = self._sqlite.time
+        result.sqlite_statements = self._sqlite.statements
+        result.rss_kib = get_rss()
+        if self._latencies:
+            result.extra['latency_median'] = statistics.median(
+                self._latencies)
+            result.extra['latency_max'] = max(self._latencies)
+        if self._event_count:
+            result.extra['events'] = self._event_count
+
+        self.results[self._current.name] = result
+        print_result(self._current.name, result)
+
+        # Let pending callbacks run before the next scenario starts
+        GLib.idle_add(self._next_scenario)
+
+    def _on_timeout(self) -> bool:
+        self._timeout_id = None
+        assert self._result is not None
+        self._result.timeout = True
+        self._on_scenario_finished()
+        # The client is in an unknown state, further scenarios would
+        # not be meaningful
+        self._scenarios.clear()
+        return False
+
+    def _finish(self) -> None:
+        app.main_loop_monitor.stop()
+        app.app.start_shutdown()
+
+    def _run_login(self, finish: Callable[[], None]) -> None:
+        pending = {'signed-in', 'roster-received'}
+
+        def _on_event(event: Any) -> None:
+            pending.discard(event.name)
+            if not pending:
+                finish()
+
+        self._register('signed-in', _on_event)
+        self._register('roster-received', _on_event)
+
+        app.settings.set('use_keyring', False)
+        app.app.create_account(
+            ACCOUNT,
+            USERNAME,
+            self._server.config.domain,
+            'password',
+            None,
+            (f'127.0.0.1:{self._server.port}',
+             ConnectionProtocol.TCP,
+             ConnectionType.PLAIN))
+        app.settings.set_account_setting(ACCOUNT, 'use_plain_connection', True)
+        app.settings.set_account_setting(
+            ACCOUNT, 'confirm_unencrypted_connection', False)
+        app.app.enable_account(ACCOUNT)
+
+    def _run_muc_join(self, finish: Callable[[], None]) -> None:
+        client = app.get_client(ACCOUNT)
+
+        def _on_barrier() -> None:
+            muc_data = client.get_module('MUC').get_muc_data(ROOM_JID)
+            if muc_data is not None and muc_data.state == MUCJoinedState.JOINED:
+                finish()
+                return
+            # Disco info was requested first, the join presence is
+            # sent afterwards
+            self.session.send_barrier(_on_barrier)
+
+        client.get_module('MUC').join(ROOM_JID, nick='benchmark')
+        self.session.send_barrier(_on_barrier)
+
+    def _run_mam_catch_up(self, finish: Callable[[], None]) -> None:
+        self._register('mam-message-received', self._count_event)
+        self.session.archive_size = self._args.mam
+        app.get_client(ACCOUNT).get_module('MAM').request_archive_on_signin()
+
+        def _on_barrier() -> None:
+            client = app.get_client(ACCOUNT)
+            own_jid = client.get_own_jid().bare
+            if client.get_module('MAM').is_catch_up_finished(own_jid):
+                finish()
+                return
+            self.session.send_barrier(_on_barrier)
+
+        self.session.send_barrier(_on_barrier)
+
+    def _run_message_flood(self, finish: Callable[[], None]) -> None:
+        def _on_message(event: Any) -> None:
+            self._event_count += 1
+            try:
+                sent = float(event.msgtxt.rsplit(' ', 1)[1])
+            except (IndexError, ValueError):
+                return
+            self._latencies.append(time.perf_counter() - sent)
+
+        self._register('message-received', _on_message)
+        MessageFlood(self.session, self._args.messages, self._args.rate,
+                     finish)
+
+    def _run_presence_storm(self, finish: Callable[[], None]) -> None:
+        self._register('presence-received', self._count_event)
+        for index in range(self._args.presences):
+            self.session.send_presence(index)
+        self.session.send_barrier(finish)
+
+
+class BenchmarkApplication(HeadlessApplication):
+    def __init__(self, runner: BenchmarkRunner) -> None:
+        HeadlessApplication.__init__(self)
+        # Benchmarks must not interfere with a running Gajim
+        self.set_flags(self.get_flags() | Gio.ApplicationFlags.NON_UNIQUE)
+        self._runner = runner
+
+    def _remote_init(self) -> None:
+        pass
+
+    def _auto_connect(self) -> None:
+        self._runner.start()
+
+
+def print_result(name: str, result: ScenarioResult) -> None:
+    status = 'TIMEOUT' if result.timeout else ''
+    print(f'{name:<16} {result.duration:>8.3f}s '
+          f'{result.throughput:>10.0f}/s  '
+          f'loop max {result.loop_latency_max * 1000:>6.1f} ms  '
+          f'sqlite {result.sqlite_time * 1000:>8.1f} ms '
+          f'({result.sqlite_statements})  '
+          f'rss {result.rss_kib / 1024:>6.1f} MiB {status}',
+          flush=True)
+
+
+def compare(results: dict[str, Any],
+            baseline: dict[str, Any],
+            threshold: float) -> bool:
+
+    success = True
+    for name, result in results['scenarios'].items():
+        base_result = baseline.get('scenarios', {}).get(name)
+        if base_result is None or base_result['items'] != result['items']:
+            print(f'{name}: not comparable with baseline')
+            continue
+
+        for key, higher_is_better in COMPARED_VALUES.items():
+            if not base_result[key]:
+                continue
+
+            change = result[key] / base_result[key] - 1
+            if higher_is_better:
+                change = -change
+            print(f'{name} {key}: {result[key]:.4f} '
+                  f'(baseline {base_result[key]:.4f}, {change:+.1%} worse)')
+            if change > threshold:
+                print(f'  Regression, more than {threshold:.0%} worse')
+                success = False
+    return success
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark Gajim against a local fake XMPP server')
+    parser.add_argument('--roster', type=int, default=1000,
+                        help='Number of roster items')
+    parser.add_argument('--occupants', type=int, default=500,
+                        help='Number of MUC occupants')
+    parser.add_argument('--mam', type=int, default=2000,
+                        help='Number of messages in the MAM catch-up')
+    parser.add_argument('--messages', type=int, default=2000,
+                        help='Number of messages in the message flood')
+    parser.add_argument('--rate', type=float, default=200,
+                        help='Messages per second in the message flood')
+    parser.add_argument('--presences', type=int, default=5000,
+                        help='Number of presences in the presence storm')
+    parser.add_argument('--timeout', type=int, default=300,
+                        help='Seconds after which a scenario is aborted')
+    parser.add_argument('--output', type=Path,
+                        help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', type=Path,
+                        help='Compare against results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown compared to the baseline')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Show the log of Gajim')
+    args = parser.parse_args()
+
+    runner = BenchmarkRunner(args)
+    with tempfile.TemporaryDirectory() as config_path:
+        argv = ['gajim-benchmark', '--config-path', config_path]
+        argv.append('--verbose' if args.verbose else '--quiet')
+        BenchmarkApplication(runner).run(argv)
+
+    results: dict[str, Any] = {
+        'version': gajim.__version__,
+        'commit': get_commit(),
+        'time': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {
+            key: value for key, value in vars(args).items()
+            if key not in ('output', 'baseline', 'threshold', 'verbose')
+        },
+        'max_rss_kib': get_max_rss(),
+        'scenarios': {name: asdict(result)
+                      for name, result in runner.results.items()},
+    }
+
+    success = bool(runner.results) and not any(
+        result.timeout for result in runner.results.values())
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding='utf8'))
+        success = compare(results, baseline, args.threshold) and success
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2),
+                               encoding='utf8')
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+# Benchmarks the emoji data used for shortcode completion
+#
+# Measures the time to import the emoji module, to build the index from
+# the GTK resource and from the cache, and the time needed to complete
+# each keystroke while typing shortcodes.
+
+from typing import Callable
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_CODE = '''
+import time
+from gajim.gajim import _check_required_deps
+_check_required_deps()
+from gajim import gui
+gui.init('gtk')
+start = time.perf_counter()
+from gajim.gui import emoji_data_gtk
+print(time.perf_counter() - start)
+'''
+
+# Shortcodes are typed character by character, completion starts
+# with the second character
+SHORTCODES = [
+    'smile',
+    'thumbs up',
+    'heart',
+    'face with tears of joy',
+    'waving hand, medium skin tone',
+    'rocket',
+    'xyz',
+]
+
+MAX_ENTRIES = 6
+
+
+def measure_import(runs: int) -> list[float]:
+    times: list[float] = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', IMPORT_CODE],
+                                cwd=REPO_DIR,
+                                capture_output=True,
+                                text=True,
+                                check=False)
+        if result.returncode != 0:
+            sys.exit(f'Importing emoji module failed:\n{result.stderr}')
+        times.append(float(result.stdout.splitlines()[-1]))
+    return times
+
+
+def measure(func: Callable[[], object], runs: int) -> list[float]:
+    times: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def linear_search(data: dict[str, dict[str, str]],
+                  prefix: str,
+                  limit: int) -> list[str]:
+
+    # Completion as it was done before the index existed
+    result: list[str] = []
+    for keyword, entries in data.items():
+        if not keyword.startswith(prefix):
+            continue
+        for emoji in entries.values():
+            result.append(emoji)
+            if len(result) >= limit:
+                return result
+    return result
+
+
+def get_prefixes() -> list[str]:
+    prefixes: list[str] = []
+    for shortcode in SHORTCODES:
+        for length in range(2, len(shortcode) + 1):
+            prefixes.append(shortcode[:length].casefold())
+    return prefixes
+
+
+def print_times(name: str, times: list[float], unit: str = 'ms') -> None:
+    factor = 1000 if unit == 'ms' else 1000000
+    print(f'{name:<32} '
+          f'median {statistics.median(times) * factor:>10.2f} {unit}  '
+          f'max {max(times) * factor:>10.2f} {unit}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark emoji shortcode completion')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of runs for each measurement')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_DIR))
+    from gajim.gajim import _check_required_deps
+    _check_required_deps()
+
+    from gajim import gui
+    gui.init('gtk')
+
+    from gajim.common import configpaths
+    from gajim.gui import emoji_data_gtk
+
+    print_times('Import (cold)', measure_import(args.runs))
+
+    print_times('Build index from resource',
+                measure(lambda: emoji_data_gtk.load_emoji_data(
+                    use_cache=False), args.runs))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        configpaths.set_config_root(tmp_dir)
+        configpaths.init()
+        configpaths.create_paths()
+
+        # The first load writes the cache
+        emoji_data_gtk.load_emoji_data()
+        print_times('Build index from cache',
+                    measure(emoji_data_gtk.load_emoji_data, args.runs))
+
+    data = emoji_data_gtk.load_emoji_data(use_cache=False)
+    index = emoji_data_gtk.EmojiIndex(data)
+    print(f'{len(index)} keywords')
+
+    prefixes = get_prefixes()
+    indexed_times: list[float] = []
+    linear_times: list[float] = []
+    for prefix in prefixes:
+        indexed_times += measure(
+            lambda: index.search(prefix, MAX_ENTRIES), args.runs)
+        linear_times += measure(
+            lambda: linear_search(data, prefix, MAX_ENTRIES), args.runs)
+
+    print_times('Keystroke (index)', indexed_times, 'us')
+    print_times('Keystroke (linear scan)', linear_times, 'us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,579 @@
+# A minimal in-process XMPP server used by benchmark_client.py
+#
+# Speaks just enough c2s to log in a client with SASL PLAIN over an
+# unencrypted TCP connection and answers the requests Gajim sends after
+# login. Scenarios push stanzas to the client, a ping is used as barrier
+# to find out when the client has processed everything sent before.
+#
+# Namespaces are written out instead of using nbxmpp, the server should
+# not share code with the client it tests.
+
+from __future__ import annotations
+
+from typing import Callable
+from typing import Optional
+
+import base64
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from xml.etree import ElementTree
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+from gi.repository import Gio
+from gi.repository import GLib
+
+log = logging.getLogger('gajim.benchmark.server')
+
+NS_CLIENT = 'jabber:client'
+NS_STREAMS = 'http://etherx.jabber.org/streams'
+NS_SASL = 'urn:ietf:params:xml:ns:xmpp-sasl'
+NS_BIND = 'urn:ietf:params:xml:ns:xmpp-bind'
+NS_SESSION = 'urn:ietf:params:xml:ns:xmpp-session'
+NS_ROSTER = 'jabber:iq:roster'
+NS_DISCO_INFO = 'http://jabber.org/protocol/disco#info'
+NS_DISCO_ITEMS = 'http://jabber.org/protocol/disco#items'
+NS_MAM = 'urn:xmpp:mam:2'
+NS_MUC = 'http://jabber.org/protocol/muc'
+NS_MUC_USER = 'http://jabber.org/protocol/muc#user'
+NS_PING = 'urn:xmpp:ping'
+NS_FORWARD = 'urn:xmpp:forward:0'
+NS_DELAY = 'urn:xmpp:delay'
+NS_RSM = 'http://jabber.org/protocol/rsm'
+NS_STANZAS = 'urn:ietf:params:xml:ns:xmpp-stanzas'
+
+READ_SIZE = 65536
+# Stanzas pushed by the message flood are sent in ticks of this interval
+FLOOD_TICK = 10  # ms
+
+
+def _tag(namespace: str, name: str) -> str:
+    return f'{{{namespace}}}{name}'
+
+
+@dataclass
+class ServerConfig:
+    domain: str = 'localhost'
+    muc_domain: str = 'conference.localhost'
+    roster_size: int = 0
+    muc_occupants: int = 0
+
+    def get_contact(self, index: int) -> str:
+        return f'contact{index}@{self.domain}'
+
+
+class StreamParser:
+    '''
+    Incremental parser for an XML stream
+
+    Top level stanzas are built as ElementTree elements, the parser is
+    reset when the stream is restarted after authentication.
+    '''
+
+    def __init__(self,
+                 on_stream_start: Callable[[dict[str, str]], None],
+                 on_element: Callable[[ElementTree.Element], None],
+                 on_stream_end: Callable[[], None]) -> None:
+
+        self._on_stream_start = on_stream_start
+        self._on_element = on_element
+        self._on_stream_end = on_stream_end
+
+        self._parser = expat.ParserCreate()
+        self._depth = 0
+        self._builder: Optional[ElementTree.TreeBuilder] = None
+        self.reset()
+
+    def reset(self) -> None:
+        parser = expat.ParserCreate(namespace_separator=' ')
+        parser.StartElementHandler = self._on_start
+        parser.EndElementHandler = self._on_end
+        parser.CharacterDataHandler = self._on_data
+        self._parser = parser
+        self._depth = 0
+        self._builder = None
+
+    def feed(self, data: bytes) -> None:
+        self._parser.Parse(data, False)
+
+    @staticmethod
+    def _get_name(name: str) -> str:
+        namespace, _, local_name = name.rpartition(' ')
+        if not namespace:
+            return local_name
+        return _tag(namespace, local_name)
+
+    def _on_start(self, name: str, attrs: dict[str, str]) -> None:
+        self._depth += 1
+        attrs = {self._get_name(key): value for key, value in attrs.items()}
+        if self._depth == 1:
+            self._on_stream_start(attrs)
+            return
+
+        if self._depth == 2:
+            self._builder = ElementTree.TreeBuilder()
+
+        assert self._builder is not None
+        self._builder.start(self._get_name(name), attrs)
+
+    def _on_end(self, name: str) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._on_stream_end()
+            return
+
+        assert self._builder is not None
+        self._builder.end(self._get_name(name))
+        if self._depth == 1:
+            element = self._builder.close()
+            self._builder = None
+            self._on_element(element)
+
+    def _on_data(self, data: str) -> None:
+        if self._builder is not None:
+            self._builder.data(data)
+
+
+class C2SSession:
+    '''
+    The server side of one client connection
+
+    Outgoing data is passed to the send function, the session does not
+    know about the transport.
+    '''
+
+    def __init__(self,
+                 config: ServerConfig,
+                 send: Callable[[str], None]) -> None:
+
+        self._config = config
+        self._send = send
+        self._parser = StreamParser(self._on_stream_start,
+                                    self._on_element,
+                                    self._on_stream_end)
+
+        self._authenticated = False
+        self.username = ''
+        self.jid = ''
+        self.closed = False
+
+        # Number of messages returned by the next MAM query
+        self.archive_size = 0
+
+        self._ids = itertools.count()
+        self._barriers: dict[str, Callable[[], None]] = {}
+
+    @property
+    def bare_jid(self) -> str:
+        return f'{self.username}@{self._config.domain}'
+
+    def _next_id(self, prefix: str) -> str:
+        return f'{prefix}-{next(self._ids)}'
+
+    def feed(self, data: bytes) -> None:
+        self._parser.feed(data)
+
+    def send(self, data: str) -> None:
+        if not self.closed:
+            self._send(data)
+
+    def _on_stream_start(self, _attrs: dict[str, str]) -> None:
+        self.send(f"<?xml version='1.0'?>"
+                  f"<stream:stream xmlns='{NS_CLIENT}' "
+                  f"xmlns:stream='{NS_STREAMS}' "
+                  f"id='{uuid.uuid4()}' "
+                  f"from='{self._config.domain}' "
+                  f"version='1.0' xml:lang='en'>")
+
+        if not self._authenticated:
+            self.send(f"<stream:features>"
+                      f"<mechanisms xmlns='{NS_SASL}'>"
+                      f"<mechanism>PLAIN</mechanism>"
+                      f"</mechanisms>"
+                      f"</stream:features>")
+            return
+
+        self.send(f"<stream:features>"
+                  f"<bind xmlns='{NS_BIND}'/>"
+                  f"<session xmlns='{NS_SESSION}'><optional/></session>"
+                  f"</stream:features>")
+
+    def _on_stream_end(self) -> None:
+        self.send('</stream:stream>')
+        self.closed = True
+
+    def _on_element(self, element: ElementTree.Element) -> None:
+        if element.tag == _tag(NS_SASL, 'auth'):
+            self._on_auth(element)
+        elif element.tag == _tag(NS_CLIENT, 'iq'):
+            self._on_iq(element)
+        elif element.tag == _tag(NS_CLIENT, 'presence'):
+            self._on_presence(element)
+        elif element.tag == _tag(NS_CLIENT, 'message'):
+            pass
+        else:
+            log.warning('Unknown element: %s', element.tag)
+
+    def _on_auth(self, element: ElementTree.Element) -> None:
+        # Every password is accepted
+        payload = base64.b64decode(element.text or '')
+        _authzid, username, _password = payload.split(b'\x00')
+        self.username = username.decode()
+        self._authenticated = True
+        self.send(f"<success xmlns='{NS_SASL}'/>")
+        self._parser.reset()
+
+    def _on_iq(self, iq: ElementTree.Element) -> None:
+        type_ = iq.get('type')
+        id_ = iq.get('id', '')
+        if type_ in ('result', 'error'):
+            callback = self._barriers.pop(id_, None)
+            if callback is not None:
+                callback()
+            return
+
+        if len(iq) == 0:
+            return
+
+        child = iq[0]
+        to = iq.get('to')
+        if child.tag == _tag(NS_BIND, 'bind'):
+            resource = child.findtext(_tag(NS_BIND, 'resource')) or 'gajim'
+            self.jid = f'{self.bare_jid}/{resource}'
+            self._send_result(iq, f"<bind xmlns='{NS_BIND}'>"
+                                  f"<jid>{escape(self.jid)}</jid></bind>")
+
+        elif child.tag == _tag(NS_ROSTER, 'query') and type_ == 'get':
+            self._send_result(iq, self._get_roster())
+
+        elif child.tag == _tag(NS_DISCO_INFO, 'query') and type_ == 'get':
+            self._send_result(iq, self._get_disco_info(to, child.get('node')))
+
+        elif child.tag == _tag(NS_DISCO_ITEMS, 'query') and type_ == 'get':
+            self._send_result(iq, f"<query xmlns='{NS_DISCO_ITEMS}'/>")
+
+        elif child.tag == _tag(NS_MAM, 'query') and type_ == 'set':
+            self._on_mam_query(iq, child)
+
+        elif child.tag in (_tag(NS_SESSION, 'session'),
+                           _tag(NS_PING, 'ping')):
+            self._send_result(iq)
+
+        elif type_ == 'get':
+            self._send_error(iq, 'service-unavailable')
+
+        else:
+            # Accept everything which is stored on the server, e.g.
+            # private storage, PubSub publish or carbons
+            self._send_result(iq)
+
+    def _send_result(self,
+                     iq: ElementTree.Element,
+                     payload: str = '') -> None:
+
+        self.send(f"<iq type='result' id={quoteattr(iq.get('id', ''))} "
+                  f"from={quoteattr(iq.get('to', self.bare_jid))} "
+                  f"to={quoteattr(self.jid or self.bare_jid)}>"
+                  f"{payload}</iq>")
+
+    def _send_error(self, iq: ElementTree.Element, condition: str) -> None:
+        self.send(f"<iq type='error' id={quoteattr(iq.get('id', ''))} "
+                  f"from={quoteattr(iq.get('to', self.bare_jid))} "
+                  f"to={quoteattr(self.jid)}>"
+                  f"<error type='cancel'>"
+                  f"<{condition} xmlns='{NS_STANZAS}'/>"
+                  f"</error></iq>")
+
+    def _get_roster(self) -> str:
+        items = ''.join(
+            f"<item jid='{self._config.get_contact(index)}' "
+            f"name='Contact {index}' subscription='both'>"
+            f"<group>Group {index % 10}</group></item>"
+            for index in range(self._config.roster_size))
+        return f"<query xmlns='{NS_ROSTER}'>{items}</query>"
+
+    def _get_disco_info(self, to: Optional[str], node: Optional[str]) -> str:
+        if to is None or to == self._config.domain:
+            identity = "<identity category='server' type='im'/>"
+            features = [NS_DISCO_INFO, NS_DISCO_ITEMS, NS_PING]
+        elif to == self.bare_jid:
+            identity = "<identity category='account' type='registered'/>"
+            features = [NS_DISCO_INFO, NS_MAM]
+        elif to.endswith(f'@{self._config.muc_domain}'):
+            identity = ("<identity category='conference' type='text' "
+                        "name='Benchmark'/>")
+            features = [NS_DISCO_INFO, NS_MUC, 'muc_public', 'muc_open',
+                        'muc_unmoderated', 'muc_semianonymous',
+                        'muc_persistent', 'muc_unsecured']
+        else:
+            identity = "<identity category='client' type='pc'/>"
+            features = [NS_DISCO_INFO]
+
+        node_attr = '' if node is None else f' node={quoteattr(node)}'
+        features_xml = ''.join(f"<feature var='{var}'/>" for var in features)
+        return (f"<query xmlns='{NS_DISCO_INFO}'{node_attr}>"
+                f"{identity}{features_xml}</query>")
+
+    def _on_mam_query(self,
+                      iq: ElementTree.Element,
+                      query: ElementTree.Element) -> None:
+
+        # Filters are ignored, every query returns the whole archive
+        query_id = query.get('queryid', '')
+        timestamp = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        first = last = ''
+        for index in range(self.archive_size):
+            archive_id = self._next_id('archive')
+            first = first or archive_id
+            last = archive_id
+            contact = self._config.get_contact(
+                index % max(1, self._config.roster_size))
+            self.send(
+                f"<message to={quoteattr(self.jid)}>"
+                f"<result xmlns='{NS_MAM}' queryid={quoteattr(query_id)} "
+                f"id='{archive_id}'>"
+                f"<forwarded xmlns='{NS_FORWARD}'>"
+                f"<delay xmlns='{NS_DELAY}' stamp='{timestamp}'/>"
+                f"<message xmlns='{NS_CLIENT}' type='chat' "
+                f"from='{contact}/res' to='{self.bare_jid}' "
+                f"id='{self._next_id('mam-msg')}'>"
+                f"<body>Archived message {index}</body>"
+                f"</message></forwarded></result></message>")
+
+        self.archive_size = 0
+
+        rsm = ''
+        if last:
+            rsm = f'<first>{first}</first><last>{last}</last>'
+        self._send_result(iq, f"<fin xmlns='{NS_MAM}' complete='true'>"
+                              f"<set xmlns='{NS_RSM}'>{rsm}</set></fin>")
+
+    def _on_presence(self, presence: ElementTree.Element) -> None:
+        to = presence.get('to')
+        type_ = presence.get('type')
+        if to is None:
+            if type_ is None:
+                # Echo the initial presence
+                self.send(f"<presence from={quoteattr(self.jid)} "
+                          f"to={quoteattr(self.jid)}/>")
+            return
+
+        room, _, nick = to.partition('/')
+        if not room.endswith(f'@{self._config.muc_domain}') or not nick:
+            return
+
+        if type_ == 'unavailable':
+            self.send(f"<presence type='unavailable' from={quoteattr(to)} "
+                      f"to={quoteattr(self.jid)}>"
+                      f"<x xmlns='{NS_MUC_USER}'>"
+                      f"<item affiliation='none' role='none'/>"
+                      f"<status code='110'/></x></presence>")
+            return
+
+        self._join_muc(room, nick)
+
+    def _join_muc(self, room: str, nick: str) -> None:
+        for index in range(self._config.muc_occupants):
+            self.send(f"<presence from='{room}/occupant{index}' "
+                      f"to={quoteattr(self.jid)}>"
+                      f"<x xmlns='{NS_MUC_USER}'>"
+                      f"<item affiliation='member' role='participant'/>"
+                      f"</x></presence>")
+
+        self.send(f"<presence from={quoteattr(f'{room}/{nick}')} "
+                  f"to={quoteattr(self.jid)}>"
+                  f"<x xmlns='{NS_MUC_USER}'>"
+                  f"<item affiliation='owner' role='moderator' "
+                  f"jid={quoteattr(self.jid)}/>"
+                  f"<status code='110'/></x></presence>")
+
+        # The join is complete with the subject
+        self.send(f"<message type='groupchat' from='{room}' "
+                  f"to={quoteattr(self.jid)} id='{self._next_id('subject')}'>"
+                  f"<subject>Benchmark</subject></message>")
+
+    def send_barrier(self, callback: Callable[[], None]) -> None:
+        '''
+        Calls callback after the client answered a ping, stanzas are
+        processed in order so the client has processed everything sent
+        before
+        '''
+        id_ = self._next_id('barrier')
+        self._barriers[id_] = callback
+        self.send(f"<iq type='get' id='{id_}' "
+                  f"from='{self._config.domain}' to={quoteattr(self.jid)}>"
+                  f"<ping xmlns='{NS_PING}'/></iq>")
+
+    def send_message(self, index: int) -> None:
+        # The time is used by the benchmark to measure the latency
+        contact = self._config.get_contact(
+            index % max(1, self._config.roster_size))
+        self.send(f"<message type='chat' from='{contact}/res' "
+                  f"to={quoteattr(self.jid)} id='{self._next_id('msg')}'>"
+                  f"<body>Message {index} {time.perf_counter():.6f}</body>"
+                  f"</message>")
+
+    def send_presence(self, index: int) -> None:
+        contact = self._config.get_contact(
+            index % max(1, self._config.roster_size))
+        show = ('away', 'xa', 'dnd', 'chat')[index % 4]
+        self.send(f"<presence from='{contact}/res{index % 3}' "
+                  f"to={quoteattr(self.jid)}>"
+                  f"<show>{show}</show><status>Status {index}</status>"
+                  f"<priority>{index % 10}</priority></presence>")
+
+
+class MessageFlood:
+    '''
+    Sends messages with a constant rate, the rate is kept even if the
+    main loop is late by sending more messages in the next tick
+    '''
+
+    def __init__(self,
+                 session: C2SSession,
+                 count: int,
+                 rate: float,
+                 callback: Callable[[], None]) -> None:
+
+        self._session = session
+        self._count = count
+        self._rate = rate
+        self._callback = callback
+        self._sent = 0
+        self._start = time.monotonic()
+        GLib.timeout_add(FLOOD_TICK, self._on_tick)
+
+    def _on_tick(self) -> bool:
+        expected = int((time.monotonic() - self._start) * self._rate) + 1
+        while self._sent < min(expected, self._count):
+            self._session.send_message(self._sent)
+            self._sent += 1
+
+        if self._sent < self._count:
+            return True
+
+        self._session.send_barrier(self._callback)
+        return False
+
+
+class FakeServer:
+    '''
+    Listens on localhost and accepts one client connection
+    '''
+
+    def __init__(self, config: ServerConfig) -> None:
+        self.config = config
+        self.session: Optional[C2SSession] = None
+        self.port = 0
+
+        self._connection: Optional[Gio.SocketConnection] = None
+        self._queue: deque[bytes] = deque()
+        self._writing = False
+        self._on_connected: Optional[Callable[[C2SSession], None]] = None
+
+        self._service = Gio.SocketService()
+        self._service.connect('incoming', self._on_incoming)
+
+    def start(self,
+              on_connected: Optional[Callable[[C2SSession], None]] = None
+              ) -> None:
+
+        self._on_connected = on_connected
+        address = Gio.InetSocketAddress.new_from_string('127.0.0.1', 0)
+        _success, effective_address = self._service.add_address(
+            address,
+            Gio.SocketType.STREAM,
+            Gio.SocketProtocol.TCP,
+            None)
+        self.port = effective_address.get_port()
+        self._service.start()
+        log.info('Listening on port %s', self.port)
+
+    def stop(self) -> None:
+        self._service.stop()
+        self._service.close()
+        if self._connection is not None:
+            self._connection.close(None)
+            self._connection = None
+
+    def _on_incoming(self,
+                     _service: Gio.SocketService,
+                     connection: Gio.SocketConnection,
+                     _source_object: Optional[object]) -> bool:
+
+        if self._connection is not None:
+            log.warning('Only one connection is supported')
+            return False
+
+        self._connection = connection
+        self._queue.clear()
+        self._writing = False
+        self.session = C2SSession(self.config, self._send)
+        if self._on_connected is not None:
+            self._on_connected(self.session)
+
+        self._read()
+        return True
+
+    def _read(self) -> None:
+        assert self._connection is not None
+        self._connection.get_input_stream().read_bytes_async(
+            READ_SIZE, GLib.PRIORITY_DEFAULT, None, self._on_read)
+
+    def _on_read(self,
+                 stream: Gio.InputStream,
+                 result: Gio.AsyncResult) -> None:
+
+        try:
+            data = stream.read_bytes_finish(result).get_data()
+        except GLib.Error as error:
+            log.info('Read failed: %s', error.message)
+            data = None
+
+        if not data:
+            log.info('Connection closed')
+            self._connection = None
+            return
+
+        assert self.session is not None
+        self.session.feed(data)
+        if self._connection is not None:
+            self._read()
+
+    def _send(self, data: str) -> None:
+        # Writes are asynchronous, the client runs in the same main loop
+        # and can only read while we are not blocked
+        self._queue.append(data.encode())
+        if not self._writing:
+            self._write()
+
+    def _write(self) -> None:
+        if self._connection is None or not self._queue:
+            self._writing = False
+            return
+
+        self._writing = True
+        data = b''.join(self._queue)
+        self._queue.clear()
+        self._connection.get_output_stream().write_all_async(
+            data, GLib.PRIORITY_DEFAULT, None, self._on_written)
+
+    def _on_written(self,
+                    stream: Gio.OutputStream,
+                    result: Gio.AsyncResult) -> None:
+
+        try:
+            stream.write_all_finish(result)
+        except GLib.Error as error:
+            log.info('Write failed: %s', error.message)
+            self._connection = None
+            self._queue.clear()
+            self._writing = False
+            return
+
+        self._write()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+
+# Generates a synthetic message archive (logs.db)
+#
+# Problems with large archives can not be reproduced without a profile
+# which was used for years. This creates an archive with a realistic
+# distribution: a few chats have most of the messages, messages arrive in
+# bursts, message lengths are log-normal distributed, group chats have
+# many different nicknames. Some messages carry additional data (OOB,
+# encryption, corrections, retractions), sent messages have markers.
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+import argparse
+import bisect
+import itertools
+import json
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from gajim.common.const import JIDConstant  # noqa: E402
+from gajim.common.const import KindConstant  # noqa: E402
+from gajim.common.storage.archive import ARCHIVE_SQL_STATEMENT  # noqa: E402
+
+YEAR = 365 * 24 * 60 * 60
+
+WORDS = [
+    'hello', 'thanks', 'the', 'server', 'is', 'down', 'again', 'did', 'you',
+    'try', 'restarting', 'it', 'works', 'for', 'me', 'now', 'see', 'below',
+    'meeting', 'tomorrow', 'at', 'noon', 'sounds', 'good', 'why', 'not',
+    'ok', 'lol', 'über', 'café', 'naïve', '😀', '👍', 'release', 'notes',
+    'build', 'failed', 'merge', 'request', 'weekend', 'coffee', 'train',
+]
+
+URLS = [
+    'https://gajim.org',
+    'https://upload.example.org/aGVsbG8/image.jpg',
+    'https://upload.example.org/d29ybGQ/recording.ogg',
+    'https://example.com/some/path?query=value',
+]
+
+# Errors are stored like CommonError.serialize() writes them
+ERROR_STANZA = ('<message xmlns="jabber:client" id="{id}" from="{jid}">'
+                '<error type="cancel"><service-unavailable '
+                'xmlns="urn:ietf:params:xml:ns:xmpp-stanzas" /></error>'
+                '</message>')
+
+BATCH_SIZE = 10000
+
+
+@dataclass
+class ArchiveConfig:
+    accounts: int = 2
+    contacts: int = 200
+    mucs: int = 30
+    # Share of messages which are group chat messages
+    muc_ratio: float = 0.6
+    messages: int = 100000
+    years: float = 5
+    seed: int = 0
+    end: Optional[float] = None
+
+
+@dataclass
+class Conversation:
+    account_id: int
+    jid_id: int
+    jid: str
+    is_muc: bool
+    start: float
+    nicks: list[str]
+    nick_weights: list[float]
+
+
+def _zipf_weights(count: int, exponent: float) -> list[float]:
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def _make_text(rand: random.Random) -> str:
+    # Log-normal length, most messages are short, a few are very long
+    length = min(4000, max(1, int(rand.lognormvariate(3.3, 1.0))))
+    words: list[str] = []
+    size = 0
+    while size < length:
+        word = rand.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+
+def _make_additional_data(rand: random.Random,
+                          text: str
+                          ) -> tuple[str, Optional[str]]:
+
+    # Returns the message and the serialized additional data
+    value = rand.random()
+    if value < 0.03:
+        url = rand.choice(URLS)
+        return url, json.dumps({'gajim': {'oob_url': url}})
+    if value < 0.08:
+        return text, json.dumps({'encrypted': {
+            'name': 'OMEMO',
+            'fingerprint': uuid.UUID(int=rand.getrandbits(128)).hex,
+            'trust': rand.randint(0, 3)}})
+    if value < 0.1:
+        original = _make_text(rand)
+        return text, json.dumps({'corrected': {'original_text': original}})
+    if value < 0.105:
+        return text, json.dumps({'retracted': {
+            'by': 'moderator@example.org',
+            'timestamp': time.time(),
+            'reason': None}})
+    if value < 0.12:
+        return text, json.dumps({'gajim': {'user_timestamp': time.time()}})
+    return text, None
+
+
+def _make_id(rand: random.Random) -> str:
+    return uuid.UUID(int=rand.getrandbits(128)).hex
+
+
+def _make_conversations(rand: random.Random,
+                        config: ArchiveConfig,
+                        end: float,
+                        jid_rows: list[tuple[int, str, int]]
+                        ) -> list[Conversation]:
+
+    span = config.years * YEAR
+    conversations: list[Conversation] = []
+    for jid_id, jid, type_ in jid_rows[config.accounts:]:
+        is_muc = type_ == JIDConstant.ROOM_TYPE
+        nicks: list[str] = []
+        if is_muc:
+            nicks = [f'nick{index}' for index in
+                     range(rand.randint(5, 300))]
+
+        # Newer chats have less history
+        start = end - span * rand.random() ** 0.5
+        conversations.append(Conversation(
+            account_id=rand.randrange(config.accounts) + 1,
+            jid_id=jid_id,
+            jid=jid,
+            is_muc=is_muc,
+            start=start,
+            nicks=nicks,
+            nick_weights=list(itertools.accumulate(
+                _zipf_weights(len(nicks), 1.2)))))
+    return conversations
+
+
+def _pick(rand: random.Random,
+          conversations: list[Conversation],
+          muc_ratio: float) -> Iterator[Conversation]:
+
+    # A few chats have most of the messages
+    chats = [c for c in conversations if not c.is_muc]
+    mucs = [c for c in conversations if c.is_muc]
+    rand.shuffle(chats)
+    rand.shuffle(mucs)
+    chat_weights = list(itertools.accumulate(_zipf_weights(len(chats), 1.1)))
+    muc_weights = list(itertools.accumulate(_zipf_weights(len(mucs), 1.1)))
+
+    while True:
+        if mucs and (not chats or rand.random() < muc_ratio):
+            yield mucs[bisect.bisect(muc_weights,
+                                     rand.random() * muc_weights[-1])]
+        else:
+            yield chats[bisect.bisect(chat_weights,
+                                      rand.random() * chat_weights[-1])]
+
+
+def _make_rows(rand: random.Random,
+               config: ArchiveConfig,
+               conversations: list[Conversation],
+               end: float) -> Iterator[tuple[Any, ...]]:
+
+    picker = _pick(rand, conversations, config.muc_ratio)
+    count = 0
+    while count < config.messages:
+        conversation = next(picker)
+        # Messages arrive in bursts, with short pauses in between
+        timestamp = conversation.start + rand.random() * (
+            end - conversation.start)
+        burst = min(int(rand.expovariate(1 / 8)) + 1,
+                    config.messages - count)
+        for _ in range(burst):
+            timestamp = min(end, timestamp + rand.expovariate(1 / 40))
+            yield _make_row(rand, conversation, timestamp)
+        count += burst
+
+
+def _make_row(rand: random.Random,
+              conversation: Conversation,
+              timestamp: float) -> tuple[Any, ...]:
+
+    text, additional_data = _make_additional_data(rand, _make_text(rand))
+    contact_name = None
+    occupant_id = None
+    stanza_id: Optional[str] = _make_id(rand)
+    message_id = _make_id(rand)
+    marker = None
+    error = None
+    subject = None
+
+    value = rand.random()
+    if conversation.is_muc:
+        kind = KindConstant.GC_MSG
+        index = bisect.bisect(conversation.nick_weights,
+                              rand.random() * conversation.nick_weights[-1])
+        contact_name = conversation.nicks[index]
+        if rand.random() < 0.3:
+            occupant_id = f'occupant-{index}'
+        if value < 0.02:
+            kind = KindConstant.GCSTATUS
+            text = f'{contact_name} has joined'
+            stanza_id = None
+        elif value < 0.021:
+            subject = text
+    elif value < 0.03:
+        kind = KindConstant.STATUS
+        text = rand.choice(['away', 'Working', 'Be right back'])
+        stanza_id = None
+    elif value < 0.55:
+        kind = KindConstant.CHAT_MSG_RECV
+    else:
+        kind = KindConstant.CHAT_MSG_SENT
+        stanza_id = None
+        marker_value = rand.random()
+        if marker_value < 0.5:
+            marker = 1
+        elif marker_value < 0.75:
+            marker = 0
+        elif marker_value < 0.752:
+            error = ERROR_STANZA.format(id=message_id, jid=conversation.jid)
+
+    return (conversation.account_id,
+            conversation.jid_id,
+            contact_name,
+            occupant_id,
+            timestamp,
+            kind,
+            text,
+            error,
+            subject,
+            additional_data,
+            stanza_id,
+            message_id,
+            marker)
+
+
+def generate(path: Path, config: ArchiveConfig) -> None:
+    '''
+    Writes a new archive to path
+    '''
+
+    if config.accounts < 1 or config.contacts + config.mucs < 1:
+        raise ValueError('At least one account and one chat are needed')
+
+    rand = random.Random(config.seed)
+    end = config.end or time.time()
+
+    con = sqlite3.connect(path)
+    con.executescript(ARCHIVE_SQL_STATEMENT)
+    con.execute('PRAGMA journal_mode=WAL')
+
+    jid_rows: list[tuple[int, str, int]] = []
+    jids = itertools.chain(
+        ((f'user{index}@example.org', JIDConstant.NORMAL_TYPE)
+         for index in range(config.accounts)),
+        ((f'contact{index}@example.org', JIDConstant.NORMAL_TYPE)
+         for index in range(config.contacts)),
+        ((f'room{index}@conference.example.org', JIDConstant.ROOM_TYPE)
+         for index in range(config.mucs)))
+    for jid_id, (jid, type_) in enumerate(jids, start=1):
+        jid_rows.append((jid_id, jid, type_))
+
+    con.executemany('INSERT INTO jids (jid_id, jid, type) VALUES (?, ?, ?)',
+                    jid_rows)
+
+    conversations = _make_conversations(rand, config, end, jid_rows)
+    sql = '''
+        INSERT INTO logs (account_id, jid_id, contact_name, occupant_id,
+                          time, kind, message, error, subject,
+                          additional_data, stanza_id, message_id, marker)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        '''
+
+    rows = _make_rows(rand, config, conversations, end)
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+        con.executemany(sql, batch)
+
+    archive_rows = [
+        (jid_id, _make_id(rand), None,
+         end if type_ == JIDConstant.ROOM_TYPE else None)
+        for jid_id, _jid, type_ in jid_rows
+        if type_ == JIDConstant.ROOM_TYPE or jid_id <= config.accounts]
+    con.executemany('''
+        INSERT INTO last_archive_message
+        (jid_id, last_mam_id, oldest_mam_timestamp, last_muc_timestamp)
+        VALUES (?, ?, ?, ?)''', archive_rows)
+
+    con.commit()
+    con.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic message archive')
+    parser.add_argument('output', type=Path,
+                        help='Path of the generated logs.db')
+    parser.add_argument('--accounts', type=int, default=2,
+                        help='Number of accounts')
+    parser.add_argument('--contacts', type=int, default=200,
+                        help='Number of contacts with 1:1 chats')
+    parser.add_argument('--mucs', type=int, default=30,
+                        help='Number of group chats')
+    parser.add_argument('--muc-ratio', type=float, default=0.6,
+                        help='Share of group chat messages')
+    parser.add_argument('--messages', type=int, default=100000,
+                        help='Number of messages')
+    parser.add_argument('--years', type=float, default=5,
+                        help='Number of years the archive spans')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for generating the archive')
+    args = parser.parse_args()
+
+    if args.output.exists():
+        sys.exit(f'{args.output} exists already')
+
+    config = ArchiveConfig(accounts=args.accounts,
+                           contacts=args.contacts,
+                           mucs=args.mucs,
+                           muc_ratio=args.muc_ratio,
+                           messages=args.messages,
+                           years=args.years,
+                           seed=args.seed)
+
+    start = time.perf_counter()
+    generate(args.output, config)
+    print(f'Generated {args.messages} messages in '
+          f'{time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
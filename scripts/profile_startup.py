@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+# Profiles the startup of Gajim
+#
+# Reports the slowest imports (using python -X importtime), checks that
+# optional subsystems are not imported on startup and measures the time
+# until the first window is shown. Results can be stored as a baseline,
+# later runs fail if they are slower than the baseline.
+
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_CODE = '''
+from gajim.gajim import _check_required_deps
+_check_required_deps()
+from gajim import gui
+gui.init('gtk')
+from gajim.gui.application import GajimApplication
+'''
+
+FIRST_WINDOW_CODE = '''
+import os
+import sys
+import time
+
+from gajim import gajim as gajim_main
+
+run_app = gajim_main._run_app
+
+def _run_app():
+    from gi.repository import GObject
+    from gi.repository import Gtk
+
+    def _on_map(window, *args):
+        print('FIRST_WINDOW', time.time(), type(window).__name__, flush=True)
+        os._exit(0)
+
+    GObject.add_emission_hook(Gtk.Window, 'map-event', _on_map)
+    run_app()
+
+gajim_main._run_app = _run_app
+sys.argv = ['gajim', '--config-path', sys.argv[1]]
+gajim_main.main()
+'''
+
+# Modules which are expensive and only needed for rarely used features,
+# they must not be imported before the first window is shown
+LAZY_MODULES = [
+    'gi.repository.Farstream',
+    'gi.repository.Gst',
+    'gi.repository.GstPbutils',
+    'gajim.common.jingle_rtp',
+    'gajim.gui.about',
+    'gajim.gui.account_wizard',
+    'gajim.gui.accounts',
+    'gajim.gui.call_window',
+    'gajim.gui.discovery',
+    'gajim.gui.gstreamer',
+    'gajim.gui.preview_audio',
+    'gajim.gui.start_chat',
+    'gajim.gui.video_preview',
+]
+
+DEFAULT_THRESHOLD = 0.1
+
+
+class ImportTime(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    imports: list[ImportTime] = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+
+        self_us, cumulative_us, name = fields
+        try:
+            imports.append(ImportTime(name.strip(),
+                                      int(self_us),
+                                      int(cumulative_us)))
+        except ValueError:
+            # Header line
+            continue
+    return imports
+
+
+def run_importtime() -> list[ImportTime]:
+    result = subprocess.run([sys.executable, '-X', 'importtime',
+                             '-c', IMPORT_CODE],
+                            cwd=REPO_DIR,
+                            capture_output=True,
+                            text=True,
+                            check=False)
+    if result.returncode != 0:
+        sys.exit(f'Importing Gajim failed:\n{result.stderr}')
+    return parse_importtime(result.stderr)
+
+
+def measure_first_window(config_path: Optional[str],
+                         timeout: int) -> float:
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        start = time.time()
+        result = subprocess.run([sys.executable, '-c', FIRST_WINDOW_CODE,
+                                 config_path or tmp_dir],
+                                cwd=REPO_DIR,
+                                capture_output=True,
+                                text=True,
+                                timeout=timeout,
+                                check=False)
+
+    for line in result.stdout.splitlines():
+        if line.startswith('FIRST_WINDOW'):
+            _, timestamp, _window = line.split()
+            return float(timestamp) - start
+
+    sys.exit(f'Gajim did not show a window:\n{result.stderr}')
+
+
+def print_imports(imports: list[ImportTime], count: int) -> None:
+    print(f'{"self [ms]":>10} {"cumulative [ms]":>16}  module')
+    imports = sorted(imports, key=lambda i: i.cumulative_us, reverse=True)
+    for import_time in imports[:count]:
+        print(f'{import_time.self_us / 1000:>10.1f} '
+              f'{import_time.cumulative_us / 1000:>16.1f}  '
+              f'{import_time.name}')
+
+
+def check_lazy_modules(imports: list[ImportTime]) -> list[str]:
+    imported = {import_time.name for import_time in imports}
+    return [module for module in LAZY_MODULES if module in imported]
+
+
+def compare(results: dict[str, Any],
+            baseline: dict[str, Any],
+            threshold: float) -> bool:
+
+    success = True
+    for key in ('import_time', 'first_window'):
+        if key not in results or key not in baseline:
+            continue
+
+        change = results[key] / baseline[key] - 1
+        print(f'{key}: {results[key]:.3f}s '
+              f'(baseline {baseline[key]:.3f}s, {change:+.1%})')
+        if change > threshold:
+            print(f'  Regression, more than {threshold:.0%} slower')
+            success = False
+    return success
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Profile Gajim startup')
+    parser.add_argument('--count', type=int, default=30,
+                        help='Number of slowest imports to show')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of runs, the median is reported')
+    parser.add_argument('--first-window', action='store_true',
+                        help='Measure the time until the first window is '
+                             'shown, needs a display')
+    parser.add_argument('--config-path',
+                        help='Configuration directory used for measuring '
+                             'the first window, defaults to an empty one')
+    parser.add_argument('--timeout', type=int, default=60,
+                        help='Seconds to wait for the first window')
+    parser.add_argument('--baseline', type=Path,
+                        help='Compare against this baseline file')
+    parser.add_argument('--save-baseline', type=Path,
+                        help='Write the results to this baseline file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown compared to the baseline')
+    args = parser.parse_args()
+
+    runs = [run_importtime() for _ in range(args.runs)]
+    totals = [sum(i.self_us for i in imports) / 1_000_000
+              for imports in runs]
+    results: dict[str, Any] = {
+        'import_time': statistics.median(totals),
+    }
+
+    print_imports(runs[-1], args.count)
+    print(f'\nTotal import time: {results["import_time"]:.3f}s')
+
+    eager = check_lazy_modules(runs[-1])
+    for module in eager:
+        print(f'Imported on startup, should be loaded lazily: {module}')
+
+    if args.first_window:
+        durations = [measure_first_window(args.config_path, args.timeout)
+                     for _ in range(args.runs)]
+        results['first_window'] = statistics.median(durations)
+        print(f'Time to first window: {results["first_window"]:.3f}s')
+
+    success = not eager
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding='utf8'))
+        success = compare(results, baseline, args.threshold) and success
+
+    if args.save_baseline is not None:
+        args.save_baseline.write_text(json.dumps(results, indent=2),
+                                      encoding='utf8')
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
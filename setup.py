@@ -193,6 +193,7 @@ def run(self):
     entry_points={
         'console_scripts': [
             'gajim-remote = gajim.gajim_remote:main',
+            'gajim-headless = gajim.gajim:main_headless',
         ],
         'gui_scripts': [
             'gajim = gajim.gajim:main',
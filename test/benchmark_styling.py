@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+# Benchmarks message styling and URI detection
+#
+# A corpus of chat messages is rendered several times, like it happens
+# when chats are opened again or scrolled back. Parsing every time is
+# compared with the parsing cache, the hit rate of the cache is reported.
+
+from typing import Callable
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+WORDS = [
+    'hello', 'thanks', 'the', 'server', 'is', 'down', 'again', 'did', 'you',
+    'try', 'restarting', 'it', 'works', 'for', 'me', 'now', 'see', 'below',
+    'meeting', 'tomorrow', 'at', 'noon', 'sounds', 'good', 'why', 'not',
+    'ok', 'lol', 'über', 'café', 'naïve', '😀', '👍', 'release', 'notes',
+]
+
+URIS = [
+    'https://gajim.org',
+    'https://dev.gajim.org/gajim/gajim/-/issues/11001',
+    'https://example.com/some/path?query=value&other=1#fragment',
+    'xmpp:gajim@conference.gajim.org?join',
+    'mailto:juliet@example.com',
+    'geo:37.786971,-122.399677',
+]
+
+JIDS = [
+    'juliet@capulet.lit',
+    'romeo@montague.lit',
+]
+
+CODE = '''```
+def main() -> None:
+    print('Hello World')
+```'''
+
+
+def make_sentence(rand: random.Random) -> str:
+    words = rand.choices(WORDS, k=rand.randint(2, 16))
+    if rand.random() < 0.15:
+        index = rand.randrange(len(words))
+        directive = rand.choice('*_~`')
+        words[index] = f'{directive}{words[index]}{directive}'
+    if rand.random() < 0.1:
+        words.insert(rand.randrange(len(words) + 1), rand.choice(JIDS))
+    return ' '.join(words)
+
+
+def make_message(rand: random.Random) -> str:
+    kind = rand.random()
+    if kind < 0.6:
+        return make_sentence(rand)
+    if kind < 0.75:
+        return f'{make_sentence(rand)} {rand.choice(URIS)}'
+    if kind < 0.82:
+        # File transfers and locations, these are previewed
+        return rand.choice(URIS)
+    if kind < 0.9:
+        lines = [make_sentence(rand) for _ in range(rand.randint(2, 5))]
+        return '\n'.join(lines)
+    if kind < 0.95:
+        return f'> {make_sentence(rand)}\n{make_sentence(rand)}'
+    if kind < 0.98:
+        return f'{make_sentence(rand)}\n{CODE}'
+    return f'/me {make_sentence(rand)}'
+
+
+def make_corpus(size: int, seed: int) -> list[str]:
+    rand = random.Random(seed)
+    return [make_message(rand) for _ in range(size)]
+
+
+def measure(func: Callable[[], object], runs: int) -> list[float]:
+    times: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def print_times(name: str, times: list[float]) -> None:
+    print(f'{name:<32} '
+          f'median {statistics.median(times) * 1000:>10.2f} ms  '
+          f'max {max(times) * 1000:>10.2f} ms')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Benchmark message styling and URI detection')
+    parser.add_argument('--messages', type=int, default=2000,
+                        help='Number of messages in the corpus')
+    parser.add_argument('--history', type=int, default=200,
+                        help='Number of messages rendered when opening a chat')
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Number of times the chat is opened')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for generating the corpus')
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(REPO_DIR))
+    from gajim import gui
+    gui.init('gtk')
+
+    from gajim.common import app
+    app.settings = MagicMock()
+    app.settings.get = MagicMock(return_value='')
+
+    from gajim.common import styling
+
+    corpus = make_corpus(args.messages, args.seed)
+    history = corpus[-args.history:]
+
+    def render(process: Callable[[str], object],
+               process_uris: Callable[[str], object],
+               is_uri: Callable[[str], bool]) -> None:
+
+        # Like ConversationView, previews are detected first, action
+        # phrases only need URIs, all other messages are styled
+        for text in history:
+            if is_uri(text):
+                continue
+            if text.startswith('/me'):
+                process_uris(text)
+                continue
+            process(text)
+
+    def is_uri(text: str) -> bool:
+        return styling.IRI_RX.fullmatch(text) is not None
+
+    print(f'{len(corpus)} messages, {len(history)} rendered per chat')
+
+    print_times('Parse corpus', measure(
+        lambda: [styling.process(text) for text in corpus], 1))
+
+    print_times('Open chat (uncached)', measure(
+        lambda: render(styling.process, styling.process_uris, is_uri),
+        args.runs))
+
+    cache = styling.ParsingCache()
+    print_times('Open chat (cached)', measure(
+        lambda: render(cache.process, cache.process_uris, cache.is_uri),
+        args.runs))
+
+    stats = cache.get_stats()
+    print(f'Cache: {stats.size} entries, {stats.hits} hits, '
+          f'{stats.misses} misses, hit rate {stats.hit_rate:.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import unittest
+from functools import cmp_to_key
+
+from gajim import gui
+gui.init('gtk')
+
+from gajim.gtk.chat_list import ChatList  # noqa: E402
+
+
+class Row:
+    def __init__(self, chat_list: FakeChatList, timestamp: float) -> None:
+        self._chat_list = chat_list
+        self.timestamp = timestamp
+        self.is_pinned = False
+        self.position = -1
+        # Controls the order in which changed rows are processed
+        self.hash = id(self)
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def get_index(self) -> int:
+        return self._chat_list.rows.index(self)
+
+    def changed(self) -> None:
+        self._chat_list.insert_sorted(self)
+
+
+class FakeChatList:
+    # Row sorting of ChatList on a plain list, Gtk.ListBoxRow.changed()
+    # re-inserts the row with a binary search like GSequence does
+    _process_changed_rows = ChatList._process_changed_rows
+    _is_sorted = ChatList._is_sorted
+    _sort_func = ChatList._sort_func
+
+    def __init__(self, timestamps: list[float]) -> None:
+        self._mouseover = False
+        self._changed_rows: set[Row] = set()
+        self._changed_source_id = None
+        self.rows = [Row(self, timestamp) for timestamp in timestamps]
+        self.invalidate_sort()
+
+    def get_row_at_index(self, index: int) -> Row | None:
+        if 0 <= index < len(self.rows):
+            return self.rows[index]
+        return None
+
+    def invalidate_sort(self) -> None:
+        self.rows.sort(key=cmp_to_key(self._sort_func))
+
+    def insert_sorted(self, row: Row) -> None:
+        self.rows.remove(row)
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            if self._sort_func(self.rows[middle], row) < 0:
+                low = middle + 1
+            else:
+                high = middle
+        self.rows.insert(low, row)
+
+    def update(self, index: int, timestamp: float) -> None:
+        row = self.rows[index]
+        row.timestamp = timestamp
+        self._changed_rows.add(row)
+
+    def get_timestamps(self) -> list[float]:
+        return [row.timestamp for row in self.rows]
+
+
+class ChatListSortTest(unittest.TestCase):
+    def test_single_row_moves(self) -> None:
+        chat_list = FakeChatList([50, 40, 30, 20])
+        chat_list.update(2, 100)
+        chat_list._process_changed_rows()
+        self.assertEqual(chat_list.get_timestamps(), [100, 50, 40, 20])
+
+    def test_changed_rows_stay(self) -> None:
+        chat_list = FakeChatList([50, 40, 30, 20])
+        chat_list.update(1, 45)
+        chat_list.update(2, 35)
+        chat_list._process_changed_rows()
+        self.assertEqual(chat_list.get_timestamps(), [50, 45, 35, 20])
+
+    def test_two_rows_move(self) -> None:
+        for first, second in ((1, 3), (3, 1)):
+            chat_list = FakeChatList([101, 100, 50, 40, 30])
+            # Order before sorting: X50, A100, Y40, B101, Z30
+            chat_list.rows = [chat_list.rows[index]
+                              for index in (2, 1, 3, 0, 4)]
+            chat_list.rows[first].hash = 1
+            chat_list.rows[second].hash = 2
+            chat_list.update(1, 100)
+            chat_list.update(3, 101)
+            chat_list._process_changed_rows()
+            self.assertEqual(chat_list.get_timestamps(),
+                             [101, 100, 50, 40, 30])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from gajim.gtk.emoji_data_gtk import EmojiIndex
+from gajim.gtk.emoji_data_gtk import EmojiMatch
+
+
+class EmojiIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._index = EmojiIndex({
+            'cat': {'cat': '🐈', 'cat face': '🐱'},
+            'cat face': {'cat face': '🐱'},
+            'dog': {'dog': '🐕'},
+            'grinning': {'grinning face': '😀'},
+        })
+
+    def test_search(self) -> None:
+        self.assertEqual(self._index.search('ca', 10), [
+            EmojiMatch('cat', 'cat', '🐈'),
+            EmojiMatch('cat', 'cat face', '🐱'),
+            EmojiMatch('cat face', 'cat face', '🐱'),
+        ])
+        self.assertEqual(self._index.search('do', 10),
+                         [EmojiMatch('dog', 'dog', '🐕')])
+        self.assertEqual(self._index.search('e', 10), [])
+        self.assertEqual(self._index.search('zebra', 10), [])
+
+    def test_search_limit(self) -> None:
+        self.assertEqual(self._index.search('c', 1),
+                         [EmojiMatch('cat', 'cat', '🐈')])
+        self.assertEqual(len(self._index.search('', 3)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
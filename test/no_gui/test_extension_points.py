@@ -0,0 +1,50 @@
+import gc
+import unittest
+
+from gajim.plugins.extension_points import ExtensionPointRegistry
+
+
+class Control:
+    pass
+
+
+class ExtensionPointRegistryTest(unittest.TestCase):
+    def test_add_and_remove(self) -> None:
+        registry = ExtensionPointRegistry()
+        control = Control()
+
+        registry.add('chat_control', (control, 'account'))
+        registry.add('chat_control', (control, 'account'))
+        registry.add('chat_control', (control, 'other'))
+        self.assertEqual(list(registry.get_calls('chat_control')),
+                         [(control, 'account'), (control, 'other')])
+
+        registry.remove('chat_control', control)
+        self.assertNotIn('chat_control', registry)
+        self.assertEqual(list(registry.get_calls('chat_control')), [])
+
+    def test_weak_reference(self) -> None:
+        registry = ExtensionPointRegistry()
+        control = Control()
+        registry.add('chat_control', (control,))
+        registry.add('roster', ('account',))
+        self.assertEqual(len(registry), 2)
+
+        del control
+        gc.collect()
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(list(registry.get_calls('roster')), [('account',)])
+
+    def test_remove_by_value(self) -> None:
+        registry = ExtensionPointRegistry()
+        account = ''.join(['acc', 'ount'])
+        registry.add('roster', (account, 'jid'))
+        registry.add('roster', ('account', 'other'))
+        self.assertEqual(len(registry), 1)
+
+        registry.remove('roster', 'account')
+        self.assertNotIn('roster', registry)
+
+
+if __name__ == '__main__':
+    unittest.main()
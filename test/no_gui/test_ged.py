@@ -0,0 +1,105 @@
+import unittest
+from dataclasses import dataclass
+from dataclasses import field
+
+from nbxmpp import NodeProcessed
+
+from gajim.common.events import ApplicationEvent
+from gajim.common.ged import GlobalEventsDispatcher
+
+
+@dataclass
+class DummyEvent(ApplicationEvent):
+    name: str = field(init=False, default='test-event')
+
+
+class GedTest(unittest.TestCase):
+    def test_priority_order(self) -> None:
+        ged = GlobalEventsDispatcher()
+        called: list[int] = []
+
+        def handler1(_event: DummyEvent) -> None:
+            called.append(1)
+
+        def handler2(_event: DummyEvent) -> None:
+            called.append(2)
+
+        ged.register_event_handler('test-event', 20, handler2)
+        ged.register_event_handler('test-event', 10, handler1)
+        ged.raise_event(DummyEvent())
+        self.assertEqual(called, [1, 2])
+
+        ged.remove_event_handler('test-event', 10, handler1)
+        ged.raise_event(DummyEvent())
+        self.assertEqual(called, [1, 2, 2])
+
+    def test_stop_and_node_processed(self) -> None:
+        ged = GlobalEventsDispatcher()
+        called: list[str] = []
+
+        def processed(_event: DummyEvent) -> None:
+            called.append('processed')
+            raise NodeProcessed
+
+        def stop(_event: DummyEvent) -> bool:
+            called.append('stop')
+            return True
+
+        def never(_event: DummyEvent) -> None:
+            called.append('never')
+
+        ged.register_event_handler('test-event', 10, processed)
+        ged.register_event_handler('test-event', 20, stop)
+        ged.register_event_handler('test-event', 30, never)
+        self.assertTrue(ged.raise_event(DummyEvent()))
+        self.assertEqual(called, ['processed', 'stop'])
+
+        ged.remove_event_handler('test-event', 20, stop)
+        self.assertRaises(NodeProcessed, ged.raise_event, DummyEvent())
+
+    def test_modify_during_dispatch(self) -> None:
+        ged = GlobalEventsDispatcher()
+        called: list[str] = []
+
+        def late(_event: DummyEvent) -> None:
+            called.append('late')
+
+        def register(_event: DummyEvent) -> None:
+            called.append('register')
+            ged.register_event_handler('test-event', 20, late)
+
+        ged.register_event_handler('test-event', 10, register)
+        ged.raise_event(DummyEvent())
+        self.assertEqual(called, ['register'])
+
+        ged.raise_event(DummyEvent())
+        self.assertEqual(called, ['register', 'register', 'late'])
+
+    def test_profiling(self) -> None:
+        ged = GlobalEventsDispatcher()
+
+        def handler(_event: DummyEvent) -> None:
+            pass
+
+        ged.register_event_handler('test-event', 10, handler)
+        ged.raise_event(DummyEvent())
+        self.assertEqual(ged.get_profiling_stats(), [])
+
+        ged.start_profiling()
+        ged.raise_event(DummyEvent())
+        ged.raise_event(DummyEvent())
+
+        stats = ged.get_profiling_stats()
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0].event_name, 'test-event')
+        self.assertEqual(stats[0].calls, 2)
+        self.assertTrue(stats[0].handler.endswith('handler'))
+        self.assertGreaterEqual(stats[0].total_time, stats[0].max_time)
+        self.assertIn('test-event', ged.get_profiling_report())
+
+        ged.stop_profiling()
+        self.assertFalse(ged.profiling)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent.parent
+
+GUI_MODULES = '''
+print([name for name in sys.modules
+       if name.startswith('gajim.gui.') or
+       name in ('gi.repository.Gtk', 'gi.repository.Gdk')])
+'''
+
+# The GUI finder is not installed, importing from gajim.gui fails
+IMPORT_CODE = '''
+import pkgutil
+import sys
+from importlib import import_module
+
+from gajim.common import app
+from gajim.common.headless import HeadlessApplication
+from gajim.common import modules
+from gajim.common.dbus import logind
+from gajim.common.dbus import remote_control
+
+for module in pkgutil.iter_modules(modules.__path__):
+    import_module(f'gajim.common.modules.{module.name}')
+''' + GUI_MODULES
+
+# Like main_headless(), nothing of Gajim is imported before
+HEADLESS_IMPORT_CODE = '''
+import sys
+
+from gajim.common.headless import HeadlessApplication
+''' + GUI_MODULES
+
+# Starts the application with an empty profile and shuts it down after
+# auto connect
+RUN_CODE = '''
+import sys
+
+from gajim.gajim import _check_core_deps
+_check_core_deps()
+
+from gajim.common.headless import HeadlessApplication
+
+application = HeadlessApplication()
+auto_connect = application._auto_connect
+
+
+def _auto_connect() -> None:
+    auto_connect()
+    print('auto connect')
+    application.start_shutdown()
+
+
+application._auto_connect = _auto_connect
+result = application.run([
+    'gajim-headless', '--config-path', sys.argv[1], '--profile', sys.argv[2]])
+print('exit', result)
+''' + GUI_MODULES
+
+
+class HeadlessTest(unittest.TestCase):
+    def _run(self, *args: str) -> list[str]:
+        result = subprocess.run([sys.executable, '-c', *args],
+                                cwd=REPO_DIR,
+                                capture_output=True,
+                                text=True,
+                                check=False,
+                                timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout.splitlines()
+
+    def test_core_without_gui(self) -> None:
+        output = self._run(IMPORT_CODE)
+        self.assertEqual(output[-1], '[]')
+
+    def test_import_headless_first(self) -> None:
+        output = self._run(HEADLESS_IMPORT_CODE)
+        self.assertEqual(output[-1], '[]')
+
+    def test_startup_and_shutdown(self) -> None:
+        with tempfile.TemporaryDirectory() as config_path:
+            output = self._run(RUN_CODE, config_path, f'test{os.getpid()}')
+            self.assertTrue((Path(config_path) / 'settings.sqlite').exists())
+
+        self.assertIn('auto connect', output)
+        self.assertIn('exit 0', output)
+        self.assertEqual(output[-1], '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from gajim.common import app
+from gajim.common.highlight import HighlightMatcher
+from gajim.common.highlight import HighlightMatchers
+
+
+class HighlightMatcherTest(unittest.TestCase):
+    def test_matches(self) -> None:
+        matcher = HighlightMatcher(['', 'Alice', 'me@example.org', 'c++'])
+
+        self.assertTrue(matcher.matches('alice: hi'))
+        self.assertTrue(matcher.matches('Hi ALICE!'))
+        self.assertTrue(matcher.matches('alice2'))
+        self.assertTrue(matcher.matches('write to me@example.org'))
+        self.assertTrue(matcher.matches('I like c++'))
+        self.assertTrue(matcher.matches('malice and alice'))
+
+        self.assertFalse(matcher.matches('malice'))
+        self.assertFalse(matcher.matches('alicex'))
+        self.assertFalse(matcher.matches(''))
+
+    def test_shorter_word_matches(self) -> None:
+        # Neither word matches at the start of 'bobbyx', but 'bob' matches
+        # later in the text
+        matcher = HighlightMatcher(['bob', 'bobby'])
+        self.assertFalse(matcher.matches('bobbyx'))
+        self.assertTrue(matcher.matches('bobbyx bob'))
+
+    def test_no_words(self) -> None:
+        matcher = HighlightMatcher([''])
+        self.assertFalse(matcher.matches('anything'))
+
+    def test_cache(self) -> None:
+        with patch.object(app, 'settings', MagicMock()) as settings:
+            settings.get.return_value = 'gajim;xmpp'
+            matchers = HighlightMatchers()
+            matcher = matchers.get('nick', 'me@example.org')
+            self.assertIs(matchers.get('nick', 'me@example.org'), matcher)
+            self.assertTrue(matcher.matches('I use Gajim'))
+            settings.connect_signal.assert_called_once()
+
+            settings.get.return_value = 'python'
+            matchers._on_highlight_words_changed()
+            matcher = matchers.get('nick', 'me@example.org')
+            self.assertFalse(matcher.matches('I use Gajim'))
+            self.assertTrue(matcher.matches('I use Python'))
+
+
+if __name__ == '__main__':
+    unittest.main()
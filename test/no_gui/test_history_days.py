@@ -0,0 +1,144 @@
+import datetime
+import os
+import sqlite3
+import time
+import unittest
+
+from gajim.common.const import KindConstant
+from gajim.common.storage.archive import ARCHIVE_SQL_STATEMENT
+from gajim.common.storage.archive import HISTORY_DAYS_REBUILD_STATEMENTS
+from gajim.common.storage.archive import HISTORY_DAYS_TIMEZONE_CHANGED
+
+NOON = datetime.datetime(2022, 3, 14, 12).timestamp()
+DAY = 24 * 60 * 60
+
+
+class HistoryDaysTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._con = sqlite3.connect(':memory:')
+        self._con.executescript(ARCHIVE_SQL_STATEMENT)
+        self._con.execute(
+            'INSERT INTO jids (jid_id, jid, type) VALUES (1, ?, 0)',
+            ('romeo@example.org',))
+
+    def tearDown(self) -> None:
+        self._con.close()
+
+    def _insert(self,
+                timestamp: float,
+                kind: KindConstant = KindConstant.CHAT_MSG_RECV) -> int:
+
+        cursor = self._con.execute(
+            'INSERT INTO logs (account_id, jid_id, time, kind) '
+            'VALUES (1, 1, ?, ?)', (timestamp, kind))
+        assert cursor.lastrowid is not None
+        return cursor.lastrowid
+
+    def _delete(self, log_line_id: int) -> None:
+        self._con.execute('DELETE FROM logs WHERE log_line_id = ?',
+                          (log_line_id,))
+
+    def _rebuild(self) -> None:
+        for statement in HISTORY_DAYS_REBUILD_STATEMENTS:
+            self._con.execute(statement)
+
+    def _timezone_changed(self) -> bool:
+        return bool(
+            self._con.execute(HISTORY_DAYS_TIMEZONE_CHANGED).fetchone()[0])
+
+    def _get_days(self) -> list[tuple[str, int, int, int]]:
+        return self._con.execute(
+            'SELECT day, messages, first_log_line_id, last_log_line_id '
+            'FROM history_days ORDER BY day').fetchall()
+
+    def test_insert(self) -> None:
+        day = datetime.date.fromtimestamp(NOON).isoformat()
+        next_day = datetime.date.fromtimestamp(NOON + DAY).isoformat()
+
+        self._insert(NOON)
+        first = self._insert(NOON - 60)
+        last = self._insert(NOON + 60)
+        self._insert(NOON + 120, KindConstant.STATUS)
+        other = self._insert(NOON + DAY)
+
+        self.assertEqual(self._get_days(),
+                         [(day, 3, first, last),
+                          (next_day, 1, other, other)])
+
+    def test_same_time(self) -> None:
+        day = datetime.date.fromtimestamp(NOON).isoformat()
+        first = self._insert(NOON)
+        last = self._insert(NOON)
+        self.assertEqual(self._get_days(), [(day, 2, first, last)])
+
+    def test_delete(self) -> None:
+        day = datetime.date.fromtimestamp(NOON).isoformat()
+
+        first = self._insert(NOON - 60)
+        middle = self._insert(NOON)
+        last = self._insert(NOON + 60)
+
+        self._delete(first)
+        self.assertEqual(self._get_days(), [(day, 2, middle, last)])
+
+        self._delete(last)
+        self.assertEqual(self._get_days(), [(day, 1, middle, middle)])
+
+        self._delete(middle)
+        self.assertEqual(self._get_days(), [])
+
+    def test_rebuild(self) -> None:
+        day = datetime.date.fromtimestamp(NOON).isoformat()
+        next_day = datetime.date.fromtimestamp(NOON + DAY).isoformat()
+
+        first = self._insert(NOON - 60)
+        self._insert(NOON)
+        last = self._insert(NOON + 60)
+        self._insert(NOON + 120, KindConstant.STATUS)
+        other = self._insert(NOON + DAY)
+        expected = self._get_days()
+
+        self._rebuild()
+
+        self.assertEqual(self._get_days(), expected)
+        self.assertEqual(self._get_days(),
+                         [(day, 3, first, last),
+                          (next_day, 1, other, other)])
+
+    def test_timezone_change(self) -> None:
+        timezone = os.environ.get('TZ')
+
+        def set_timezone(name: str) -> None:
+            os.environ['TZ'] = name
+            time.tzset()
+
+        def reset_timezone() -> None:
+            if timezone is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = timezone
+            time.tzset()
+
+        self.addCleanup(reset_timezone)
+
+        set_timezone('UTC')
+        self.assertTrue(self._timezone_changed())
+        self._rebuild()
+        self.assertFalse(self._timezone_changed())
+
+        evening = datetime.datetime(
+            2022, 3, 14, 23, tzinfo=datetime.timezone.utc).timestamp()
+        log_line_id = self._insert(evening)
+        self.assertEqual(self._get_days(),
+                         [('2022-03-14', 1, log_line_id, log_line_id)])
+
+        set_timezone('Europe/Berlin')
+        self.assertTrue(self._timezone_changed())
+        self._rebuild()
+        self.assertFalse(self._timezone_changed())
+        self.assertEqual(self._get_days(),
+                         [('2022-03-15', 1, log_line_id, log_line_id)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from gajim.common import modules
+
+
+class LazyModulesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._client = MagicMock()
+        self._client.account = 'account'
+        modules._modules['account'] = {}
+        modules._clients['account'] = self._client
+
+    def tearDown(self) -> None:
+        del modules._modules['account']
+        del modules._clients['account']
+
+    def test_load_on_get(self) -> None:
+        self.assertNotIn('Search', modules._modules['account'])
+        search = modules.get('account', 'Search')
+        self.assertIs(modules.get('account', 'Search'), search)
+        self._client.register_handlers.assert_called_once_with([])
+
+        with self.assertRaises(KeyError):
+            modules.get('account', 'Unknown')
+
+    def test_load_on_stanza(self) -> None:
+        handlers = modules._get_trigger_handlers('account')
+        ibb_handlers = [handler for handler in handlers
+                        if handler.callback.args[1] == 'IBB']
+        self.assertEqual(len(ibb_handlers), 1)
+
+        with patch('gajim.common.modules.ibb.IBB._ibb_received') as received:
+            ibb_handlers[0].callback('nbxmpp_client', 'stanza', 'properties')
+            received.assert_called_once_with(
+                'nbxmpp_client', 'stanza', 'properties')
+
+            # The stub does nothing once the module is loaded
+            ibb_handlers[0].callback('nbxmpp_client', 'stanza', 'properties')
+            received.assert_called_once()
+
+        self.assertIn('IBB', modules._modules['account'])
+        self.assertNotIn('IBB', [handler.callback.args[1] for handler in
+                                 modules._get_trigger_handlers('account')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import threading
+import traceback
+import unittest
+
+from gajim.common.main_loop_monitor import MainLoopMonitor
+from gajim.common.main_loop_monitor import StallContext
+
+
+class MainLoopMonitorTest(unittest.TestCase):
+    def test_capture_main_thread(self) -> None:
+        monitor = MainLoopMonitor()
+        # Pretend this method is the main loop
+        monitor._base_depth = len(traceback.extract_stack())
+
+        captures = []
+        thread = threading.Thread(
+            target=lambda: captures.append(monitor._capture_main_thread()))
+
+        def blocking_callback() -> None:
+            thread.start()
+            thread.join()
+
+        blocking_callback()
+
+        context, stack = captures[0]
+        self.assertTrue(context.callback.startswith('blocking_callback'))
+        self.assertIsNone(context.storage_method)
+        self.assertIn('blocking_callback', stack)
+
+    def test_report(self) -> None:
+        monitor = MainLoopMonitor()
+        monitor._iterations = 1
+        slow = StallContext('slow', 'message-received', 'archive.insert')
+        fast = StallContext('fast', None, None)
+        monitor._record(slow, 'stack', 0.5)
+        monitor._record(slow, 'stack', 0.3)
+        monitor._record(fast, 'stack', 0.25)
+
+        offenders = monitor.get_offenders()
+        self.assertEqual([o.context for o in offenders], [slow, fast])
+        self.assertEqual(offenders[0].count, 2)
+        self.assertAlmostEqual(offenders[0].max_time, 0.5)
+        self.assertIn('archive.insert', monitor.get_report())
+
+    def test_latency_stats(self) -> None:
+        monitor = MainLoopMonitor()
+        self.assertEqual(monitor.get_latency_stats().iterations, 0)
+
+        monitor._iterations = 4
+        monitor._total_latency = 0.2
+        monitor._max_latency = 0.15
+        stats = monitor.get_latency_stats()
+        self.assertEqual(stats.iterations, 4)
+        self.assertAlmostEqual(stats.average, 0.05)
+        self.assertAlmostEqual(stats.max, 0.15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch
+
+from gajim.common import app
+from gajim.common.const import KindConstant
+from gajim.common.storage import archive
+
+ACCOUNT_JID = 'juliet@example.org'
+JID = 'romeo@example.org'
+
+
+class MarkersTest(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = patch.object(app, 'get_jid_from_account',
+                               return_value=ACCOUNT_JID)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        with patch.object(archive.configpaths, 'get', return_value=None):
+            self._storage = archive.MessageArchiveStorage()
+        self._storage.init()
+        self.addCleanup(self._storage.shutdown)
+
+        for message_id in ('1', '2', '3'):
+            self._storage.insert_into_logs('account',
+                                           JID,
+                                           float(message_id),
+                                           KindConstant.CHAT_MSG_SENT,
+                                           message_id=message_id)
+
+    def _get_markers(self) -> dict[str, str]:
+        rows = self._storage.get_conversation_before_after(
+            'account', JID, False, 0, 10)
+        return {row.message_id: row.marker for row in rows
+                if row.marker is not None}
+
+    def test_latest_displayed_marker(self) -> None:
+        self._storage.set_marker(ACCOUNT_JID, JID, '1', 'displayed')
+        self._storage.set_marker(ACCOUNT_JID, JID, '2', 'displayed')
+        self._storage.set_marker(ACCOUNT_JID, JID, '1', 'displayed',
+                                 sender='other@example.org')
+        self._storage.flush_markers()
+        self.assertEqual(self._get_markers(),
+                         {'1': 'displayed', '2': 'displayed'})
+
+        self._storage.set_marker(ACCOUNT_JID, JID, '1', 'received')
+        self._storage.set_marker(ACCOUNT_JID, JID, '3', 'displayed')
+        self._storage.set_marker(ACCOUNT_JID, JID, '2', 'displayed')
+        self._storage.flush_markers()
+        self.assertEqual(self._get_markers(),
+                         {'1': 'displayed', '2': 'displayed'})
+
+    def test_receipt_before_displayed(self) -> None:
+        # Both arrive in the same batch, the receipt is written first
+        self._storage.set_marker(ACCOUNT_JID, JID, '1', 'displayed')
+        self._storage.set_marker(ACCOUNT_JID, JID, '1', 'received')
+        self._storage.set_marker(ACCOUNT_JID, JID, '2', 'received')
+        self._storage.flush_markers()
+        self.assertEqual(self._get_markers(),
+                         {'1': 'displayed', '2': 'received'})
+
+    def test_no_downgrade(self) -> None:
+        self._storage.set_marker(ACCOUNT_JID, JID, '1', 'displayed')
+        self._storage.flush_markers()
+        self._storage.set_marker(ACCOUNT_JID, JID, '1', 'received')
+        self._storage.flush_markers()
+        self.assertEqual(self._get_markers(), {'1': 'displayed'})
+
+    def test_flush_before_query(self) -> None:
+        self._storage.set_marker(ACCOUNT_JID, JID, '1', 'received')
+        self._storage.set_marker(ACCOUNT_JID, JID, '2', 'displayed')
+        self.assertEqual(self._get_markers(),
+                         {'1': 'received', '2': 'displayed'})
+
+        self._storage.set_marker(ACCOUNT_JID, JID, '3', 'received')
+        _before, rows = self._storage.get_conversation_around(
+            'account', JID, 3.0)
+        self.assertIn(('3', 'received'),
+                      [(row.message_id, row.marker) for row in rows])
+
+        self._storage.set_marker(ACCOUNT_JID, JID, '3', 'displayed')
+        rows = self._storage.get_conversation_between(
+            'account', JID, 4.0, 0.0)
+        self.assertIn(('3', 'displayed'),
+                      [(row.message_id, row.marker) for row in rows])
+
+    def test_unknown_jid(self) -> None:
+        self._storage.set_marker(ACCOUNT_JID, 'unknown@example.org', '1',
+                                 'displayed')
+        self._storage.flush_markers()
+        self.assertEqual(self._get_markers(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from gajim.common import events
+from gajim.common.notification_aggregator import NotificationAggregator
+from gajim.common.notification_aggregator import RATE_LIMIT
+
+
+def _make_event(jid: str, text: str = 'Hi') -> events.Notification:
+    return events.Notification(account='account',
+                               jid=jid,
+                               type='incoming-message',
+                               title=f'New message from {jid}',
+                               text=text,
+                               sound='first_message_received')
+
+
+@patch('gajim.common.notification_aggregator.GLib', MagicMock())
+@patch.object(NotificationAggregator, '_get_chat_name',
+              staticmethod(lambda event: str(event.jid)))
+class NotificationAggregatorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._sent: list[events.Notification] = []
+        self._aggregator = NotificationAggregator(self._sent.append)
+
+    @patch('time.monotonic')
+    def test_group_messages(self, monotonic: MagicMock) -> None:
+        monotonic.return_value = 100
+        self._aggregator.add(_make_event('a@example.org', 'first'))
+        self.assertEqual(len(self._sent), 1)
+        self.assertEqual(self._sent[0].title, 'New message from a@example.org')
+
+        for text in ('second', 'third'):
+            self._aggregator.add(_make_event('a@example.org', text))
+        self.assertEqual(len(self._sent), 1)
+
+        monotonic.return_value = 103
+        self.assertFalse(self._aggregator._on_flush())
+        self.assertEqual(len(self._sent), 2)
+        self.assertEqual(self._sent[1].title,
+                         '3 new messages from a@example.org')
+        self.assertEqual(self._sent[1].text, 'third')
+
+        # Reading the chat starts a new group
+        self._aggregator.remove('account', 'a@example.org')
+        monotonic.return_value = 110
+        self._aggregator.add(_make_event('a@example.org', 'fourth'))
+        self.assertEqual(self._sent[2].title, 'New message from a@example.org')
+
+    @patch('time.monotonic')
+    def test_rate_limit(self, monotonic: MagicMock) -> None:
+        monotonic.return_value = 100
+        for index in range(RATE_LIMIT + 2):
+            self._aggregator.add(_make_event(f'{index}@example.org'))
+        self.assertEqual(len(self._sent), RATE_LIMIT)
+
+        monotonic.return_value = 101
+        self.assertTrue(self._aggregator._on_flush())
+        self.assertEqual(len(self._sent), RATE_LIMIT)
+
+        monotonic.return_value = 106
+        self.assertFalse(self._aggregator._on_flush())
+        self.assertEqual(len(self._sent), RATE_LIMIT + 2)
+
+    @patch('time.monotonic')
+    def test_sound(self, monotonic: MagicMock) -> None:
+        monotonic.return_value = 100
+        self.assertTrue(self._aggregator.should_play_sound('sound'))
+        self.assertFalse(self._aggregator.should_play_sound('sound'))
+        self.assertTrue(self._aggregator.should_play_sound('other_sound'))
+
+        monotonic.return_value = 103
+        self.assertTrue(self._aggregator.should_play_sound('sound'))
+
+
+if __name__ == '__main__':
+    unittest.main()
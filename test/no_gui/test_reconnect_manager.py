@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from gajim.common.reconnect_manager import BASE_DELAY
+from gajim.common.reconnect_manager import JITTER
+from gajim.common.reconnect_manager import MAX_DELAY
+from gajim.common.reconnect_manager import STAGGER_INTERVAL
+from gajim.common.reconnect_manager import ReconnectManager
+
+
+def make_client(account: str, resumeable: bool = False) -> MagicMock:
+    client = MagicMock()
+    client.account = account
+    client.is_resumeable = resumeable
+    return client
+
+
+@patch('gajim.common.reconnect_manager.app.get_hostname_from_account',
+       new=lambda account: 'example.org')
+class ReconnectManagerTest(unittest.TestCase):
+    def test_backoff(self) -> None:
+        manager = ReconnectManager()
+        client = make_client('account1')
+
+        for failures in range(12):
+            manager._next_slot = 0
+            delay = manager.get_delay(client)
+            expected = min(MAX_DELAY, BASE_DELAY * 2 ** failures)
+            self.assertGreaterEqual(delay, expected * (1 - JITTER))
+            self.assertLessEqual(delay, expected * (1 + JITTER))
+            manager.connection_failed(client)
+
+        manager.connection_succeeded(client)
+        self.assertEqual(manager.get_failures(client), 0)
+
+    def test_failures_are_per_host(self) -> None:
+        manager = ReconnectManager()
+        manager.connection_failed(make_client('account1'))
+        self.assertEqual(manager.get_failures(make_client('account2')), 1)
+
+    def test_stagger(self) -> None:
+        manager = ReconnectManager()
+        delays = [manager.get_delay(make_client(f'account{i}'))
+                  for i in range(5)]
+        for first, second in zip(delays, delays[1:]):
+            self.assertGreaterEqual(second - first, STAGGER_INTERVAL - 0.1)
+
+    def test_resume_is_not_staggered(self) -> None:
+        manager = ReconnectManager()
+        for i in range(5):
+            manager.get_delay(make_client(f'account{i}'))
+
+        delay = manager.get_delay(make_client('resume', resumeable=True))
+        self.assertLess(delay, BASE_DELAY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from gajim.common import app
+from gajim.common.dbus import remote_control
+from gajim.common.setting_values import APP_SETTINGS
+from gajim.common.dbus.remote_control import MAX_PAGE_SIZE
+from gajim.common.dbus.remote_control import GajimRemote
+from gajim.common.dbus.remote_control import Subscription
+from gajim.common.dbus.remote_control import _get_page_size
+
+
+class RemoteControlTest(unittest.TestCase):
+    def test_subscription_filter(self) -> None:
+        subscription = Subscription(id='1',
+                                    sender=':1.1',
+                                    event_types={'message-received'},
+                                    accounts=set(),
+                                    jids={'romeo@example.org'})
+
+        self.assertTrue(subscription.matches(
+            'message-received', 'account', 'romeo@example.org'))
+        self.assertFalse(subscription.matches(
+            'message-sent', 'account', 'romeo@example.org'))
+        self.assertFalse(subscription.matches(
+            'message-received', 'account', 'juliet@example.org'))
+        self.assertEqual(subscription.get_event_types(), {'message-received'})
+
+    def test_subscription_without_filter(self) -> None:
+        subscription = Subscription(id='1',
+                                    sender=':1.1',
+                                    event_types=set(),
+                                    accounts=set(),
+                                    jids=set())
+        self.assertTrue(subscription.matches('our-show', 'account', ''))
+        self.assertIn('presence-received', subscription.get_event_types())
+
+    def test_page_size(self) -> None:
+        self.assertEqual(_get_page_size(0), MAX_PAGE_SIZE)
+        self.assertEqual(_get_page_size(10), 10)
+        self.assertEqual(_get_page_size(MAX_PAGE_SIZE + 1), MAX_PAGE_SIZE)
+
+    def test_subscribe_invalid_jid(self) -> None:
+        # Invalid arguments are rejected before the bus is used
+        remote = GajimRemote.__new__(GajimRemote)
+        with self.assertRaises(ValueError):
+            remote.subscribe(':1.1', [], [], ['@example.org'])
+
+    def test_no_event_handlers_by_default(self) -> None:
+        settings = MagicMock()
+        settings.get.side_effect = APP_SETTINGS.__getitem__
+        with patch.object(app, 'settings', settings), \
+                patch.object(remote_control, 'Gio'), \
+                patch.object(remote_control.Server, '__init__',
+                             return_value=None), \
+                patch.object(app.ged, 'register_event_handler') as register:
+            GajimRemote()
+        register.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import sqlite3
+from typing import Any
+
+from gajim.common.settings import CREATE_SQL
+from gajim.common.settings import Settings
+
+
+class Listener:
+    def __init__(self) -> None:
+        self.values: list[Any] = []
+
+    def on_change(self, value: Any, *args: Any) -> None:
+        self.values.append(value)
+
+
+class SettingsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.settings = Settings()
+        self.settings._con = sqlite3.connect(':memory:')
+        self.settings._con.row_factory = Settings._namedtuple_factory
+        self.settings._con.executescript(CREATE_SQL)
+        self.settings._load_settings()
+        self.settings._load_account_settings()
+
+    def tearDown(self) -> None:
+        self.settings.save()
+
+    def test_notify(self) -> None:
+        listener = Listener()
+        self.settings.connect_signal('ascii_formatting', listener.on_change)
+        self.settings.set_app_setting('ascii_formatting', False)
+        self.settings.set_app_setting('ascii_formatting', True)
+        self.assertEqual(listener.values, [False, True])
+
+        self.settings.disconnect_signals(listener)
+        self.settings.set_app_setting('ascii_formatting', False)
+        self.assertEqual(listener.values, [False, True])
+
+    def test_batch(self) -> None:
+        listener = Listener()
+        self.settings.connect_signal('ascii_formatting', listener.on_change)
+
+        with self.settings.batch():
+            self.settings.set_app_setting('ascii_formatting', False)
+            with self.settings.batch():
+                self.settings.set_app_setting('ascii_formatting', True)
+            self.settings.set_app_setting('ascii_formatting', False)
+            self.assertEqual(listener.values, [])
+
+        self.assertEqual(listener.values, [False])
+        self.assertFalse(self.settings.get_app_setting('ascii_formatting'))
+
+        row = self.settings._con.execute(
+            'SELECT settings FROM settings WHERE name = "app"').fetchone()
+        self.assertIn('"ascii_formatting": false', row.settings)
+
+    def test_dead_callbacks(self) -> None:
+        listener = Listener()
+        self.settings.connect_signal('ascii_formatting', listener.on_change)
+        del listener
+
+        self.settings.set_app_setting('ascii_formatting', False)
+        self.assertNotIn(('ascii_formatting', None, None),
+                         self.settings._callbacks)
+
+
+if __name__ == '__main__':
+    unittest.main()
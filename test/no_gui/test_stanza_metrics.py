@@ -0,0 +1,97 @@
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from nbxmpp.structs import StanzaHandler
+
+from gajim.common import app
+from gajim.common.stanza_metrics import AccountMetrics
+from gajim.common.stanza_metrics import Histogram
+from gajim.common.stanza_metrics import StanzaMetrics
+from gajim.common.stanza_metrics import parse_stanza_info
+
+
+class StanzaMetricsTest(unittest.TestCase):
+    def test_parse_stanza_info(self) -> None:
+        info = parse_stanza_info(
+            '<iq xmlns="jabber:client" type=\'get\' id="abc">'
+            '<query xmlns="jabber:iq:roster"/></iq>')
+        self.assertEqual(info.type, 'iq')
+        self.assertEqual(info.namespace, 'jabber:iq:roster')
+        self.assertEqual(info.iq_type, 'get')
+        self.assertEqual(info.id, 'abc')
+
+        info = parse_stanza_info('<iq type="result" id="abc" />')
+        self.assertEqual(info.namespace, 'none')
+
+        info = parse_stanza_info('<r xmlns="urn:xmpp:sm:3" />')
+        self.assertEqual(info.type, 'other')
+        self.assertEqual(info.namespace, 'urn:xmpp:sm:3')
+
+    def test_histogram(self) -> None:
+        histogram = Histogram((0.1, 1))
+        for value in (0.05, 0.1, 0.5, 2):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.get_cumulative_counts(),
+                         [('0.1', 2), ('1.0', 3), ('+Inf', 4)])
+        self.assertAlmostEqual(histogram.sum, 2.65)
+        self.assertEqual(histogram.max, 2)
+
+    def test_iq_round_trip(self) -> None:
+        metrics = AccountMetrics()
+        metrics.add_stanza('out', '<iq type="get" id="1"><ping/></iq>')
+        metrics.add_stanza('in', '<iq type="result" id="2" />')
+        self.assertEqual(metrics.iq_latency.count, 0)
+
+        metrics.add_stanza('in', '<iq type="result" id="1" />')
+        self.assertEqual(metrics.iq_latency.count, 1)
+        self.assertEqual(metrics.stanzas[('in', 'iq')], 2)
+        self.assertEqual(metrics.bytes['out'], 34)
+
+    def test_prometheus(self) -> None:
+        with patch.object(app, 'settings', MagicMock()) as settings:
+            settings.get.return_value = 0
+            stanza_metrics = StanzaMetrics()
+
+        stanza_metrics.unregister_events()
+        metrics = stanza_metrics.get_account_metrics('acc"ount')
+        metrics.add_stanza('in', '<message><body>Hi</body></message>')
+        metrics.add_processing_time('handler', 0.002)
+
+        text = stanza_metrics.to_prometheus()
+        self.assertIn('gajim_stanzas_total{account="acc\\"ount",'
+                      'direction="in",type="message"} 1', text)
+        self.assertIn('gajim_handler_seconds_bucket{account="acc\\"ount",'
+                      'handler="handler",le="+Inf"} 1', text)
+        self.assertIn('# TYPE gajim_iq_round_trip_seconds histogram', text)
+
+    def test_collect_on_request(self) -> None:
+        with patch.object(app, 'settings', MagicMock()) as settings:
+            settings.get.return_value = 0
+            stanza_metrics = StanzaMetrics()
+
+        callback = MagicMock(return_value=1)
+        handler = stanza_metrics.wrap_handler(
+            'account', StanzaHandler(name='message', callback=callback))
+
+        self.assertFalse(stanza_metrics.has_events_registered())
+        self.assertEqual(handler.callback('stanza'), 1)
+        self.assertEqual(stanza_metrics.get_accounts(), {})
+
+        stanza_metrics.start()
+        self.assertTrue(stanza_metrics.has_events_registered())
+        handler.callback('stanza')
+        stanza_metrics.reset()
+        handler.callback('stanza')
+        stanza_metrics.unregister_events()
+
+        metrics = stanza_metrics.get_accounts()['account']
+        self.assertEqual(len(metrics.handlers), 1)
+        histogram = next(iter(metrics.handlers.values()))
+        self.assertEqual(histogram.count, 1)
+        self.assertEqual(callback.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from gajim.common.startup_timeline import StartupTimeline
+
+
+class StartupTimelineTest(unittest.TestCase):
+    def test_phases(self) -> None:
+        timeline = StartupTimeline()
+        with timeline.phase('Outer'):
+            with timeline.phase('Inner'):
+                pass
+            with timeline.phase('Second inner'):
+                pass
+
+        timeline.finish()
+        with timeline.phase('After startup'):
+            pass
+
+        phases = timeline.get_phases()
+        self.assertEqual([phase.name for phase in phases],
+                         ['Outer', 'Inner', 'Second inner'])
+        self.assertEqual([phase.depth for phase in phases], [0, 1, 1])
+
+        outer, inner, second = phases
+        self.assertLessEqual(outer.start, inner.start)
+        self.assertLessEqual(inner.end, second.start)
+        self.assertGreaterEqual(outer.end, second.end)
+        self.assertGreaterEqual(timeline.get_total_time(), outer.end)
+
+    def test_chrome_trace(self) -> None:
+        timeline = StartupTimeline()
+        with timeline.phase('Settings'):
+            pass
+
+        trace = timeline.to_chrome_trace()
+        events = [event for event in trace['traceEvents']
+                  if event['ph'] == 'X']
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]['name'], 'Settings')
+        self.assertGreaterEqual(events[0]['dur'], 0)
+
+        data = timeline.to_dict()
+        self.assertEqual(data['phases'][0]['name'], 'Settings')
+        self.assertIn('Settings', timeline.get_report())
+
+
+if __name__ == '__main__':
+    unittest.main()
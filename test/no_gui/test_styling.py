@@ -14,6 +14,7 @@
 from gajim.common.styling import EmphasisSpan
 from gajim.common.styling import StrikeSpan
 from gajim.common.styling import Hyperlink
+from gajim.common.styling import ParsingCache
 from gajim.common.styling import process_uris
 from gajim.common.text_helpers import escape_iri_query
 
@@ -563,6 +564,26 @@ def test_uris_with_text(self):
             hlinks = process_uris(text)
             self.assertEqual([link.text for link in hlinks], results, text)
 
+    def test_parsing_cache(self):
+        cache = ParsingCache(max_size=2)
+        text = 'Hello *world*, see https://gajim.org'
+
+        result = cache.process(text)
+        self.assertEqual(result.blocks, styling.process(text).blocks)
+        self.assertIs(cache.process(text), result)
+        self.assertEqual([link.text for link in cache.process_uris(text)],
+                         ['https://gajim.org'])
+        self.assertFalse(cache.is_uri(text))
+        self.assertTrue(cache.is_uri('https://gajim.org'))
+        self.assertEqual(cache.get_stats(), (1, 4, 2))
+
+        # The least recently used text is dropped
+        cache.process('third')
+        cache.process(text)
+        self.assertEqual(cache.get_stats().hits, 1)
+        self.assertEqual(cache.get_stats().size, 2)
+        self.assertAlmostEqual(cache.get_stats().hit_rate, 1 / 7)
+
 
 if __name__ == '__main__':
     unittest.main()
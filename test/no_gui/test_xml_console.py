@@ -0,0 +1,43 @@
+import unittest
+import tempfile
+from pathlib import Path
+
+from gajim import gui
+gui.init('gtk')
+
+from gajim.gtk.xml_console import StanzaCapture  # noqa
+from gajim.gtk.xml_console import get_stanza_type  # noqa
+
+
+class Test(unittest.TestCase):
+    def test_get_stanza_type(self):
+        self.assertEqual(get_stanza_type('<presence />', 'incoming'),
+                         'presence')
+        self.assertEqual(get_stanza_type('<iq type="get" />', 'incoming'),
+                         'iq')
+        self.assertEqual(get_stanza_type('<r xmlns="urn:xmpp:sm:3" />',
+                                         'outgoing'),
+                         'stream')
+        self.assertEqual(get_stanza_type('<stream:features />', 'incoming'),
+                         'incoming')
+
+    def test_capture_rotation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'capture.log'
+            capture = StanzaCapture(path, max_size=10, backups=2)
+            for index in range(4):
+                capture.write(f'<stanza{index}/>\n')
+            capture.close()
+
+            self.assertEqual(path.read_text(), '')
+            self.assertEqual(
+                (Path(directory) / 'capture.log.1').read_text(),
+                '<stanza3/>\n')
+            self.assertEqual(
+                (Path(directory) / 'capture.log.2').read_text(),
+                '<stanza2/>\n')
+            self.assertFalse((Path(directory) / 'capture.log.3').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()